@@ -1,404 +1,582 @@
 import json
+import time
 import asyncio
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv, find_dotenv
-from app.services import neo4j_service
-from app.models.path import PathData, SearchPathRequest
+from app.services import neo4j_service, metrics_service, tracing_service, logging_service, weight_aggregator, circuit_breaker, encoding_service
+from app.models.path import PathData, SearchPathRequest, SearchBatchRequest
 from app.models.contribution import ContributionPathData
 from app.models.step import PathSubmission
 
 load_dotenv(find_dotenv())
 
 app = FastAPI(title="Vowser MCP Server - WebSocket Only")
-
-async def increment_has_step_weight(search_result: dict):
-    """
-    백그라운드에서 첫 번째 경로의 HAS_STEP 가중치를 +1 증가
-    """
-    try:
-        matched_paths = search_result.get("matched_paths", [])
-        if not matched_paths:
-            return
-            
-        top_path = matched_paths[0]
-        domain = top_path.get("domain")
-        task_intent = top_path.get("taskIntent")
-        
-        if not domain or not task_intent:
-            print("HAS_STEP 업데이트 건너뜀: domain 또는 taskIntent 누락")
-            return
-            
-        if not neo4j_service.graph:
-            print("Neo4j graph 연결 없음: HAS_STEP 업데이트 건너뜀")
-            return
-            
-        # Neo4j 쿼리 실행
-        neo4j_service.graph.query(
-            """
-            MATCH (r:ROOT {domain: $domain})-[rel:HAS_STEP {taskIntent: $taskIntent}]->(:STEP)
-            SET rel.weight = coalesce(rel.weight, 0) + 1,
-                rel.lastUpdated = datetime({timezone: 'Asia/Seoul'})
-            RETURN rel.weight as newWeight
-            """,
-            {"domain": domain, "taskIntent": task_intent}
-        )
-        
-        print(f"HAS_STEP 가중치 증가: domain={domain}, taskIntent={task_intent}")
-        
-    except Exception as e:
-        print(f"HAS_STEP weight 증가 실패: {e}")
+logger = logging_service.get_logger(__name__)
+
+# 검색 응답의 직렬화 시간을 담는 최상위 필드 (본문을 한 번 직렬화한 뒤 끝에 추가)
+SERIALIZATION_FIELD = "serialization_ms"
+
+# 메트릭 라벨로 사용할 메시지 타입 (그 외는 "unknown"으로 집계하여 라벨 수 제한)
+KNOWN_MESSAGE_TYPES = {
+    "save_path", "save_new_path", "check_graph", "visualize_paths", "find_popular_paths",
+    "search_path", "search_new_path", "search_batch", "get_langgraph_structure", "cleanup_paths",
+    "save_contribution_path", "create_indexes", "create_new_indexes"
+}
+
+# run_in_executor 기본 스레드 풀 (대기 작업 수는 tracing_service.run_in_executor가 executor_queue_depth로 집계)
+executor = ThreadPoolExecutor(thread_name_prefix="vowser-worker")
+
+# 응답 프레임 크기 히스토그램 버킷 (KB, 지연시간 버킷 대신)
+PAYLOAD_SIZE_BUCKETS_KB = (0.5, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+metrics_service.set_buckets("websocket_payload_kb", PAYLOAD_SIZE_BUCKETS_KB)
+metrics_service.set_gauge("websocket_connections_active", 0)
+
+def encode_payload(encoder, obj):
+    """연결의 인코더로 응답 직렬화 (인코딩 시간 메트릭 기록), (payload, 소요 ms) 반환"""
+    encode_start = time.perf_counter()
+    payload = encoder.encode(obj)
+    encode_ms = (time.perf_counter() - encode_start) * 1000
+    metrics_service.observe("websocket_encode_duration_ms", encode_ms, encoding=encoder.name)
+    return payload, encode_ms
+
+async def send_payload(websocket: WebSocket, encoder, payload, message_type: str) -> int:
+    """직렬화된 응답 전송 (바이너리 인코더는 바이너리 프레임), 전송 바이트 수 반환"""
+    size = encoder.size(payload)
+    metrics_service.observe("websocket_payload_kb", size / 1024, encoding=encoder.name, type=message_type)
+    metrics_service.increment("websocket_payload_bytes_total", size, encoding=encoder.name)
+    if encoder.binary:
+        await websocket.send_bytes(payload)
+    else:
+        await websocket.send_text(payload)
+    return size
+
+async def send_frame(websocket: WebSocket, encoder, frame: dict, trace_id: str, message_type: str):
+    """최종 응답 전에 보내는 중간 프레임 (스트리밍 응답용, 최종 응답은 메시지 처리 끝에서 전송)"""
+    frame['trace_id'] = trace_id
+    payload, _ = encode_payload(encoder, frame)
+    await send_payload(websocket, encoder, payload, message_type)
 
 @app.on_event("startup")
 async def startup_event():
     """서버 시작 시 실행되는 이벤트"""
-    print("Vowser MCP Server 시작 중...")
+    logger.info("Vowser MCP Server 시작 중...")
+
+    # blocking 호출(Neo4j/OpenAI)용 기본 스레드 풀 지정
+    asyncio.get_running_loop().set_default_executor(executor)
     
     # LangGraph 워크플로우 사전 초기화
     try:
         from app.services.langgraph_service import initialize_langgraph
         initialize_langgraph()
     except Exception as e:
-        print(f"LangGraph 초기화 실패 (폴백 모드로 동작): {e}")
+        logger.error("LangGraph 초기화 실패 (폴백 모드로 동작)", error=str(e))
+
+    # 로컬 의도 분류기 로드 (없으면 LLM만 사용)
+    try:
+        from app.services.intent_classifier import load_classifier
+        load_classifier()
+    except Exception as e:
+        logger.error("로컬 의도 분류기 로드 실패 (LLM만 사용)", error=str(e))
+
+    # taskIntent 정확 일치 인덱스 적재
+    try:
+        neo4j_service.load_intent_index()
+    except Exception as e:
+        logger.error("taskIntent 인덱스 적재 실패 (벡터 검색만 사용)", error=str(e))
     
-    print("서버 시작 완료")
+    logger.info("서버 시작 완료")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """서버 종료 시 누적된 가중치 반영, 대기 중인 트레이스/로그 내보내기"""
+    await tracing_service.run_in_executor(weight_aggregator.flush, name="weight_aggregator.flush")
+    tracing_service.flush()
+    logging_service.shutdown()
 
 @app.get("/")
 def read_root():
     """서버가 살아있는지 확인하는 루트 경로"""
     return {"Hello": "from Vowser MCP Server!"}
 
+@app.get("/health")
+def health():
+    """외부 의존성별 회로 상태 (하나라도 closed가 아니면 degraded)"""
+    states = circuit_breaker.states()
+    return {
+        "status": "ok" if all(state == circuit_breaker.CLOSED for state in states.values()) else "degraded",
+        "dependencies": states
+    }
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return PlainTextResponse(metrics_service.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """
     vowser-backend와의 WebSocket 통신 엔드포인트
     """
-    await websocket.accept()
-    print("WebSocket 연결됨 - vowser-backend와 통신 시작")
+    # 응답 인코딩 협상 (?encoding=orjson|msgpack 또는 서브프로토콜 vowser.<encoding>, 기본 json)
+    encoder, subprotocol = encoding_service.negotiate(
+        websocket.query_params.get("encoding"),
+        websocket.scope.get("subprotocols")
+    )
+    await websocket.accept(subprotocol=subprotocol)
+    metrics_service.add_gauge("websocket_connections_active", 1)
+    logger.info("WebSocket 연결됨 - vowser-backend와 통신 시작", encoding=encoder.name)
 
     try:
         while True:
             data = await websocket.receive_text()
+            message_start = time.perf_counter()
             message = json.loads(data)
-            print(f"수신된 메시지: {message.get('type', 'unknown')}")
+            message_type = message.get('type') if message.get('type') in KNOWN_MESSAGE_TYPES else 'unknown'
 
+            # 메시지 단위 trace 시작 (하위 서비스 호출은 모두 이 span의 자식으로 기록) + 로그 샘플링 결정
+            message_span, span_token = tracing_service.start_span("websocket.message", new_trace=True, message_type=message_type)
+            sampling_token = logging_service.begin_message_sampling()
+            span_error = None
             try:
-                if message['type'] == 'save_path':
-                    # DEPRECATED: 기존 save_path (PathData 구조) - 새 구조로 마이그레이션 필요
-                    response = {
-                        "type": "path_save_result",
-                        "status": "error",
-                        "data": {
-                            "message": "DEPRECATED: save_path is no longer supported. Please migrate to save_new_path with PathSubmission structure.",
-                            "migration_guide": "See docs/DTO_API_DOCUMENTATION.md for new structure"
+                logger.debug("수신된 메시지", type=message.get('type', 'unknown'))
+
+                try:
+                    if message['type'] == 'save_path':
+                        # DEPRECATED: 기존 save_path (PathData 구조) - 새 구조로 마이그레이션 필요
+                        response = {
+                            "type": "path_save_result",
+                            "status": "error",
+                            "data": {
+                                "message": "DEPRECATED: save_path is no longer supported. Please migrate to save_new_path with PathSubmission structure.",
+                                "migration_guide": "See docs/DTO_API_DOCUMENTATION.md for new structure"
+                            }
                         }
-                    }
 
-                elif message['type'] == 'save_new_path':
-                    # 새로운 save_path (PathSubmission 구조)
-                    path_submission = PathSubmission(**message['data'])
-                    print(f"새 구조 경로 저장 시작: {path_submission.taskIntent}")
+                    elif message['type'] == 'save_new_path':
+                        # 새로운 save_path (PathSubmission 구조)
+                        path_submission = PathSubmission(**message['data'])
+                        logger.info("새 구조 경로 저장 시작", taskIntent=path_submission.taskIntent)
 
-                    result = neo4j_service.save_path_to_neo4j(path_submission)
+                        result = neo4j_service.save_path_to_neo4j(path_submission)
 
-                    response = {
-                        "type": "path_save_result",
-                        "status": "success" if result['status'] == 'success' else "error",
-                        "data": {
-                            "message": "New path structure processed successfully!",
-                            "result": result
+                        response = {
+                            "type": "path_save_result",
+                            "status": "success" if result['status'] == 'success' else "error",
+                            "data": {
+                                "message": "New path structure processed successfully!",
+                                "result": result
+                            }
                         }
-                    }
 
-                elif message['type'] == 'check_graph':
-                    graph_stats = neo4j_service.check_graph_structure()
+                    elif message['type'] == 'check_graph':
+                        graph_stats = neo4j_service.check_graph_structure()
 
-                    response = {
-                        "type": "graph_check_result",
-                        "status": "success",
-                        "data": {
-                            "graph_statistics": graph_stats
+                        response = {
+                            "type": "graph_check_result",
+                            "status": "success",
+                            "data": {
+                                "graph_statistics": graph_stats
+                            }
                         }
-                    }
 
-                elif message['type'] == 'visualize_paths':
-                    domain = message['data']['domain']
+                    elif message['type'] == 'visualize_paths':
+                        domain = message['data']['domain']
 
-                    paths = neo4j_service.visualize_paths(domain)
+                        paths = neo4j_service.visualize_paths(domain)
 
-                    response = {
-                        "type": "paths_visualization_result",
-                        "status": "success",
-                        "data": {
-                            "domain": domain,
-                            "paths": paths
+                        response = {
+                            "type": "paths_visualization_result",
+                            "status": "success",
+                            "data": {
+                                "domain": domain,
+                                "paths": paths
+                            }
                         }
-                    }
 
-                elif message['type'] == 'find_popular_paths':
-                    domain = message['data'].get('domain')
-                    limit = message['data'].get('limit', 10)
+                    elif message['type'] == 'find_popular_paths':
+                        domain = message['data'].get('domain')
+                        limit = message['data'].get('limit', 10)
 
-                    popular = neo4j_service.find_popular_paths(domain, limit)
+                        popular = neo4j_service.find_popular_paths(domain, limit)
 
-                    response = {
-                        "type": "popular_paths_result",
-                        "status": "success",
-                        "data": {
-                            "domain": domain,
-                            "popular_paths": popular
-                        }
-                    }
-
-                elif message['type'] == 'search_path':
-                    # DEPRECATED: 기존 search_path - 새 구조로 마이그레이션 필요
-                    response = {
-                        "type": "search_path_result",
-                        "status": "error",
-                        "data": {
-                            "message": "DEPRECATED: search_path is no longer supported. Please use search_new_path.",
-                            "migration_guide": "See docs/DTO_API_DOCUMENTATION.md"
-                        }
-                    }
-                    '''
-                elif message['type'] == 'search_new_path':
-                    # 자연어 경로 검색 (새 구조)
-                    try:
-                        search_request = SearchPathRequest(**message['data'])
-                        print(f"[NEW] 경로 검색 요청: {search_request.query}")
-
-                        search_result = neo4j_service.search_paths_by_query(
-                            search_request.query,
-                            search_request.limit,
-                            search_request.domain_hint
-                        )
-                        print(f"[NEW] 검색 결과: {search_result}")
-                    except Exception as e:
-                        print(f"[NEW] search_path 오류: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        search_result = None
-
-                    if search_result:
                         response = {
-                            "type": "search_path_result",
+                            "type": "popular_paths_result",
                             "status": "success",
-                            "data": search_result
-                        }
-                    else:
-                        response = {
-                            "type": "search_path_result",
-                            "status": "error",
                             "data": {
-                                "message": "경로 검색 실패",
-                                "query": search_request.query if 'search_request' in locals() else "unknown"
+                                "domain": domain,
+                                "popular_paths": popular
                             }
                         }
-                    '''
-                
-                elif message['type'] == 'search_new_path':
-                    # LangGraph를 사용한 지능적 경로 검색
-                    try:
-                        search_request = SearchPathRequest(**message['data'])
-                        print(f"[SMART] LangGraph 경로 검색 요청: {search_request.query}")
 
-                        from app.services.langgraph_service import search_with_langgraph
-                        
-                        search_result = await search_with_langgraph(
-                            query=search_request.query,
-                            limit=search_request.limit,
-                            domain_hint=search_request.domain_hint
-                        )
-                        print(f"[SMART] LangGraph 검색 결과: {search_result}")
-                        
+                    elif message['type'] == 'search_path':
+                        # DEPRECATED: 기존 search_path - 새 구조로 마이그레이션 필요
                         response = {
                             "type": "search_path_result",
-                            "status": "success",
-                            "data": search_result
+                            "status": "error",
+                            "data": {
+                                "message": "DEPRECATED: search_path is no longer supported. Please use search_new_path.",
+                                "migration_guide": "See docs/DTO_API_DOCUMENTATION.md"
+                            }
                         }
-                        
-                        # 응답 후 백그라운드에서 HAS_STEP 가중치 증가
-                        asyncio.create_task(increment_has_step_weight(search_result))
-                    except Exception as e:
-                        print(f"[SMART] LangGraph search_path 오류: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        
-                        # LangGraph 실패 시 기존 방식으로 폴백
+                        '''
+                    elif message['type'] == 'search_new_path':
+                        # 자연어 경로 검색 (새 구조)
                         try:
                             search_request = SearchPathRequest(**message['data'])
-                            fallback_result = neo4j_service.search_paths_by_query(
+                            print(f"[NEW] 경로 검색 요청: {search_request.query}")
+
+                            search_result = neo4j_service.search_paths_by_query(
                                 search_request.query,
                                 search_request.limit,
                                 search_request.domain_hint
                             )
+                            print(f"[NEW] 검색 결과: {search_result}")
+                        except Exception as e:
+                            print(f"[NEW] search_path 오류: {e}")
+                            import traceback
+                            traceback.print_exc()
+                            search_result = None
+
+                        if search_result:
                             response = {
                                 "type": "search_path_result",
                                 "status": "success",
-                                "data": fallback_result
+                                "data": search_result
+                            }
+                        else:
+                            response = {
+                                "type": "search_path_result",
+                                "status": "error",
+                                "data": {
+                                    "message": "경로 검색 실패",
+                                    "query": search_request.query if 'search_request' in locals() else "unknown"
+                                }
                             }
-                            print(f"[SMART] 폴백 검색 성공")
-                        except Exception as fallback_error:
-                            print(f"[SMART] 폴백 검색도 실패: {fallback_error}")
+                        '''
+                
+                    elif message['type'] == 'search_new_path':
+                        # LangGraph를 사용한 지능적 경로 검색
+                        try:
+                            search_request = SearchPathRequest(**message['data'])
+                            logger.info("LangGraph 경로 검색 요청", query=search_request.query)
+
+                            from app.services.langgraph_service import search_with_langgraph, hydrate_paths
+                        
+                            search_result = await search_with_langgraph(
+                                query=search_request.query,
+                                limit=search_request.limit,
+                                domain_hint=search_request.domain_hint,
+                                deadline_ms=search_request.deadline_ms,
+                                query_embedding=search_request.decoded_query_embedding(),
+                                # 스트리밍이면 경로 재구성을 미루고 순위 결과부터 전송
+                                hydrate=not search_request.stream
+                            )
+                            logger.info(
+                                "LangGraph 검색 결과",
+                                query=search_request.query,
+                                total_matched=search_result["total_matched"],
+                                strategy=search_result["performance"].get("strategy"),
+                                search_time=search_result["performance"].get("search_time")
+                            )
+                        
+                            if search_request.stream:
+                                # 1) 순위화된 경로 헤더 → 2) 경로별 steps (재구성되는 대로) → 3) 완료 프레임 (performance)
+                                matched_paths = search_result["matched_paths"]
+                                await send_frame(websocket, encoder, {
+                                    "type": "search_path_headers",
+                                    "status": "success",
+                                    "data": {
+                                        "query": search_result["query"],
+                                        "total_matched": search_result["total_matched"],
+                                        "paths": [
+                                            {
+                                                "index": index,
+                                                "domain": path.get("domain"),
+                                                "taskIntent": path.get("taskIntent"),
+                                                "relevance_score": path.get("relevance_score"),
+                                                "weight": path.get("weight")
+                                            }
+                                            for index, path in enumerate(matched_paths)
+                                        ]
+                                    }
+                                }, message_span.trace_id, message_type)
+
+                                async def send_steps(index: int, steps: list):
+                                    await send_frame(websocket, encoder, {
+                                        "type": "search_path_steps",
+                                        "status": "success",
+                                        "data": {
+                                            "index": index,
+                                            "domain": matched_paths[index].get("domain"),
+                                            "taskIntent": matched_paths[index].get("taskIntent"),
+                                            "steps": steps
+                                        }
+                                    }, message_span.trace_id, message_type)
+
+                                reconstruct_ms = await hydrate_paths(matched_paths, send_steps)
+                                if reconstruct_ms:
+                                    search_result["performance"].setdefault("stages", {})["path_reconstruction"] = reconstruct_ms
+
+                                response = {
+                                    "type": "search_path_complete",
+                                    "status": "success",
+                                    "data": {
+                                        "query": search_result["query"],
+                                        "total_matched": search_result["total_matched"],
+                                        "performance": search_result["performance"]
+                                    }
+                                }
+                            else:
+                                response = {
+                                    "type": "search_path_result",
+                                    "status": "success",
+                                    "data": search_result
+                                }
+                        
+                            # HAS_STEP 가중치 증가는 누적 후 일괄 반영 (write-behind)
+                            weight_aggregator.record_search_hit(search_result)
+                        except Exception as e:
+                            logger.exception("LangGraph search_path 오류", error=str(e))
+                            # 검색 실패 폴백은 search_with_langgraph가 마감 시간과 회로 상태 안에서 이미 수행하므로
+                            # 여기서 이벤트 루프를 막는 동기 검색을 다시 시도하지 않음
                             response = {
                                 "type": "search_path_result",
                                 "status": "error",
                                 "data": {
-                                    "message": "LangGraph 및 폴백 검색 모두 실패",
+                                    "message": "경로 검색 실패",
                                     "query": message['data'].get('query', 'unknown'),
                                     "error": str(e)
                                 }
                             }
 
-                elif message['type'] == 'get_langgraph_structure':
-                    # LangGraph 워크플로우 구조 정보 반환
-                    try:
-                        from app.services.langgraph_service import get_workflow_info, print_langgraph_structure
+                    elif message['type'] == 'search_batch':
+                        # 여러 검색을 한 프레임으로 처리 (임베딩/벡터 검색/경로 재구성을 일괄 실행)
+                        try:
+                            batch_request = SearchBatchRequest(**message['data'])
+                            logger.info("배치 경로 검색 요청", size=len(batch_request.requests), stream=batch_request.stream)
+
+                            from app.services.langgraph_service import search_batch
+
+                            async def on_batch_result(index: int, result: dict):
+                                weight_aggregator.record_search_hit(result)
+                                if batch_request.stream:
+                                    # 스트리밍: 항목 결과가 준비되는 대로 개별 프레임 전송
+                                    await send_frame(websocket, encoder, {
+                                        "type": "search_batch_item",
+                                        "status": "success",
+                                        "data": {"index": index, "result": result}
+                                    }, message_span.trace_id, message_type)
+
+                            batch_results = await search_batch(
+                                [
+                                    {
+                                        "query": request.query,
+                                        "limit": request.limit,
+                                        "domain_hint": request.domain_hint,
+                                        "deadline_ms": request.deadline_ms,
+                                        "query_embedding": request.decoded_query_embedding()
+                                    }
+                                    for request in batch_request.requests
+                                ],
+                                on_batch_result
+                            )
+
+                            response = {
+                                "type": "search_batch_result",
+                                "status": "success",
+                                "data": {
+                                    "total": len(batch_results),
+                                    "streamed": batch_request.stream,
+                                    # 스트리밍한 경우 결과는 search_batch_item으로 이미 전송됨
+                                    "results": [] if batch_request.stream else [
+                                        {"index": index, "result": result}
+                                        for index, result in enumerate(batch_results)
+                                    ]
+                                }
+                            }
+                        except Exception as e:
+                            logger.exception("배치 경로 검색 오류", error=str(e))
+                            response = {
+                                "type": "search_batch_result",
+                                "status": "error",
+                                "data": {
+                                    "message": f"배치 경로 검색 실패: {str(e)}"
+                                }
+                            }
+
+                    elif message['type'] == 'get_langgraph_structure':
+                        # LangGraph 워크플로우 구조 정보 반환
+                        try:
+                            from app.services.langgraph_service import get_workflow_info, print_langgraph_structure
                         
-                        # 콘솔에 구조 출력
-                        print_langgraph_structure()
+                            # 콘솔에 구조 출력
+                            print_langgraph_structure()
                         
-                        # 클라이언트에 구조 정보 반환
-                        workflow_info = get_workflow_info()
+                            # 클라이언트에 구조 정보 반환
+                            workflow_info = get_workflow_info()
                         
+                            response = {
+                                "type": "langgraph_structure_result",
+                                "status": "success",
+                                "data": workflow_info
+                            }
+                        except Exception as e:
+                            logger.error("LangGraph 구조 정보 조회 실패", error=str(e))
+                            response = {
+                                "type": "langgraph_structure_result",
+                                "status": "error",
+                                "data": {
+                                    "message": f"LangGraph 구조 정보 조회 실패: {str(e)}"
+                                }
+                            }
+
+                    elif message['type'] == 'cleanup_paths':
+                        # 시간 기반 경로 정리
+                        cleanup_result = neo4j_service.cleanup_old_paths()
+
                         response = {
-                            "type": "langgraph_structure_result",
+                            "type": "cleanup_result",
                             "status": "success",
-                            "data": workflow_info
-                        }
-                    except Exception as e:
-                        print(f"LangGraph 구조 정보 조회 실패: {e}")
-                        response = {
-                            "type": "langgraph_structure_result",
-                            "status": "error",
-                            "data": {
-                                "message": f"LangGraph 구조 정보 조회 실패: {str(e)}"
-                            }
+                            "data": cleanup_result or {"message": "정리 실패"}
                         }
 
-                elif message['type'] == 'cleanup_paths':
-                    # 시간 기반 경로 정리
-                    cleanup_result = neo4j_service.cleanup_old_paths()
-
-                    response = {
-                        "type": "cleanup_result",
-                        "status": "success",
-                        "data": cleanup_result or {"message": "정리 실패"}
-                    }
+                    elif message['type'] == 'save_contribution_path':
+                        # 기여모드 경로 저장 (디버깅을 위해 DB 저장 없이 로그만 출력)
+                        try:
+                            contribution_data = ContributionPathData(**message['data'])
+                            logger.info(
+                                "기여모드 데이터 수신",
+                                sessionId=contribution_data.sessionId,
+                                task=contribution_data.task,
+                                isPartial=contribution_data.isPartial,
+                                isComplete=contribution_data.isComplete,
+                                totalSteps=contribution_data.totalSteps,
+                                stepsCount=len(contribution_data.steps)
+                            )
 
-                elif message['type'] == 'save_contribution_path':
-                    # 기여모드 경로 저장 (디버깅을 위해 DB 저장 없이 로그만 출력)
-                    try:
-                        contribution_data = ContributionPathData(**message['data'])
-                        print(f"\n=== 기여모드 데이터 수신 ===")
-                        print(f"SessionId: {contribution_data.sessionId}")
-                        print(f"Task: {contribution_data.task}")
-                        print(f"IsPartial: {contribution_data.isPartial}")
-                        print(f"IsComplete: {contribution_data.isComplete}")
-                        print(f"TotalSteps: {contribution_data.totalSteps}")
-                        print(f"Steps Count: {len(contribution_data.steps)}")
-
-                        for i, step in enumerate(contribution_data.steps):
-                            print(f"\n--- Step {i+1} ---")
-                            print(f"URL: {step.url}")
-                            print(f"Title: {step.title}")
-                            print(f"Action: {step.action}")
-                            print(f"Selector: {step.selector}")
-                            print(f"HTML Attributes: {step.htmlAttributes}")
-                            print(f"Timestamp: {step.timestamp}")
-
-                        print(f"\n=== Raw Data ===")
-                        print(f"Full message data: {message['data']}")
-                        print(f"=== 기여모드 데이터 분석 완료 ===\n")
+                            for i, step in enumerate(contribution_data.steps):
+                                logger.debug(
+                                    "기여모드 단계",
+                                    step=i + 1,
+                                    url=step.url,
+                                    title=step.title,
+                                    action=step.action,
+                                    selector=step.selector,
+                                    htmlAttributes=step.htmlAttributes,
+                                    timestamp=step.timestamp
+                                )
 
-                        response = {
-                            "type": "contribution_save_result",
-                            "status": "success",
-                            "data": {
-                                "message": "기여모드 데이터 로그 출력 완료 (DB 저장 안함)",
-                                "sessionId": contribution_data.sessionId,
-                                "task": contribution_data.task,
-                                "stepsCount": len(contribution_data.steps),
-                                "isComplete": contribution_data.isComplete
+                            response = {
+                                "type": "contribution_save_result",
+                                "status": "success",
+                                "data": {
+                                    "message": "기여모드 데이터 로그 출력 완료 (DB 저장 안함)",
+                                    "sessionId": contribution_data.sessionId,
+                                    "task": contribution_data.task,
+                                    "stepsCount": len(contribution_data.steps),
+                                    "isComplete": contribution_data.isComplete
+                                }
                             }
-                        }
-                    except Exception as e:
-                        print(f"기여모드 데이터 처리 실패: {e}")
-                        response = {
-                            "type": "contribution_save_result",
-                            "status": "error",
-                            "data": {
-                                "message": f"기여모드 데이터 처리 실패: {str(e)}",
-                                "sessionId": message.get('data', {}).get('sessionId', 'unknown'),
-                                "savedSteps": 0
+                        except Exception as e:
+                            logger.error("기여모드 데이터 처리 실패", error=str(e))
+                            response = {
+                                "type": "contribution_save_result",
+                                "status": "error",
+                                "data": {
+                                    "message": f"기여모드 데이터 처리 실패: {str(e)}",
+                                    "sessionId": message.get('data', {}).get('sessionId', 'unknown'),
+                                    "savedSteps": 0
+                                }
                             }
-                        }
-
-                elif message['type'] == 'create_indexes':
-                    # DEPRECATED: 기존 create_indexes - 새 구조로 마이그레이션 필요
-                    response = {
-                        "type": "index_creation_result",
-                        "status": "error",
-                        "data": {
-                            "message": "DEPRECATED: create_indexes is no longer supported. Please use create_new_indexes.",
-                            "migration_guide": "See docs/DTO_API_DOCUMENTATION.md"
-                        }
-                    }
 
-                elif message['type'] == 'create_new_indexes':
-                    # 벡터 인덱스 생성 (새 구조)
-                    try:
-                        neo4j_service.create_vector_indexes()
+                    elif message['type'] == 'create_indexes':
+                        # DEPRECATED: 기존 create_indexes - 새 구조로 마이그레이션 필요
                         response = {
                             "type": "index_creation_result",
-                            "status": "success",
+                            "status": "error",
                             "data": {
-                                "message": "새 구조 인덱스 생성 완료"
+                                "message": "DEPRECATED: create_indexes is no longer supported. Please use create_new_indexes.",
+                                "migration_guide": "See docs/DTO_API_DOCUMENTATION.md"
                             }
                         }
-                    except Exception as e:
+
+                    elif message['type'] == 'create_new_indexes':
+                        # 벡터 인덱스 생성 (새 구조)
+                        try:
+                            neo4j_service.create_vector_indexes()
+                            response = {
+                                "type": "index_creation_result",
+                                "status": "success",
+                                "data": {
+                                    "message": "새 구조 인덱스 생성 완료"
+                                }
+                            }
+                        except Exception as e:
+                            response = {
+                                "type": "index_creation_result",
+                                "status": "error",
+                                "data": {
+                                    "message": f"새 구조 인덱스 생성 실패: {str(e)}"
+                                }
+                            }
+
+                    else:
                         response = {
-                            "type": "index_creation_result",
+                            "type": "error",
                             "status": "error",
                             "data": {
-                                "message": f"새 구조 인덱스 생성 실패: {str(e)}"
+                                "message": f"Unknown message type: {message.get('type', 'undefined')}"
                             }
                         }
 
-                else:
+                except Exception as e:
+                    logger.exception("메시지 처리 실패", type=message.get('type', 'unknown'), error=str(e))
                     response = {
                         "type": "error",
                         "status": "error",
                         "data": {
-                            "message": f"Unknown message type: {message.get('type', 'undefined')}"
+                            "message": str(e),
+                            "original_type": message.get('type', 'unknown')
                         }
                     }
 
-            except Exception as e:
-                print(f"메시지 처리 실패: {e}")
-                response = {
-                    "type": "error",
-                    "status": "error",
-                    "data": {
-                        "message": str(e),
-                        "original_type": message.get('type', 'unknown')
-                    }
-                }
-
-            # DateTime 객체를 직렬화 가능하도록 변환하는 커스텀 인코더
-            def json_serializer(obj):
-                if hasattr(obj, 'isoformat'):
-                    return obj.isoformat()
-                elif hasattr(obj, 'to_native'):
-                    return obj.to_native().isoformat()
-                raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-
-            await websocket.send_text(json.dumps(response, default=json_serializer, ensure_ascii=False))
-            print(f"응답 전송 완료: {response['type']}")
+                # 응답에 trace_id 포함 (트레이스 파일/수집기에서 같은 ID로 조회)
+                response['trace_id'] = message_span.trace_id
+
+                payload, encode_ms = encode_payload(encoder, response)
+
+                # 검색 응답은 측정한 직렬화 시간을 최상위 serialization_ms 필드로 추가 (본문 재직렬화 없음)
+                is_search_result = response['type'] in ('search_path_result', 'search_path_complete') and isinstance(response.get('data'), dict)
+                if is_search_result and response['data'].get('performance') is not None:
+                    serialization_ms = round(encode_ms, 1)
+                    metrics_service.observe("search_stage_duration_ms", serialization_ms, stage="serialization")
+                    payload = encoder.append_field(payload, SERIALIZATION_FIELD, serialization_ms)
+
+                payload_bytes = await send_payload(websocket, encoder, payload, message_type)
+                logger.debug("응답 전송 완료", type=response['type'], bytes=payload_bytes, encoding=encoder.name)
+
+                metrics_service.increment("websocket_messages_total", type=message_type)
+                if response.get('status') == 'error':
+                    metrics_service.increment("websocket_message_errors_total", type=message_type)
+                metrics_service.observe("websocket_message_duration_ms", (time.perf_counter() - message_start) * 1000, type=message_type)
+                message_span.set_attribute("status", response.get('status'))
+            except BaseException as e:
+                span_error = e
+                raise
+            finally:
+                # 처리/전송 중 예외(연결 끊김, 취소 포함)에도 샘플링 컨텍스트와 메시지 span을 항상 정리
+                logging_service.end_message_sampling(sampling_token)
+                tracing_service.end_span(message_span, span_token, span_error)
 
     except WebSocketDisconnect:
-        print("WebSocket 연결 종료 - vowser-backend 연결 해제")
+        logger.info("WebSocket 연결 종료 - vowser-backend 연결 해제")
     except Exception as e:
-        print(f"WebSocket 오류: {e}")
-        await websocket.close()
\ No newline at end of file
+        logger.exception("WebSocket 오류", error=str(e))
+        await websocket.close()
+    finally:
+        metrics_service.add_gauge("websocket_connections_active", -1)
\ No newline at end of file
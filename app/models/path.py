@@ -1,4 +1,9 @@
-from pydantic import BaseModel
+import math
+import base64
+import binascii
+import sys
+from array import array
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
@@ -27,10 +32,51 @@ class PathData(BaseModel):
     completePath: List[PathStep]
 
 # 새로운 검색 관련 모델들
+# 클라이언트가 보내는 쿼리 임베딩은 PAGE/taskIntent 벡터 인덱스와 같은 모델/차원이어야 함
+QUERY_EMBEDDING_MODEL = "text-embedding-3-small"
+QUERY_EMBEDDING_DIMENSIONS = 1536
+
 class SearchPathRequest(BaseModel):
     query: str
     limit: int = 3
     domain_hint: Optional[str] = None
+    deadline_ms: Optional[int] = Field(default=None, gt=0)  # 요청 지연시간 예산 (ms, 없으면 서버 기본값)
+    query_embedding: Optional[str] = None  # 클라이언트가 계산한 쿼리 임베딩 (base64, float32 little-endian)
+    embedding_model: Optional[str] = None  # query_embedding을 만든 모델 (query_embedding이 있으면 필수)
+    stream: bool = False  # True면 경로 헤더 → 경로별 steps → 완료(performance) 순서로 나눠 전송
+
+    _query_vector: Optional[List[float]] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def _decode_query_embedding(self):
+        """query_embedding 디코딩 + 모델/차원 검증 (실패 시 ValidationError)"""
+        if self.query_embedding is None:
+            return self
+        if self.embedding_model != QUERY_EMBEDDING_MODEL:
+            raise ValueError(f"embedding_model은 {QUERY_EMBEDDING_MODEL}이어야 합니다 (받은 값: {self.embedding_model})")
+        try:
+            raw = base64.b64decode(self.query_embedding, validate=True)
+        except binascii.Error as e:
+            raise ValueError(f"query_embedding base64 디코딩 실패: {e}")
+        if len(raw) != QUERY_EMBEDDING_DIMENSIONS * 4:
+            raise ValueError(f"query_embedding 차원 불일치: {len(raw) // 4} (기대값 {QUERY_EMBEDDING_DIMENSIONS})")
+
+        vector = array("f")
+        vector.frombytes(raw)
+        if sys.byteorder != "little":
+            vector.byteswap()
+        if not all(math.isfinite(value) for value in vector):
+            raise ValueError("query_embedding에 NaN/Inf 값이 있습니다")
+        self._query_vector = vector.tolist()
+        return self
+
+    def decoded_query_embedding(self) -> Optional[List[float]]:
+        """검증된 쿼리 임베딩 벡터 (query_embedding이 없으면 None)"""
+        return self._query_vector
+
+class SearchBatchRequest(BaseModel):
+    requests: List[SearchPathRequest] = Field(min_length=1, max_length=100)
+    stream: bool = False  # True면 항목 결과를 준비되는 대로 search_batch_item 프레임으로 전송
 
 class PathStepResponse(BaseModel):
     order: int
@@ -0,0 +1,137 @@
+"""
+어드미션 서비스 - OpenAI 호출 단계(LLM 의도 분석, 임베딩)의 전역 동시 실행 제한
+
+단계별로 동시 실행 수와 대기열 길이를 제한합니다. 대기열이 가득 찼거나 대기 시간이 초과되면
+호출을 거절(load shedding)하고, 검색은 LLM/재탐색 없이 벡터 검색 결과만으로 응답합니다
+(strategy: degraded_vector_only). 과부하 시에도 대기 시간이 대기열 길이로 제한되어
+모든 요청이 함께 타임아웃되지 않습니다.
+
+- LLM_MAX_CONCURRENCY / LLM_MAX_QUEUE: LLM 의도 분석 동시 실행 수 (기본 8) / 대기열 길이 (기본 16)
+- EMBEDDING_MAX_CONCURRENCY / EMBEDDING_MAX_QUEUE: 임베딩 동시 실행 수 (기본 16) / 대기열 길이 (기본 32)
+- ADMISSION_MAX_WAIT_MS: 대기열에서 기다리는 최대 시간 (기본 1000ms, 요청 마감 시각으로 추가 제한)
+"""
+
+import os
+import time
+import asyncio
+from typing import Optional
+
+from app.services import metrics_service, tracing_service, logging_service
+
+logger = logging_service.get_logger(__name__)
+
+ADMISSION_MAX_WAIT_MS = int(os.getenv("ADMISSION_MAX_WAIT_MS", "1000"))
+
+
+class AdmissionRejected(Exception):
+    """대기열 포화/대기 시간 초과로 실행 슬롯을 얻지 못함"""
+
+    def __init__(self, stage: str):
+        super().__init__(f"{stage} admission rejected")
+        self.stage = stage
+
+
+class AdmissionLimiter:
+    """대기열 길이가 제한된 세마포어 (이벤트 루프에서만 사용)"""
+
+    def __init__(self, stage: str, max_concurrency: int, max_queue: int):
+        self.stage = stage
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def is_saturated(self) -> bool:
+        """대기열이 가득 차서 새 호출이 즉시 거절되는 상태인지"""
+        return self.in_flight >= self.max_concurrency and self.waiting >= self.max_queue
+
+    async def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        실행 슬롯 획득
+
+        Args:
+            timeout: 최대 대기 시간(초). None이면 ADMISSION_MAX_WAIT_MS
+
+        Returns:
+            bool: 획득 여부 (False면 호출하지 말고 폴백)
+        """
+        if self.is_saturated():
+            self._reject("queue_full")
+            return False
+
+        max_wait = ADMISSION_MAX_WAIT_MS / 1000
+        timeout = max_wait if timeout is None else min(timeout, max_wait)
+
+        start = time.perf_counter()
+        self.waiting += 1
+        metrics_service.add_gauge("admission_queue_depth", 1, stage=self.stage)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._reject("timeout")
+            return False
+        finally:
+            self.waiting -= 1
+            metrics_service.add_gauge("admission_queue_depth", -1, stage=self.stage)
+
+        self.in_flight += 1
+        metrics_service.add_gauge("admission_in_flight", 1, stage=self.stage)
+        metrics_service.observe("admission_wait_ms", (time.perf_counter() - start) * 1000, stage=self.stage)
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        metrics_service.add_gauge("admission_in_flight", -1, stage=self.stage)
+        self._semaphore.release()
+
+    def _reject(self, reason: str):
+        metrics_service.increment("admission_rejected_total", stage=self.stage, reason=reason)
+        logger.debug("어드미션 거절", stage=self.stage, reason=reason,
+                     in_flight=self.in_flight, waiting=self.waiting)
+
+
+_limiters = {
+    "llm": AdmissionLimiter(
+        "llm",
+        int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+        int(os.getenv("LLM_MAX_QUEUE", "16"))
+    ),
+    "embedding": AdmissionLimiter(
+        "embedding",
+        int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "16")),
+        int(os.getenv("EMBEDDING_MAX_QUEUE", "32"))
+    )
+}
+
+
+def get_limiter(stage: str) -> AdmissionLimiter:
+    """단계 이름("llm" | "embedding")의 전역 제한기"""
+    return _limiters[stage]
+
+
+def is_saturated(stage: str) -> bool:
+    return _limiters[stage].is_saturated()
+
+
+async def acquire(stage: str, timeout: Optional[float] = None) -> bool:
+    return await _limiters[stage].acquire(timeout)
+
+
+def release(stage: str):
+    _limiters[stage].release()
+
+
+async def run_in_executor(stage: str, func, *args, timeout: Optional[float] = None, name: Optional[str] = None):
+    """
+    실행 슬롯을 얻은 뒤 스레드 풀에서 func(*args) 실행
+
+    Raises:
+        AdmissionRejected: 대기열 포화 또는 대기 시간 초과
+    """
+    if not await acquire(stage, timeout):
+        raise AdmissionRejected(stage)
+    try:
+        return await tracing_service.run_in_executor(func, *args, name=name)
+    finally:
+        release(stage)
@@ -6,6 +6,11 @@ from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
+from app.services import rate_limit_service
+
+PAGE_STRUCTURE_MODEL = "gpt-4o"
+# 속도 제한 버킷에서 미리 차감할 출력 토큰 추정치
+PAGE_STRUCTURE_OUTPUT_TOKENS_ESTIMATE = 1000
 
 class InteractiveElement(BaseModel):
     text: str = Field(description="사용자가 볼 수 있는 버튼 또는 링크의 텍스트")
@@ -38,7 +43,8 @@ def clean_html_with_soup(html_content: str) -> str:
 
 async def structure_html_with_langchain(cleaned_html_text: str, url: str) -> PageStructure:
 
-    model = ChatOpenAI(temperature=0, model="gpt-4o", openai_api_key=os.getenv("OPENAI_API_KEY"))
+    # 재시도는 rate_limit_service가 담당 (모델별 버킷 공유 + jitter 백오프)
+    model = ChatOpenAI(temperature=0, model=PAGE_STRUCTURE_MODEL, openai_api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
 
     parser = PydanticOutputParser(pydantic_object=PageStructure)
 
@@ -62,10 +68,19 @@ async def structure_html_with_langchain(cleaned_html_text: str, url: str) -> Pag
 
     # 체인 실행 및 결과 반환
     # 텍스트가 너무 길 경우를 대비해 앞부분만 잘라서 사용 (토큰 제한)
-    result = await chain.ainvoke({
+    inputs = {
         "url": url,
         "html_text": cleaned_html_text[:4000],
         "format_instructions": parser.get_format_instructions()
-    })
+    }
+    estimated_tokens = (
+        rate_limit_service.estimate_tokens(inputs["html_text"] + inputs["format_instructions"])
+        + PAGE_STRUCTURE_OUTPUT_TOKENS_ESTIMATE
+    )
+    result = await rate_limit_service.acall_with_retry(
+        lambda: chain.ainvoke(inputs),
+        model=PAGE_STRUCTURE_MODEL,
+        tokens=estimated_tokens
+    )
 
     return result
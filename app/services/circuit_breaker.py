@@ -0,0 +1,186 @@
+"""
+서킷 브레이커 - 외부 의존성(OpenAI 임베딩, OpenAI LLM, Neo4j) 장애 시 즉시 폴백
+
+연속 실패가 CIRCUIT_FAILURE_THRESHOLD 회에 도달하면 회로를 열고(open), 열린 동안에는 호출하지 않고
+CircuitOpenError를 바로 발생시켜 호출부가 저렴한 경로(휴리스틱 의도, 정확 일치 인덱스, 최근 검색 결과)로
+폴백하게 합니다. 열린 지 CIRCUIT_HALF_OPEN_AFTER_SECONDS가 지나면 반열림(half_open) 상태로 실제 요청
+하나를 시험 호출로 통과시키고, 성공하면 닫고(closed) 실패하면 다시 엽니다. 백그라운드 헬스 프로브가 성공해도 닫힙니다.
+
+- CIRCUIT_FAILURE_THRESHOLD: 회로를 여는 연속 실패 수 (기본 5)
+- CIRCUIT_HALF_OPEN_AFTER_SECONDS: 열린 뒤 시험 호출을 허용하기까지의 시간 (기본 10초, 시험 호출이 이 시간 안에 끝나지 않으면 다음 요청으로 재시험)
+- CIRCUIT_PROBE_INTERVAL_SECONDS: 열린 회로의 헬스 프로브 주기 (기본 5초)
+- circuit_breaker_state{dependency} 게이지: 0=closed, 1=open, 2=half_open
+"""
+
+import os
+import time
+import threading
+from typing import Callable, Optional
+
+from app.services import metrics_service, logging_service
+
+logger = logging_service.get_logger(__name__)
+
+FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+PROBE_INTERVAL_SECONDS = float(os.getenv("CIRCUIT_PROBE_INTERVAL_SECONDS", "5"))
+HALF_OPEN_AFTER_SECONDS = float(os.getenv("CIRCUIT_HALF_OPEN_AFTER_SECONDS", "10"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_GAUGE = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 호출하지 않음"""
+
+    def __init__(self, dependency: str):
+        super().__init__(f"{dependency} circuit is open")
+        self.dependency = dependency
+
+
+class CircuitBreaker:
+    """의존성 하나의 회로 상태 (스레드 안전)"""
+
+    def __init__(self, dependency: str, is_failure: Optional[Callable[[BaseException], bool]] = None):
+        self.dependency = dependency
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        # 반열림 상태의 시험 호출 시작 시각 (None이면 시험 호출 없음)
+        self.trial_started_at = None
+        self._is_failure = is_failure or (lambda error: True)
+        self._probe = None
+        self._lock = threading.Lock()
+        metrics_service.set_gauge("circuit_breaker_state", 0, dependency=dependency)
+
+    def is_open(self) -> bool:
+        """지금 호출하면 거절되는지 (시험 호출을 받을 수 있는 반열림 회로는 False, 상태는 바꾸지 않음)"""
+        return self.state != CLOSED and not self._trial_available()
+
+    def _trial_available(self) -> bool:
+        now = time.monotonic()
+        if self.state == OPEN:
+            return now - self.opened_at >= HALF_OPEN_AFTER_SECONDS
+        # 반열림: 진행 중인 시험 호출이 결과 없이 오래 걸리면(취소 등) 다음 요청으로 재시험
+        return self.trial_started_at is None or now - self.trial_started_at >= HALF_OPEN_AFTER_SECONDS
+
+    def check(self):
+        """열려 있으면 CircuitOpenError (호출 직전에 사용, 반열림이면 한 요청만 시험 호출로 통과)"""
+        if self.state == CLOSED:
+            return
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self._trial_available():
+                if self.state == OPEN:
+                    self._transition(HALF_OPEN)
+                self.trial_started_at = time.monotonic()
+                metrics_service.increment("circuit_breaker_trials_total", dependency=self.dependency)
+                return
+        metrics_service.increment("circuit_breaker_rejected_total", dependency=self.dependency)
+        raise CircuitOpenError(self.dependency)
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        if self.state != CLOSED:
+            with self._lock:
+                if self.state != CLOSED:
+                    self._transition(CLOSED)
+                    logger.info("회로 닫힘 (시험 호출 성공)", dependency=self.dependency)
+
+    def record_failure(self, error: BaseException):
+        """의존성 장애로 볼 수 있는 오류만 집계 (요청 오류/파싱 실패 등은 제외)"""
+        if not self._is_failure(error):
+            return
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN:
+                # 시험 호출 실패: 다시 열고 HALF_OPEN_AFTER_SECONDS 뒤 재시험
+                self._transition(OPEN)
+                logger.warning("회로 다시 열림 (시험 호출 실패)", dependency=self.dependency, error=str(error)[:200])
+            elif self.state == CLOSED and self.consecutive_failures >= FAILURE_THRESHOLD:
+                self._transition(OPEN)
+                logger.warning("회로 열림", dependency=self.dependency,
+                               failures=self.consecutive_failures, error=str(error)[:200])
+        _ensure_probe_thread()
+
+    def set_probe(self, probe: Callable[[], object]):
+        """헬스 프로브 등록 (예외 없이 반환하면 정상으로 판단, 회로를 거치지 않는 호출이어야 함)"""
+        self._probe = probe
+
+    def probe(self) -> bool:
+        """열린(반열림 포함) 회로에 헬스 프로브 실행, 성공하면 회로를 닫음"""
+        if self.state == CLOSED or self._probe is None:
+            return False
+        try:
+            self._probe()
+        except Exception as e:
+            metrics_service.increment("circuit_breaker_probes_total", dependency=self.dependency, result="failure")
+            logger.debug("헬스 프로브 실패", dependency=self.dependency, error=str(e)[:200])
+            return False
+
+        metrics_service.increment("circuit_breaker_probes_total", dependency=self.dependency, result="success")
+        with self._lock:
+            self.consecutive_failures = 0
+            if self.state == CLOSED:
+                return True
+            self._transition(CLOSED)
+        logger.info("회로 닫힘 (헬스 프로브 성공)", dependency=self.dependency,
+                    open_seconds=round(time.monotonic() - (self.opened_at or time.monotonic()), 1))
+        return True
+
+    def _transition(self, state: str):
+        """상태 변경 (lock 보유 상태에서 호출)"""
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        elif state == CLOSED:
+            self.opened_at = None
+        self.trial_started_at = None
+        metrics_service.set_gauge("circuit_breaker_state", _STATE_GAUGE[state], dependency=self.dependency)
+        metrics_service.increment("circuit_breaker_transitions_total", dependency=self.dependency, to=state)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+_probe_thread = None
+
+
+def get_breaker(dependency: str, is_failure: Optional[Callable[[BaseException], bool]] = None) -> CircuitBreaker:
+    """의존성 이름("openai_embedding" | "openai_llm" | "neo4j")의 브레이커 (처음 호출 시 생성)"""
+    breaker = _breakers.get(dependency)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(dependency)
+            if breaker is None:
+                breaker = _breakers[dependency] = CircuitBreaker(dependency, is_failure)
+    return breaker
+
+
+def is_open(dependency: str) -> bool:
+    breaker = _breakers.get(dependency)
+    return breaker is not None and breaker.is_open()
+
+
+def states() -> dict:
+    """의존성별 회로 상태 ({'neo4j': 'closed', ...})"""
+    return {name: breaker.state for name, breaker in _breakers.items()}
+
+
+def _ensure_probe_thread():
+    global _probe_thread
+    if _probe_thread is not None:
+        return
+    with _breakers_lock:
+        if _probe_thread is None:
+            _probe_thread = threading.Thread(target=_probe_loop, name="circuit-prober", daemon=True)
+            _probe_thread.start()
+
+
+def _probe_loop():
+    while True:
+        time.sleep(PROBE_INTERVAL_SECONDS)
+        for breaker in list(_breakers.values()):
+            breaker.probe()
@@ -1,22 +1,31 @@
 import os
+import time
 import hashlib
+import threading
+import contextvars
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait, FIRST_COMPLETED
 from typing import List, Optional
-from openai import OpenAI
+from openai import OpenAI, BadRequestError
+from app.services import metrics_service, tracing_service, logging_service, rate_limit_service, circuit_breaker
 from app.models.path import PathStep
 from dotenv import load_dotenv, find_dotenv
 
 load_dotenv(find_dotenv())
 
+logger = logging_service.get_logger(__name__)
+
 def get_openai_client():
     try:
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
-            print("환경변수에 OPENAI_API_KEY가 없습니다!")
+            logger.warning("환경변수에 OPENAI_API_KEY가 없습니다!")
             return None
-        return OpenAI(api_key=api_key)
+        # 재시도는 rate_limit_service가 담당 (모델별 버킷 공유 + jitter)
+        return OpenAI(api_key=api_key, max_retries=0)
     except Exception as e:
-        print(f"OpenAI client 초기화 실패. Error: {e}")
+        logger.error("OpenAI client 초기화 실패", error=str(e))
         return None
 
 client = None
@@ -25,10 +34,160 @@ client = None
 _embedding_cache = {}
 _CACHE_MAX_SIZE = 1000  # 최대 캐시 크기
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+
 def _get_cache_key(text: str) -> str:
     """텍스트의 캐시 키 생성 (해시 기반)"""
     return hashlib.md5(text.strip().encode()).hexdigest()
 
+def _is_openai_failure(error: BaseException) -> bool:
+    """OpenAI 장애로 볼 오류 (로컬 속도 제한 포기, 잘못된 요청은 제외)"""
+    return not isinstance(error, (rate_limit_service.RateLimitExceeded, BadRequestError))
+
+embedding_breaker = circuit_breaker.get_breaker("openai_embedding", _is_openai_failure)
+embedding_breaker.set_probe(lambda: get_openai_client().models.retrieve(EMBEDDING_MODEL))
+
+# ============================================================================
+# 요청 헤징 (tail latency 단축)
+# 임베딩 요청이 최근 지연시간 p95 안에 돌아오지 않으면 같은 요청을 한 번 더 보내고 먼저 온 응답을 사용
+# - EMBEDDING_HEDGING=1: 헤징 사용 (기본 비활성, interactive 우선순위 호출만 대상)
+# - EMBEDDING_HEDGE_PERCENTILE: 헤지 지연 기준 백분위 (기본 95)
+# - EMBEDDING_HEDGE_MIN_DELAY_MS / EMBEDDING_HEDGE_DEFAULT_DELAY_MS: 최소 지연 (기본 50ms) / 표본 부족 시 지연 (기본 500ms)
+# - EMBEDDING_HEDGE_BUDGET: 최근 호출 중 헤지 요청을 보낼 수 있는 최대 비율 (기본 0.05)
+# ============================================================================
+
+HEDGING_ENABLED = os.getenv("EMBEDDING_HEDGING", "0") == "1"
+HEDGE_PERCENTILE = float(os.getenv("EMBEDDING_HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_DELAY_MS = float(os.getenv("EMBEDDING_HEDGE_MIN_DELAY_MS", "50"))
+HEDGE_DEFAULT_DELAY_MS = float(os.getenv("EMBEDDING_HEDGE_DEFAULT_DELAY_MS", "500"))
+HEDGE_BUDGET = float(os.getenv("EMBEDDING_HEDGE_BUDGET", "0.05"))
+HEDGE_MAX_WORKERS = int(os.getenv("EMBEDDING_HEDGE_MAX_WORKERS", "16"))
+_HEDGE_MIN_SAMPLES = 20
+
+# 최근 요청 지연시간(ms, 헤지 요청 포함)과 최근 호출별 헤지 여부 (예산 계산용)
+_request_latencies_ms = deque(maxlen=200)
+_recent_hedged = deque(maxlen=200)
+_hedge_lock = threading.Lock()
+_hedge_executor = None
+
+def _hedge_delay_ms() -> float:
+    """현재 헤지 지연 (최근 요청 지연시간의 HEDGE_PERCENTILE 백분위)"""
+    with _hedge_lock:
+        samples = sorted(_request_latencies_ms)
+    if len(samples) < _HEDGE_MIN_SAMPLES:
+        return HEDGE_DEFAULT_DELAY_MS
+    index = min(len(samples) - 1, int(len(samples) * HEDGE_PERCENTILE / 100))
+    return max(HEDGE_MIN_DELAY_MS, samples[index])
+
+if HEDGING_ENABLED:
+    metrics_service.register_gauge_callback("embedding_hedge_delay_ms", _hedge_delay_ms)
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _hedge_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="embedding-hedge")
+    return _hedge_executor
+
+def _submit_request(request):
+    """요청을 헤지 풀에서 실행 (트레이싱/마감 시각 컨텍스트 유지, 성공한 요청의 지연시간 기록)"""
+    context = contextvars.copy_context()
+    start = time.perf_counter()
+
+    def record_latency(future):
+        if not future.cancelled() and future.exception() is None:
+            with _hedge_lock:
+                _request_latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    future = _get_hedge_executor().submit(context.run, request)
+    future.add_done_callback(record_latency)
+    return future
+
+def _try_reserve_hedge(tokens: int) -> Optional[str]:
+    """헤지 요청을 보낼 수 있으면 None, 아니면 건너뛴 이유"""
+    with _hedge_lock:
+        hedged = sum(_recent_hedged)
+        if hedged + 1 > HEDGE_BUDGET * (len(_recent_hedged) + 1):
+            _recent_hedged.append(False)
+            return "budget"
+        _recent_hedged.append(True)
+    # 헤지 요청도 실제 API 호출이므로 버킷에서 차감 (여유가 없으면 보내지 않음)
+    if not rate_limit_service.get_limiter(EMBEDDING_MODEL).try_acquire(tokens, rate_limit_service.current_priority()):
+        with _hedge_lock:
+            _recent_hedged[-1] = False
+        return "rate_limited"
+    return None
+
+def _hedged_request(request, tokens: int):
+    """
+    헤지 지연 안에 응답이 없으면 같은 요청을 한 번 더 보내고 먼저 성공한 응답 반환
+
+    동기 클라이언트는 실행 중인 요청을 중단할 수 없으므로, 진 요청은 시작 전이면 취소하고
+    이미 보낸 경우 응답을 버립니다.
+    """
+    primary = _submit_request(request)
+    try:
+        response = primary.result(timeout=_hedge_delay_ms() / 1000)
+        with _hedge_lock:
+            _recent_hedged.append(False)
+        return response
+    except FutureTimeoutError:
+        pass
+
+    skipped = _try_reserve_hedge(tokens)
+    if skipped:
+        metrics_service.increment("embedding_hedges_total", outcome=f"skipped_{skipped}")
+        return primary.result()
+
+    pending = {primary: "primary", _submit_request(request): "hedge"}
+    error = None
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            winner = pending.pop(future)
+            if future.exception() is not None:
+                error = future.exception()
+                continue
+            for loser in pending:
+                loser.cancel()
+            metrics_service.increment("embedding_hedges_total", outcome="won" if winner == "hedge" else "lost")
+            return future.result()
+    metrics_service.increment("embedding_hedges_total", outcome="failed")
+    raise error
+
+def _create_embeddings(client, input):
+    """임베딩 API 호출 (회로 차단/속도 제한/재시도 + 지연시간/토큰 사용량 메트릭 기록)"""
+    embedding_breaker.check()
+    estimated_tokens = sum(rate_limit_service.estimate_tokens(text) for text in (input if isinstance(input, list) else [input]))
+    start = time.perf_counter()
+    try:
+        with tracing_service.span("openai.embeddings", inputs=len(input) if isinstance(input, list) else 1):
+            request = lambda: client.embeddings.create(model=EMBEDDING_MODEL, input=input)
+            if HEDGING_ENABLED and rate_limit_service.current_priority() == "interactive":
+                send = lambda: _hedged_request(request, estimated_tokens)
+            else:
+                send = request
+            response = rate_limit_service.call_with_retry(
+                send,
+                model=EMBEDDING_MODEL,
+                tokens=estimated_tokens
+            )
+    except Exception as e:
+        metrics_service.increment("openai_request_errors_total", operation="embedding")
+        embedding_breaker.record_failure(e)
+        raise
+    finally:
+        metrics_service.observe("openai_request_duration_ms", (time.perf_counter() - start) * 1000, operation="embedding")
+    embedding_breaker.record_success()
+
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None) if usage is not None else None
+    rate_limit_service.record_usage(EMBEDDING_MODEL, estimated_tokens, prompt_tokens)
+    if prompt_tokens is not None:
+        metrics_service.increment("openai_tokens_total", prompt_tokens or 0, model=EMBEDDING_MODEL, kind="input")
+    return response
+
 def _clean_cache_if_needed():
     """캐시 크기가 최대치를 초과하면 가장 오래된 항목 삭제"""
     global _embedding_cache
@@ -37,7 +196,11 @@ def _clean_cache_if_needed():
         keys_to_remove = list(_embedding_cache.keys())[:_CACHE_MAX_SIZE // 2]
         for key in keys_to_remove:
             del _embedding_cache[key]
-        print(f"🧹 임베딩 캐시 정리: {len(keys_to_remove)}개 항목 삭제")
+        logger.info("임베딩 캐시 정리", removed=len(keys_to_remove))
+
+def is_embedding_cached(text: str) -> bool:
+    """텍스트의 임베딩이 캐시에 있는지 확인 (단계별 지연시간의 캐시 히트/미스 구분용)"""
+    return bool(text and text.strip()) and _get_cache_key(text) in _embedding_cache
 
 def generate_embedding(text: str) -> Optional[List[float]]:
     """
@@ -48,11 +211,14 @@ def generate_embedding(text: str) -> Optional[List[float]]:
         
     Returns:
         List[float] | None: 임베딩 벡터 또는 None (실패 시)
+
+    Raises:
+        CircuitOpenError: 임베딩 회로 열림
     """
     global _embedding_cache
     
     if not text or not text.strip():
-        print("Warning: 임베딩 생성 건너뜀: 빈 텍스트가 제공되었습니다.")
+        logger.warning("임베딩 생성 건너뜀: 빈 텍스트가 제공되었습니다.")
         return None
     
     # 캐시 키 생성
@@ -60,32 +226,92 @@ def generate_embedding(text: str) -> Optional[List[float]]:
     
     # 캐시에서 확인
     if cache_key in _embedding_cache:
-        print(f"💾 임베딩 캐시 히트: '{text[:30]}...'")
+        metrics_service.increment("embedding_cache_requests_total", result="hit")
+        logger.debug("임베딩 캐시 히트", text=text[:30])
         return _embedding_cache[cache_key]
     
     # 캐시 미스 - 새로 생성
+    metrics_service.increment("embedding_cache_requests_total", result="miss")
     client = get_openai_client()
     if not client:
-        print("Warning: 임베딩 생성 건너뜀: OpenAI 클라이언트를 사용할 수 없습니다.")
+        logger.warning("임베딩 생성 건너뜀: OpenAI 클라이언트를 사용할 수 없습니다.")
         return None
     
     try:
-        response = client.embeddings.create(
-            model="text-embedding-3-small",
-            input=text.strip()
-        )
+        response = _create_embeddings(client, text.strip())
         embedding = response.data[0].embedding
         
         # 캐시에 저장
         _embedding_cache[cache_key] = embedding
         _clean_cache_if_needed()
         
-        print(f"📝 임베딩 생성 및 캐싱: '{text[:30]}...'")
+        logger.debug("임베딩 생성 및 캐싱", text=text[:30])
         return embedding
+    except circuit_breaker.CircuitOpenError:
+        # 회로 열림은 "임베딩 없음"(낮은 유사도 → LLM/재탐색)과 구분되어야 하므로 호출부로 전달
+        raise
     except Exception as e:
-        print(f"Error: 임베딩 생성 실패: {e}")
+        logger.error("임베딩 생성 실패", error=str(e))
         return None
 
+def generate_embeddings(texts: List[str]) -> List[Optional[List[float]]]:
+    """
+    여러 텍스트를 한 번의 API 호출로 임베딩 (캐싱 지원)
+    
+    Args:
+        texts (List[str]): 임베딩할 텍스트 목록
+        
+    Returns:
+        List[List[float] | None]: 입력 순서대로의 임베딩 (빈 텍스트/실패 시 None)
+
+    Raises:
+        CircuitOpenError: 임베딩 회로 열림
+    """
+    global _embedding_cache
+    
+    results: List[Optional[List[float]]] = [None] * len(texts)
+    
+    # 캐시 히트는 바로 채우고, 미스는 중복 없이 모아서 한 번에 요청
+    missing = {}
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            continue
+        cache_key = _get_cache_key(text)
+        if cache_key in _embedding_cache:
+            results[i] = _embedding_cache[cache_key]
+        else:
+            missing.setdefault(cache_key, (text.strip(), []))[1].append(i)
+    
+    hits = sum(1 for text in texts if text and text.strip()) - sum(len(indices) for _, indices in missing.values())
+    metrics_service.increment("embedding_cache_requests_total", hits, result="hit")
+    metrics_service.increment("embedding_cache_requests_total", len(missing), result="miss")
+
+    if not missing:
+        return results
+    
+    client = get_openai_client()
+    if not client:
+        logger.warning("배치 임베딩 생성 건너뜀: OpenAI 클라이언트를 사용할 수 없습니다.")
+        return results
+    
+    try:
+        batch = list(missing.items())
+        response = _create_embeddings(client, [text for _, (text, _) in batch])
+        
+        for (cache_key, (_, indices)), item in zip(batch, sorted(response.data, key=lambda d: d.index)):
+            _embedding_cache[cache_key] = item.embedding
+            for i in indices:
+                results[i] = item.embedding
+        _clean_cache_if_needed()
+        
+        logger.debug("배치 임베딩 생성 및 캐싱", generated=len(batch), requested=len(texts))
+    except circuit_breaker.CircuitOpenError:
+        raise
+    except Exception as e:
+        logger.error("배치 임베딩 생성 실패", error=str(e))
+    
+    return results
+
 def create_embedding_text(step: PathStep) -> str:
     """
     PathStep 객체에서 PAGE 임베딩용 텍스트 생성
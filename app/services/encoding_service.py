@@ -0,0 +1,143 @@
+"""
+응답 인코딩 서비스 - WebSocket 연결별로 협상하는 응답 직렬화 방식
+
+- json (기본): 표준 json 모듈, 텍스트 프레임 (기존 응답과 동일)
+- orjson: orjson 사용 (datetime 기본 지원, json보다 수 배 빠름), 텍스트 프레임
+- msgpack: MessagePack 바이너리 프레임 (JSON보다 작음, datetime은 ISO 문자열)
+
+연결 시 쿼리 파라미터(`/ws?encoding=msgpack`) 또는 서브프로토콜(`vowser.msgpack`)로 선택하며,
+패키지가 설치되지 않았거나 알 수 없는 값이면 json을 사용합니다. 요청 메시지는 항상 JSON 텍스트입니다.
+"""
+
+import json
+from typing import List, Optional, Tuple, Union
+
+from app.services import logging_service
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging_service.get_logger(__name__)
+
+DEFAULT_ENCODING = "json"
+SUBPROTOCOL_PREFIX = "vowser."
+
+
+def json_default(obj):
+    """기본 직렬화 대상이 아닌 값 변환 (datetime, Neo4j DateTime → ISO 문자열)"""
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    elif hasattr(obj, 'to_native'):
+        return obj.to_native().isoformat()
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+class JsonEncoder:
+    """표준 json 인코더 (텍스트 프레임)"""
+
+    name = "json"
+    binary = False
+
+    def encode(self, obj) -> Union[str, bytes]:
+        return json.dumps(obj, default=json_default, ensure_ascii=False)
+
+    def append_field(self, payload, key: str, value) -> Union[str, bytes]:
+        """
+        직렬화가 끝난 최상위 객체 payload 끝에 필드 하나 추가 (본문 재직렬화/내용 검색 없음)
+
+        최상위 객체의 닫는 괄호 위치만 사용하므로 응답 내용(사용자 문자열 등)과 무관하게 동작합니다.
+        """
+        if not payload.endswith("}"):
+            raise ValueError("최상위 객체가 아닌 payload에는 필드를 추가할 수 없습니다")
+        separator = "" if payload == "{}" else ","
+        return f"{payload[:-1]}{separator}{json.dumps(key)}:{json.dumps(value)}}}"
+
+    def size(self, payload) -> int:
+        """전송 바이트 수"""
+        return len(payload) if isinstance(payload, bytes) else len(payload.encode("utf-8"))
+
+
+class OrjsonEncoder(JsonEncoder):
+    """orjson 인코더 (datetime 기본 지원, 텍스트 프레임)"""
+
+    name = "orjson"
+
+    def encode(self, obj) -> str:
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+class MsgpackEncoder(JsonEncoder):
+    """MessagePack 인코더 (바이너리 프레임)"""
+
+    name = "msgpack"
+    binary = True
+
+    def encode(self, obj) -> bytes:
+        return msgpack.packb(obj, default=json_default, use_bin_type=True, datetime=False)
+
+    def append_field(self, payload: bytes, key: str, value) -> bytes:
+        # 최상위 map 헤더의 항목 수만 1 늘리고 키/값을 끝에 붙임 (fixmap → map16 → map32 순으로 확장)
+        first = payload[0]
+        if first & 0xF0 == 0x80:
+            count, body = first & 0x0F, payload[1:]
+        elif first == 0xDE:
+            count, body = int.from_bytes(payload[1:3], "big"), payload[3:]
+        elif first == 0xDF:
+            count, body = int.from_bytes(payload[1:5], "big"), payload[5:]
+        else:
+            raise ValueError("최상위 map이 아닌 payload에는 필드를 추가할 수 없습니다")
+        count += 1
+        if count <= 0x0F:
+            header = bytes([0x80 | count])
+        elif count <= 0xFFFF:
+            header = b"\xde" + count.to_bytes(2, "big")
+        else:
+            header = b"\xdf" + count.to_bytes(4, "big")
+        return header + body + msgpack.packb(key) + msgpack.packb(value)
+
+
+_encoders = {"json": JsonEncoder()}
+if orjson is not None:
+    _encoders["orjson"] = OrjsonEncoder()
+if msgpack is not None:
+    _encoders["msgpack"] = MsgpackEncoder()
+
+
+def available_encodings() -> List[str]:
+    return list(_encoders)
+
+
+def get_encoder(name: Optional[str] = None) -> JsonEncoder:
+    """이름의 인코더 (없거나 설치되지 않았으면 기본 json)"""
+    encoder = _encoders.get(name or DEFAULT_ENCODING)
+    if encoder is None:
+        logger.warning("지원하지 않는 응답 인코딩 (json 사용)", encoding=name, available=available_encodings())
+        return _encoders[DEFAULT_ENCODING]
+    return encoder
+
+
+def negotiate(query_encoding: Optional[str], subprotocols: Optional[List[str]]) -> Tuple[JsonEncoder, Optional[str]]:
+    """
+    연결 요청에서 응답 인코더 선택
+
+    Args:
+        query_encoding: 쿼리 파라미터 encoding 값 (우선)
+        subprotocols: 클라이언트가 제안한 서브프로토콜 목록 (vowser.<encoding>, 제안 순서대로 사용 가능한 첫 번째)
+
+    Returns:
+        (인코더, 수락할 서브프로토콜 또는 None)
+    """
+    if query_encoding:
+        return get_encoder(query_encoding), None
+
+    for protocol in subprotocols or []:
+        if protocol.startswith(SUBPROTOCOL_PREFIX) and protocol[len(SUBPROTOCOL_PREFIX):] in _encoders:
+            return _encoders[protocol[len(SUBPROTOCOL_PREFIX):]], protocol
+    return _encoders[DEFAULT_ENCODING], None
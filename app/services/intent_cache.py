@@ -0,0 +1,183 @@
+"""
+의도 분석 결과 캐시 - 정규화된 쿼리 + 프롬프트 버전 기준 영구 캐시 (SQLite)
+
+- 성공 결과는 INTENT_CACHE_TTL_SECONDS 동안 재사용
+- LLM 응답 파싱 실패도 짧은 TTL로 저장하여 같은 쿼리로 LLM을 연속 재호출하지 않음
+- 프롬프트가 바뀌면 버전 해시가 달라지므로 기존 항목은 자동으로 무효화
+- 항목 수가 INTENT_CACHE_MAX_ENTRIES를 넘으면 가장 오래된 항목부터 삭제 (INTENT_CACHE_EVICTION_INTERVAL회 저장마다 확인)
+- 최근 항목은 메모리 LRU(INTENT_CACHE_MEMORY_ENTRIES)에 두어 이벤트 루프에서 SQLite 없이 조회(peek)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.services import logging_service
+from app.services.neo4j_service import normalize_intent_text
+
+logger = logging_service.get_logger(__name__)
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+CACHE_PATH = os.getenv("INTENT_CACHE_PATH", os.path.join(_PROJECT_ROOT, "data", "intent_cache.sqlite3"))
+CACHE_TTL_SECONDS = int(os.getenv("INTENT_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+FAILURE_TTL_SECONDS = int(os.getenv("INTENT_CACHE_FAILURE_TTL_SECONDS", "600"))
+MAX_ENTRIES = int(os.getenv("INTENT_CACHE_MAX_ENTRIES", "10000"))
+EVICTION_INTERVAL = max(1, int(os.getenv("INTENT_CACHE_EVICTION_INTERVAL", "100")))
+MEMORY_ENTRIES = int(os.getenv("INTENT_CACHE_MEMORY_ENTRIES", "1000"))
+
+_conn = None
+_lock = threading.Lock()
+_writes_since_eviction = 0
+
+# 메모리 LRU (cache_key → (expires_at, result JSON, failed)). SQLite 잠금과 분리하여 조회가 저장을 기다리지 않음
+_memory: "OrderedDict[str, tuple]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def prompt_version(prompt_template: str) -> str:
+    """프롬프트 템플릿의 버전 해시 (프롬프트 변경 시 캐시 자동 무효화)"""
+    return hashlib.md5(prompt_template.encode()).hexdigest()[:12]
+
+
+def _get_connection():
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        _conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS intent_cache (
+                cache_key TEXT PRIMARY KEY,
+                prompt_version TEXT NOT NULL,
+                result TEXT,
+                failed INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        _conn.execute("CREATE INDEX IF NOT EXISTS intent_cache_created_idx ON intent_cache (created_at)")
+        _conn.commit()
+    return _conn
+
+
+def _cache_key(query: str, version: str) -> str:
+    return hashlib.md5(f"{version}:{normalize_intent_text(query)}".encode()).hexdigest()
+
+
+def _remember(key: str, result: Optional[str], failed: bool, expires_at: float):
+    if MEMORY_ENTRIES <= 0:
+        return
+    with _memory_lock:
+        _memory[key] = (expires_at, result, failed)
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def peek(query: str, version: str) -> Optional[dict]:
+    """
+    메모리 캐시만 조회 (I/O 없음, 이벤트 루프에서 호출 가능)
+
+    Returns:
+        dict | None: lookup과 같은 형식 (메모리 미스/만료 시 None)
+    """
+    key = _cache_key(query, version)
+    with _memory_lock:
+        cached = _memory.get(key)
+        if cached is None:
+            return None
+        expires_at, result, failed = cached
+        if expires_at <= time.time():
+            del _memory[key]
+            return None
+        _memory.move_to_end(key)
+    # 호출부가 결과를 수정해도 캐시가 바뀌지 않도록 매번 새 dict로 복원
+    return {"result": json.loads(result) if result else None, "failed": failed}
+
+
+def lookup(query: str, version: str) -> Optional[dict]:
+    """
+    캐시 조회 (메모리 → SQLite, 블로킹 I/O이므로 이벤트 루프에서는 peek 후 스레드에서 호출)
+
+    Returns:
+        dict | None: {'result': dict | None, 'failed': bool} (미스/만료 시 None)
+    """
+    entry = peek(query, version)
+    if entry is not None:
+        return entry
+
+    key = _cache_key(query, version)
+    try:
+        with _lock:
+            row = _get_connection().execute(
+                "SELECT result, failed, expires_at FROM intent_cache WHERE cache_key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+    except Exception as e:
+        logger.warning("의도 캐시 조회 실패", error=str(e))
+        return None
+
+    if row is None:
+        return None
+
+    result, failed, expires_at = row
+    _remember(key, result, bool(failed), expires_at)
+    return {"result": json.loads(result) if result else None, "failed": bool(failed)}
+
+
+def store(query: str, version: str, result: Optional[dict], failed: bool = False):
+    """캐시 저장 (failed=True면 FAILURE_TTL_SECONDS 동안 파싱 실패를 기억)"""
+    global _writes_since_eviction
+    now = time.time()
+    ttl = FAILURE_TTL_SECONDS if failed else CACHE_TTL_SECONDS
+    key = _cache_key(query, version)
+    result_json = json.dumps(result, ensure_ascii=False) if result is not None else None
+    _remember(key, result_json, failed, now + ttl)
+
+    try:
+        with _lock:
+            conn = _get_connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO intent_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    version,
+                    result_json,
+                    int(failed),
+                    now,
+                    now + ttl
+                )
+            )
+            # 상한 확인(count 쿼리)은 매 저장이 아니라 EVICTION_INTERVAL회마다
+            _writes_since_eviction += 1
+            if _writes_since_eviction >= EVICTION_INTERVAL:
+                _writes_since_eviction = 0
+                _evict_if_needed(conn, version, now)
+            conn.commit()
+    except Exception as e:
+        logger.warning("의도 캐시 저장 실패", error=str(e))
+
+
+def _evict_if_needed(conn, version: str, now: float):
+    """만료 항목과 다른 프롬프트 버전 항목 정리 후, 상한 초과분은 오래된 순으로 삭제"""
+    (count,) = conn.execute("SELECT count(*) FROM intent_cache").fetchone()
+    if count <= MAX_ENTRIES:
+        return
+
+    conn.execute(
+        "DELETE FROM intent_cache WHERE expires_at <= ? OR prompt_version != ?",
+        (now, version)
+    )
+    (count,) = conn.execute("SELECT count(*) FROM intent_cache").fetchone()
+    overflow = count - MAX_ENTRIES
+    if overflow > 0:
+        conn.execute(
+            "DELETE FROM intent_cache WHERE cache_key IN "
+            "(SELECT cache_key FROM intent_cache ORDER BY created_at ASC LIMIT ?)",
+            (overflow,)
+        )
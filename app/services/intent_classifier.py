@@ -0,0 +1,324 @@
+"""
+로컬 의도 분류기 - gpt-4o-mini 호출 없이 intent_analysis 생성
+
+구성:
+- 임베딩 중심점(centroid) 분류기: intent_type / domain_preference 별 평균 임베딩과의 코사인 유사도
+- 키워드 추출기: 조사/불용어 제거 + 학습 데이터의 키워드 어휘 매칭
+
+학습 데이터:
+- LLM 의도 분석 로그 (log_llm_intent로 기록된 JSONL, INTENT_LOG_ENABLED=1일 때만 기록,
+  정규화된 쿼리만 저장, INTENT_LOG_MAX_BYTES를 넘으면 .1 파일로 교체)
+- Neo4j에 저장된 HAS_STEP taskIntent (task_completion + 도메인 라벨)
+
+로컬 신뢰도가 LOCAL_CONFIDENCE_THRESHOLD 미만이면 호출 측에서 LLM을 사용합니다.
+신뢰도는 중심점 간 상대 확률이므로, 가장 가까운 중심점과의 코사인 유사도가 LOCAL_MIN_SIMILARITY 미만이면
+(학습 데이터와 동떨어진 쿼리) 신뢰도 0으로 처리합니다. 클래스가 2개 미만인 모델은 학습/로드하지 않습니다.
+학습/내보내기/리포트: scripts/train_intent_classifier.py
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+from app.services import logging_service
+from app.services.neo4j_service import normalize_intent_text
+
+logger = logging_service.get_logger(__name__)
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# 모델/로그 경로 및 신뢰도 임계값 (환경변수로 조정)
+CLASSIFIER_PATH = os.getenv("INTENT_CLASSIFIER_PATH", os.path.join(_PROJECT_ROOT, "data", "intent_classifier.json"))
+INTENT_LOG_PATH = os.getenv("INTENT_LOG_PATH", os.path.join(_PROJECT_ROOT, "data", "intent_llm_log.jsonl"))
+# 사용자 쿼리를 디스크에 남기므로 기본 비활성 (학습 데이터를 모을 때만 켬)
+INTENT_LOG_ENABLED = os.getenv("INTENT_LOG_ENABLED", "0") == "1"
+INTENT_LOG_MAX_BYTES = int(os.getenv("INTENT_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOCAL_CONFIDENCE_THRESHOLD = float(os.getenv("LOCAL_INTENT_MIN_CONFIDENCE", "0.7"))
+LOCAL_MIN_SIMILARITY = float(os.getenv("LOCAL_INTENT_MIN_SIMILARITY", "0.5"))
+
+# 소프트맥스 신뢰도가 의미를 가지려면 intent_type / domain 클래스가 각각 최소 이 개수 이상이어야 함
+MIN_CLASSES = 2
+
+# 소프트맥스 온도 (코사인 유사도 차이를 확률로 변환)
+_SOFTMAX_TEMPERATURE = 0.05
+
+# domain_preference가 없는 경우를 나타내는 클래스 이름
+_NO_DOMAIN = "__none__"
+
+# 키워드 추출 시 제거할 조사/어미 및 불용어
+_PARTICLE_SUFFIXES = (
+    "에서는", "에서", "으로", "에게", "까지", "부터", "해줘", "해주세요", "하기", "하는",
+    "은", "는", "이", "가", "을", "를", "에", "로", "의", "도", "좀", "랑", "과", "와"
+)
+_STOPWORDS = {"좀", "그냥", "어떻게", "어디", "뭐", "해줘", "해주세요", "알려줘", "보여줘", "싶어", "하고"}
+
+_model = None
+_log_lock = threading.Lock()
+
+
+# ============================================================================
+# 키워드 추출
+# ============================================================================
+
+def _strip_particle(token: str) -> str:
+    for suffix in _PARTICLE_SUFFIXES:
+        if len(token) > len(suffix) + 1 and token.endswith(suffix):
+            return token[:-len(suffix)]
+    return token
+
+
+def extract_keywords(query: str, vocabulary: Optional[List[str]] = None, max_keywords: int = 4) -> List[str]:
+    """
+    쿼리에서 검색용 핵심 키워드 추출
+
+    학습된 어휘 중 쿼리에 포함된 것을 우선하고, 나머지는 조사를 제거한 토큰으로 채웁니다.
+    """
+    keywords = []
+
+    for term in vocabulary or []:
+        if term and term in query and term not in keywords:
+            keywords.append(term)
+
+    for token in re.findall(r"[\w]+", query):
+        token = _strip_particle(token)
+        if len(token) < 2 or token in _STOPWORDS or token in keywords:
+            continue
+        keywords.append(token)
+
+    return keywords[:max_keywords] or [query]
+
+
+# ============================================================================
+# 학습 / 저장 / 로드
+# ============================================================================
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _centroids(samples: List[dict], label_key: str) -> dict:
+    grouped = {}
+    for sample in samples:
+        label = sample.get(label_key) or _NO_DOMAIN
+        grouped.setdefault(label, []).append(sample["embedding"])
+
+    return {
+        label: _normalize_rows(np.array(embeddings, dtype=np.float32)).mean(axis=0).tolist()
+        for label, embeddings in grouped.items()
+    }
+
+
+def _check_classes(model: dict):
+    """클래스가 하나뿐이면 소프트맥스 확률이 항상 1.0이 되어 LLM이 호출되지 않으므로 거부 (ValueError)"""
+    intent_count = len(model["intent_centroids"])
+    domain_count = len(model["domain_centroids"])
+    if intent_count < MIN_CLASSES or domain_count < MIN_CLASSES:
+        raise ValueError(
+            f"분류 클래스가 부족합니다 (intent_type {intent_count}개, domain {domain_count}개, 각각 최소 {MIN_CLASSES}개 필요)"
+        )
+
+
+def train_classifier(samples: List[dict], min_keyword_count: int = 2) -> dict:
+    """
+    학습 샘플로 분류기 모델 생성
+
+    Args:
+        samples: [{'query', 'embedding', 'intent_type', 'domain_preference', 'keywords'}, ...]
+        min_keyword_count: 어휘에 포함될 키워드의 최소 등장 횟수
+
+    Returns:
+        dict: JSON 직렬화 가능한 모델
+    """
+    samples = [s for s in samples if s.get("embedding") and s.get("intent_type")]
+    if not samples:
+        raise ValueError("학습 가능한 샘플이 없습니다.")
+
+    keyword_counts = {}
+    for sample in samples:
+        for keyword in sample.get("keywords") or []:
+            keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
+    vocabulary = sorted(
+        (k for k, count in keyword_counts.items() if count >= min_keyword_count),
+        key=lambda k: (-len(k), k)
+    )
+
+    model = {
+        "trained_at": datetime.now().isoformat(),
+        "sample_count": len(samples),
+        "intent_centroids": _centroids(samples, "intent_type"),
+        "domain_centroids": _centroids(samples, "domain_preference"),
+        "keyword_vocabulary": vocabulary
+    }
+    _check_classes(model)
+    return model
+
+
+def save_classifier(model: dict, path: Optional[str] = None):
+    """모델을 JSON 파일로 저장"""
+    path = path or CLASSIFIER_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(model, f, ensure_ascii=False)
+
+
+def prepare_model(model: dict) -> dict:
+    """추론용으로 중심점 행렬을 미리 정규화"""
+    prepared = dict(model)
+    for key in ("intent_centroids", "domain_centroids"):
+        labels = list(model[key].keys())
+        prepared[key + "_labels"] = labels
+        prepared[key + "_matrix"] = _normalize_rows(np.array([model[key][l] for l in labels], dtype=np.float32))
+    return prepared
+
+
+def set_model(model: Optional[dict]):
+    """메모리 모델 교체 (None이면 비활성화)"""
+    global _model
+    _model = prepare_model(model) if model else None
+
+
+def load_classifier(path: Optional[str] = None) -> bool:
+    """
+    저장된 모델 로드
+
+    Returns:
+        bool: 로드 성공 여부 (모델 파일이 없거나 클래스가 부족하면 False, LLM만 사용)
+    """
+    path = path or CLASSIFIER_PATH
+    if not os.path.exists(path):
+        logger.info("로컬 의도 분류기 없음 (LLM만 사용)", path=path)
+        set_model(None)
+        return False
+
+    with open(path, encoding="utf-8") as f:
+        model = json.load(f)
+    try:
+        _check_classes(model)
+    except ValueError as e:
+        logger.warning("로컬 의도 분류기 사용 불가 (LLM만 사용)", path=path, error=str(e))
+        set_model(None)
+        return False
+
+    set_model(model)
+    logger.info("로컬 의도 분류기 로드", samples=_model['sample_count'], intent_types=len(_model['intent_centroids']))
+    return True
+
+
+# ============================================================================
+# 추론
+# ============================================================================
+
+def _softmax_top(matrix: np.ndarray, labels: List[str], query_vec: np.ndarray):
+    sims = matrix @ query_vec
+    scaled = (sims - sims.max()) / _SOFTMAX_TEMPERATURE
+    probs = np.exp(scaled) / np.exp(scaled).sum()
+    top = int(np.argmax(probs))
+    return labels[top], float(probs[top]), float(sims[top])
+
+
+def classify_intent(query: str, query_embedding: Optional[List[float]], model: Optional[dict] = None) -> Optional[dict]:
+    """
+    로컬 분류기로 intent_analysis 생성
+
+    Returns:
+        dict | None: LLM과 같은 형식의 결과 (+ 'source': 'local'), 모델/임베딩이 없으면 None
+    """
+    if model is None:
+        model = _model
+    elif "intent_centroids_matrix" not in model:
+        model = prepare_model(model)
+    if not model or not query_embedding:
+        return None
+
+    query_vec = np.array(query_embedding, dtype=np.float32)
+    norm = np.linalg.norm(query_vec)
+    if norm == 0:
+        return None
+    query_vec /= norm
+
+    intent_type, intent_prob, intent_sim = _softmax_top(
+        model["intent_centroids_matrix"], model["intent_centroids_labels"], query_vec
+    )
+    domain, domain_prob, domain_sim = _softmax_top(
+        model["domain_centroids_matrix"], model["domain_centroids_labels"], query_vec
+    )
+
+    # 상대 확률이 높아도 가장 가까운 중심점 자체가 멀면 학습 분포 밖의 쿼리이므로 신뢰하지 않음
+    similarity = min(intent_sim, domain_sim)
+    confidence = min(intent_prob, domain_prob) if similarity >= LOCAL_MIN_SIMILARITY else 0.0
+
+    return {
+        "intent_type": intent_type,
+        "domain_preference": None if domain == _NO_DOMAIN else domain,
+        "complexity": "simple",
+        "confidence": round(confidence, 3),
+        "similarity": round(similarity, 3),
+        "reasoning": "로컬 임베딩 중심점 분류기",
+        "keywords": extract_keywords(query, model.get("keyword_vocabulary")),
+        "source": "local"
+    }
+
+
+# ============================================================================
+# LLM 결과 로깅 (학습 데이터 수집)
+# ============================================================================
+
+def _rotate_log_if_needed():
+    """로그가 INTENT_LOG_MAX_BYTES 이상이면 .1 파일로 교체 (백업 1개만 유지, _log_lock 보유 상태에서 호출)"""
+    try:
+        if os.path.getsize(INTENT_LOG_PATH) >= INTENT_LOG_MAX_BYTES:
+            os.replace(INTENT_LOG_PATH, INTENT_LOG_PATH + ".1")
+    except FileNotFoundError:
+        pass
+
+
+def log_llm_intent(query: str, result: dict, latency_ms: int):
+    """LLM 의도 분석 결과를 JSONL로 기록 (학습 데이터 및 지연시간 비교용, INTENT_LOG_ENABLED일 때만)"""
+    if not INTENT_LOG_ENABLED:
+        return
+
+    record = {
+        # 원문 대신 정규화된 쿼리만 저장 (대소문자/구두점/공백 정보 제거)
+        "query": normalize_intent_text(query),
+        "intent_type": result.get("intent_type"),
+        "domain_preference": result.get("domain_preference"),
+        "keywords": result.get("keywords", []),
+        "confidence": result.get("confidence"),
+        "latency_ms": latency_ms,
+        "logged_at": time.time()
+    }
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(INTENT_LOG_PATH), exist_ok=True)
+            _rotate_log_if_needed()
+            with open(INTENT_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except Exception as e:
+        logger.warning("LLM 의도 로그 기록 실패", error=str(e))
+
+
+def read_llm_intent_log(path: Optional[str] = None) -> List[dict]:
+    """기록된 LLM 의도 분석 로그 읽기 (교체된 .1 파일 → 현재 파일 순)"""
+    path = path or INTENT_LOG_PATH
+
+    records = []
+    for log_path in (path + ".1", path):
+        if not os.path.exists(log_path):
+            continue
+        with open(log_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+    return records
@@ -8,16 +8,53 @@ LangGraph 서비스 - 조건부 분기를 통한 지능적 경로 선택
 } → 최종 경로 선택
 """
 
+import copy
 import json
 import time
-from typing import TypedDict, List, Optional
+import array
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import TypedDict, List, Literal, Optional, Callable, Awaitable
 import os
-import re
+from pydantic import BaseModel
 from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
 
-from app.services import neo4j_service
-from app.services.embedding_service import generate_embedding
+from app.services import neo4j_service, metrics_service, intent_classifier, intent_cache, tracing_service, logging_service, admission_service, rate_limit_service, circuit_breaker
+from app.services.embedding_service import generate_embedding, generate_embeddings, is_embedding_cached, get_openai_client
+
+logger = logging_service.get_logger(__name__)
+
+# 기존 경로 순위화 / 재탐색 분기 기준 유사도
+SIMILARITY_THRESHOLD = 0.43
+
+# 요청별 기본 지연시간 예산 (클라이언트가 deadline_ms를 보내지 않은 경우)
+DEFAULT_SEARCH_DEADLINE_MS = int(os.getenv("SEARCH_DEADLINE_MS", "8000"))
+
+
+def _time_left(state) -> Optional[float]:
+    """마감까지 남은 시간(초). 마감이 없으면 None (asyncio.wait_for 무제한)"""
+    deadline = state.get("deadline")
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def _record_stage(stage_timings: dict, stage: str, elapsed_ms: float, **labels):
+    """단계별 지연시간 기록 (응답 performance.stages + search_stage_duration_ms 히스토그램)"""
+    elapsed_ms = round(elapsed_ms, 1)
+    stage_timings[stage] = round(stage_timings.get(stage, 0.0) + elapsed_ms, 1)
+    metrics_service.observe("search_stage_duration_ms", elapsed_ms, stage=stage, **labels)
+
+
+def _record_search_stages(stage_timings: dict, search_result: Optional[dict]):
+    """neo4j_service 검색 결과의 벡터 쿼리/경로 재구성 시간 기록"""
+    performance = (search_result or {}).get("performance") or {}
+    if "vector_query_time" in performance:
+        _record_stage(stage_timings, "vector_query", performance["vector_query_time"])
+    if "reconstruct_time" in performance:
+        _record_stage(stage_timings, "path_reconstruction", performance["reconstruct_time"])
 
 
 class PathSelectionState(TypedDict):
@@ -33,51 +70,145 @@ class PathSelectionState(TypedDict):
     reasoning: str
     limit: int  # 반환할 경로 수
     cached_search_results: Optional[dict]  # 캐시된 검색 결과 (중복 검색 방지)
-    
-# Util 함수
-def parse_llm_json(text: str) -> dict:
-    # 1) 방어적 정리: 양끝 공백, BOM 제거
-    s = text.lstrip("\ufeff").strip()
+    analysis_completed: bool  # 병렬 분석 완료 여부 (직접 파이프라인에서 이미 분석한 경우 True)
+    agent_stats: dict  # 재탐색 Agent별 상태/지연시간/기여도
+    stage_timings: dict  # 단계별 지연시간 (ms)
+    embedding_cache: Optional[str]  # 쿼리 임베딩 출처 ("hit" / "miss" / "client")
+    deadline: Optional[float]  # 요청 마감 시각 (time.monotonic 기준, None이면 제한 없음)
+    cut_short_stages: List[str]  # 마감 시간 초과로 중단된 단계 목록
+    degraded: Optional[str]  # 과부하로 생략된 단계 ("llm" / "embedding", None이면 정상 처리)
+    hydrate: bool  # False면 벡터 검색 결과의 경로 재구성 생략 (스트리밍 응답에서 나중에 재구성)
+
+
+class IntentAnalysis(BaseModel):
+    """의도 분석 LLM 구조화 출력 스키마"""
+    intent_type: Literal["navigation", "task_completion", "information_seeking", "exploration"]
+    domain_preference: Optional[str]
+    complexity: Literal["simple", "moderate", "complex"]
+    confidence: float
+    reasoning: str
+    keywords: List[str]
+
+
+# 의도 분석 시스템 프롬프트 - 요청마다 동일한 접두부로 유지하여 제공자 측 프롬프트 캐싱 적용
+# (쿼리는 human 메시지로 맨 뒤에 붙임. 변경 시 INTENT_PROMPT_VERSION이 바뀌어 의도 캐시가 자동 무효화됨)
+INTENT_SYSTEM_PROMPT = """웹 자동화 서비스의 의도 분석기. 사용자 쿼리를 분석해 스키마에 맞는 JSON만 출력.
+- intent_type: navigation | task_completion | information_seeking | exploration
+- domain_preference: 언급되거나 암시된 사이트 도메인 (예: youtube.com, naver.com), 없으면 null
+- complexity: simple | moderate | complex
+- confidence: 0.0-1.0
+- reasoning: 한 문장
+- keywords: 경로 검색용 핵심 단어 2-4개
+예: "유튜브에서 좋아요 누르기" → task_completion, youtube.com, ["유튜브", "좋아요", "누르기", "동영상"]
+예: "요즘 나라가 어떻게 굴러가나" → navigation, naver.com, ["시사", "정치", "뉴스"]"""
+
+INTENT_LLM_MODEL = "gpt-4o-mini"
+# 속도 제한 버킷에서 미리 차감할 출력 토큰 추정치 (응답 후 실제 사용량으로 보정)
+INTENT_OUTPUT_TOKENS_ESTIMATE = 150
+INTENT_PROMPT_VERSION = intent_cache.prompt_version(
+    INTENT_SYSTEM_PROMPT + json.dumps(IntentAnalysis.model_json_schema(), sort_keys=True)
+)
+
+# 의도 분석 LLM 클라이언트 (프로세스당 1회 생성)
+_intent_llm = None
+
+
+def get_intent_llm():
+    """의도 분석용 LLM 클라이언트 싱글톤 (JSON 스키마 구조화 출력, 원본 응답 포함)"""
+    global _intent_llm
+    if _intent_llm is None:
+        llm = ChatOpenAI(
+            model=INTENT_LLM_MODEL,
+            temperature=0,
+            max_retries=0,  # 재시도는 rate_limit_service가 담당 (마감 시각 안에서 jitter 백오프)
+            request_timeout=10.0
+        )
+        _intent_llm = llm.with_structured_output(IntentAnalysis, method="json_schema", include_raw=True)
+    return _intent_llm
+
+
+# 의도 분석 LLM 호출의 기본 제한 시간 (요청 마감이 더 가까우면 남은 시간으로 줄어듦)
+INTENT_LLM_TIMEOUT = 12.0
 
-    # 2) 코드펜스 제거 (```json ... ```, ``` ... ```)
-    if s.startswith("```"):
-        # 첫 줄이 ```json 또는 ``` 인 경우만 잘라내기
-        # (맨 끝의 ``` 제거)
-        s = re.sub(r"^```[a-zA-Z0-9]*\s*", "", s)
-        s = re.sub(r"\s*```$", "", s)
 
-    # 3) 문자열 전체가 JSON이 아닐 수도 있으니 {...} 블록만 추출
-    #    - 가장 앞의 '{'와 가장 뒤의 '}' 사이를 잘라서 시도
-    if not (s.startswith("{") and s.endswith("}")):
-        start = s.find("{")
-        end = s.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            s = s[start:end+1]
+def _is_llm_failure(error: BaseException) -> bool:
+    """LLM 장애로 볼 오류 (파싱 실패, 로컬 속도 제한 포기는 제외)"""
+    return not isinstance(error, (ValueError, rate_limit_service.RateLimitExceeded))
+
+
+llm_breaker = circuit_breaker.get_breaker("openai_llm", _is_llm_failure)
+llm_breaker.set_probe(lambda: get_openai_client().models.retrieve(INTENT_LLM_MODEL))
+
+
+def _record_token_usage(raw_message) -> Optional[int]:
+    """LLM 호출당 토큰 사용량 보고 (입력/캐시 적중 입력/출력), 전체 토큰 수 반환 (usage 없으면 None)"""
+    usage = getattr(raw_message, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+
+    metrics_service.increment("openai_tokens_total", input_tokens, model=INTENT_LLM_MODEL, kind="input")
+    metrics_service.increment("openai_tokens_total", cached_tokens, model=INTENT_LLM_MODEL, kind="cached_input")
+    metrics_service.increment("openai_tokens_total", output_tokens, model=INTENT_LLM_MODEL, kind="output")
+    logger.debug("의도 분석 토큰", input=input_tokens, cached_input=cached_tokens, output=output_tokens)
+    return input_tokens + output_tokens if usage else None
+
+
+@tracing_service.traced("openai.intent")
+async def call_intent_llm(query: str, timeout: float = INTENT_LLM_TIMEOUT) -> dict:
+    """
+    의도 분석 LLM 호출 (구조화 출력이므로 JSON 복구 단계 없음)
+
+    Raises:
+        asyncio.TimeoutError: timeout 초과
+        ValueError: 스키마에 맞지 않는 응답
+        CircuitOpenError: LLM 회로 열림
+    """
+    llm_breaker.check()
+    estimated_tokens = rate_limit_service.estimate_tokens(INTENT_SYSTEM_PROMPT + query) + INTENT_OUTPUT_TOKENS_ESTIMATE
+
+    # 지연시간은 완료/실패한 호출만 기록 (높은 유사도로 취소된 호출 제외)
+    start = time.perf_counter()
+    try:
+        output = await asyncio.wait_for(
+            rate_limit_service.acall_with_retry(
+                lambda: get_intent_llm().ainvoke([("system", INTENT_SYSTEM_PROMPT), ("human", query)]),
+                model=INTENT_LLM_MODEL,
+                tokens=estimated_tokens
+            ),
+            timeout=timeout
+        )
+    except Exception as e:
+        metrics_service.increment("openai_request_errors_total", operation="intent")
+        metrics_service.observe("openai_request_duration_ms", (time.perf_counter() - start) * 1000, operation="intent")
+        # 요청 마감 때문에 줄어든 제한 시간의 타임아웃은 OpenAI 장애가 아니므로 회로에 집계하지 않음
+        if not (isinstance(e, asyncio.TimeoutError) and timeout < INTENT_LLM_TIMEOUT):
+            llm_breaker.record_failure(e)
+        raise
+    metrics_service.observe("openai_request_duration_ms", (time.perf_counter() - start) * 1000, operation="intent")
+    llm_breaker.record_success()
+    rate_limit_service.record_usage(INTENT_LLM_MODEL, estimated_tokens, _record_token_usage(output.get("raw")))
+
+    if output.get("parsed") is None:
+        raise ValueError(f"의도 분석 구조화 출력 파싱 실패: {output.get('parsing_error')}")
+    return output["parsed"].model_dump()
 
-    return json.loads(s)
 
 # ============================================================================
 # LangGraph 워크플로우 노드 구현
 # ============================================================================
 
 def _debug_node_execution(node_name: str, state: dict, is_start: bool = True):
-    """노드 실행 디버깅 출력"""
-    action = "시작" if is_start else "완료"
-    print(f"🔍 [{node_name}] {action}")
-    if is_start:
-        print(f"   입력 상태: {list(state.keys())}")
-    else:
-        print(f"   출력 상태: {list(state.keys())}")
-    print("-" * 50)
+    """노드 실행 디버깅 로그"""
+    logger.debug(
+        f"[{node_name}] {'시작' if is_start else '완료'}",
+        state_keys=list(state.keys())
+    )
 
 
 def _debug_edge_transition(from_node: str, to_node: str, condition: str = None):
-    """엣지 전환 디버깅 출력"""
-    if condition:
-        print(f"➡️  [{from_node}] → [{to_node}] (조건: {condition})")
-    else:
-        print(f"➡️  [{from_node}] → [{to_node}]")
-    print("-" * 50)
+    """엣지 전환 디버깅 로그"""
+    logger.debug(f"[{from_node}] → [{to_node}]", condition=condition)
 
 
 async def analyze_user_intent(state: PathSelectionState) -> PathSelectionState:
@@ -96,10 +227,10 @@ async def analyze_user_intent(state: PathSelectionState) -> PathSelectionState:
     
     # 환경 변수 없으면 LLM 생략
     use_llm = bool(os.getenv("OPENAI_API_KEY"))
-    print(f"🔧 LLM 사용 여부: {use_llm}")
+    logger.debug("LLM 사용 여부", use_llm=use_llm)
     
     if not use_llm:
-        print("⚠️  OPENAI_API_KEY가 없어서 휴리스틱 폴백 사용")
+        logger.warning("OPENAI_API_KEY가 없어서 휴리스틱 폴백 사용")
         result = {
             "intent_type": "information_seeking",
             "domain_preference": None,
@@ -109,73 +240,14 @@ async def analyze_user_intent(state: PathSelectionState) -> PathSelectionState:
             "keywords": [state["user_query"]]  # 기본적으로 원본 쿼리 사용
         }
     else:
-        llm = ChatOpenAI(
-            model="gpt-4o-mini", 
-            temperature=0, 
-            max_retries=2,
-            request_timeout=10.0  # 10초 타임아웃 설정
-        )
-        
-        prompt = f"""
-        당신은 웹 자동화 서비스의 의도 분석 에이전트입니다.
-        사용자 쿼리를 분석하여 의도 유형, 도메인 선호도, 작업 복잡도, 신뢰도 점수, 핵심 키워드를 추출해주세요.
-
-        분석할 항목:
-        1. 의도 유형 (navigation, task_completion, information_seeking, exploration)
-        2. 도메인 선호도 (특정 사이트 언급 여부)
-        3. 작업 복잡도 (simple, moderate, complex)
-        4. 신뢰도 점수 (0.0-1.0)
-        5. 핵심 키워드 (검색에 사용할 핵심 단어들)
-
-        예시:
-        
-        query: "유튜브에서 좋아요 누르기"
-        response: {{
-            "intent_type": "task_completion",
-            "domain_preference": "youtube.com",
-            "complexity": "simple",
-            "confidence": 0.85,
-            "reasoning": "사용자가 유튜브에서 특정 작업을 수행하려는 의도가 명확함",
-            "keywords": ["유튜브", "좋아요", "누르기", "동영상"]
-        }}
-
-        query: "날씨가 너무 추워요"
-        response: {{
-            "intent_type": "information_seeking",
-            "domain_preference": null,
-            "complexity": "simple",
-            "confidence": 0.75,
-            "reasoning": "사용자가 날씨 정보를 찾고 있음",
-            "keywords": ["날씨", "추위", "온도", "기온"]
-        }}
-
-        query: "요즘 나라가 어떻게 굴러가나"
-        response: {{
-            "intent_type": "navigation",
-            "domain_preference": "naver.com",
-            "complexity": "simple",
-            "confidence": 0.90,
-            "reasoning": "최신 국내 정치, 사회 이슈를 보려는 의도로 보임.",
-            "keywords": ["시사", "정치", "뉴스", "최근 이슈"]
-        }}
-
-        이제 다음 쿼리를 분석해주세요:
-        query: "{state['user_query']}"
-        response:"""
-
         try:
-            print("🤖 LLM 호출 중...")
-            import asyncio
+            logger.debug("LLM 호출 중...")
             
-            # asyncio.wait_for로 타임아웃 설정 (12초 - LLM 자체 타임아웃 10초 + 여유 2초)
-            response = await asyncio.wait_for(
-                llm.ainvoke(prompt),
-                timeout=12.0
-            )
-            print(f"📝 LLM 응답: {response.content}")
-            result = parse_llm_json(response.content)
+            # 12초 타임아웃 (LLM 자체 타임아웃 10초 + 여유 2초)
+            result = await call_intent_llm(state["user_query"])
+            logger.debug("LLM 응답", result=result)
         except asyncio.TimeoutError:
-            print(f"❌ LLM 호출 타임아웃 (12초)")
+            logger.warning("LLM 호출 타임아웃 (12초)")
             result = {
                 "intent_type": "information_seeking",
                 "domain_preference": None,
@@ -185,7 +257,7 @@ async def analyze_user_intent(state: PathSelectionState) -> PathSelectionState:
                 "keywords": [state["user_query"]]
             }
         except Exception as e:
-            print(f"❌ LLM 호출 실패: {e}")
+            logger.error("LLM 호출 실패", error=str(e))
             result = {
                 "intent_type": "information_seeking",
                 "domain_preference": None,
@@ -198,40 +270,88 @@ async def analyze_user_intent(state: PathSelectionState) -> PathSelectionState:
     output_state = {
         **state,
         "intent_analysis": result,
-        "query_embedding": generate_embedding(state["user_query"])
+        "query_embedding": state.get("query_embedding") or generate_embedding(state["user_query"])
     }
     
     return output_state
 
 
+@tracing_service.traced("langgraph.parallel_analysis")
 async def analyze_similarity_and_intent_parallel(state: PathSelectionState) -> PathSelectionState:
     """
     벡터 유사도 분석과 의도 분석을 병렬로 실행 (Speculative Execution)
     
     최적화 전략:
-    - 높은 유사도: similarity 결과만 사용 (intent 결과는 버림)
+    - 높은 유사도: similarity 결과가 나오는 즉시 intent(LLM) 태스크를 취소하고 진행
     - 낮은 유사도: 두 결과 모두 즉시 사용 (대기 시간 제거)
     
     예상 효과: 낮은 유사도 경로에서 500-2000ms 절약 (약 40-60% 성능 향상)
     """
-    import asyncio
-    import time
-    
+    # 직접 파이프라인(search_fast_path)에서 이미 분석한 상태로 재탐색만 요청된 경우
+    if state.get("analysis_completed"):
+        return state
+
     start_time = time.time()
+    loop = asyncio.get_event_loop()
+    stage_timings = dict(state.get("stage_timings") or {})
+    embedding_cache = state.get("embedding_cache")
+    # 과부하로 생략된 단계 (두 태스크가 공유, 어드미션 거절 시 설정)
+    admission = {"degraded": state.get("degraded")}
+    # 실제 의도 분석 LLM 호출 여부 (로컬 분류기/캐시/휴리스틱 응답은 intent_llm_calls_total에 집계하지 않음)
+    llm_call = {"started": False, "succeeded": False}
+
+    # 쿼리 임베딩은 워크플로우당 한 번만 계산하고 공유 future로 재사용
+    if state.get("query_embedding"):
+        embedding_future = loop.create_future()
+        embedding_future.set_result(state["query_embedding"])
+    else:
+        embedding_cache = "hit" if is_embedding_cached(state["user_query"]) else "miss"
+
+        def embed_query():
+            # 워커 스레드에서는 소요 시간만 반환하고, stage_timings 기록은 이벤트 루프에서 수행
+            embedding_start = time.perf_counter()
+            embedding = generate_embedding(state["user_query"])
+            return embedding, (time.perf_counter() - embedding_start) * 1000
+
+        async def embed_and_record():
+            if embedding_cache == "hit":
+                embedding, elapsed_ms = await tracing_service.run_in_executor(embed_query, name="embedding")
+            else:
+                embedding, elapsed_ms = await admission_service.run_in_executor(
+                    "embedding", embed_query, timeout=_time_left(state), name="embedding"
+                )
+            _record_stage(stage_timings, "embedding", elapsed_ms, cache=embedding_cache)
+            return embedding
+
+        embedding_future = asyncio.ensure_future(embed_and_record())
     
     # 병렬 실행: 유사도 분석 + 의도 분석
+    @tracing_service.traced("similarity_task")
     async def similarity_task():
         """유사도 분석 태스크 (non-blocking)"""
+        try:
+            query_embedding = await embedding_future
+        except admission_service.AdmissionRejected:
+            # 임베딩 대기열 포화: 벡터 검색 없이 빈 결과 (load shedding)
+            admission["degraded"] = "embedding"
+            return {
+                "max_similarity": 0.0,
+                "cached_search_results": None,
+                "similarity_threshold": SIMILARITY_THRESHOLD
+            }
+
         # Neo4j 검색을 별도 스레드에서 실행 (blocking → non-blocking)
-        loop = asyncio.get_event_loop()
-        existing_results = await loop.run_in_executor(
-            None,
-            lambda: neo4j_service.search_paths_by_query(
+        existing_results = await tracing_service.run_in_executor(
+            lambda: neo4j_service.search_paths_by_embedding(
                 state["user_query"],
+                query_embedding,
                 limit=state.get("limit", 3),
-                domain_hint=state["domain_hint"]
-            )
+                domain_hint=state["domain_hint"],
+                hydrate=state.get("hydrate", True)
+            ),
+            name="search_paths_by_embedding"
         )
+        _record_search_stages(stage_timings, existing_results)
         
         max_similarity = 0.0
         if existing_results and existing_results["matched_paths"]:
@@ -240,16 +360,30 @@ async def analyze_similarity_and_intent_parallel(state: PathSelectionState) -> P
         return {
             "max_similarity": max_similarity,
             "cached_search_results": existing_results,
-            "similarity_threshold": 0.43
+            "similarity_threshold": SIMILARITY_THRESHOLD
         }
     
+    @tracing_service.traced("intent_task")
     async def intent_task():
-        """의도 분석 태스크"""
-        # analyze_user_intent 로직 실행
-        use_llm = bool(os.getenv("OPENAI_API_KEY"))
+        """의도 분석 태스크 (로컬 분류기 우선, 신뢰도가 낮을 때만 LLM 호출)"""
+        try:
+            query_embedding = await embedding_future
+        except (admission_service.AdmissionRejected, circuit_breaker.CircuitOpenError):
+            # 임베딩 회로 열림은 similarity_task가 노드 밖으로 전달 (여기서는 로컬 분류기만 생략)
+            query_embedding = None
+        local_start = time.perf_counter()
+        local_result = intent_classifier.classify_intent(state["user_query"], query_embedding) if query_embedding else None
+        if local_result:
+            _record_stage(stage_timings, "intent_local", (time.perf_counter() - local_start) * 1000)
+        if local_result and local_result["confidence"] >= intent_classifier.LOCAL_CONFIDENCE_THRESHOLD:
+            metrics_service.increment("intent_analysis_total", source="local")
+            return {"intent_analysis": local_result}
+
+        # analyze_user_intent 로직 실행 (과부하 상태이거나 LLM 회로가 열려 있으면 휴리스틱 의도 사용)
+        use_llm = bool(os.getenv("OPENAI_API_KEY")) and not admission["degraded"] and not llm_breaker.is_open()
         
         if not use_llm:
-            result = {
+            result = local_result or {
                 "intent_type": "information_seeking",
                 "domain_preference": None,
                 "complexity": "simple",
@@ -258,68 +392,69 @@ async def analyze_similarity_and_intent_parallel(state: PathSelectionState) -> P
                 "keywords": [state["user_query"]]
             }
         else:
-            llm = ChatOpenAI(
-                model="gpt-4o-mini", 
-                temperature=0, 
-                max_retries=2,
-                request_timeout=10.0
-            )
-            
-            prompt = f"""
-            당신은 웹 자동화 서비스의 의도 분석 에이전트입니다.
-            사용자 쿼리를 분석하여 의도 유형, 도메인 선호도, 작업 복잡도, 신뢰도 점수, 핵심 키워드를 추출해주세요.
-
-            분석할 항목:
-            1. 의도 유형 (navigation, task_completion, information_seeking, exploration)
-            2. 도메인 선호도 (특정 사이트 언급 여부)
-            3. 작업 복잡도 (simple, moderate, complex)
-            4. 신뢰도 점수 (0.0-1.0)
-            5. 핵심 키워드 (검색에 사용할 핵심 단어들)
-
-            예시:
-            
-            query: "유튜브에서 좋아요 누르기"
-            response: {{
-                "intent_type": "task_completion",
-                "domain_preference": "youtube.com",
-                "complexity": "simple",
-                "confidence": 0.85,
-                "reasoning": "사용자가 유튜브에서 특정 작업을 수행하려는 의도가 명확함",
-                "keywords": ["유튜브", "좋아요", "누르기", "동영상"]
-            }}
-
-            query: "날씨가 너무 추워요"
-            response: {{
-                "intent_type": "information_seeking",
-                "domain_preference": null,
-                "complexity": "simple",
-                "confidence": 0.75,
-                "reasoning": "사용자가 날씨 정보를 찾고 있음",
-                "keywords": ["날씨", "추위", "온도", "기온"]
-            }}
-
-            query: "요즘 나라가 어떻게 굴러가나"
-            response: {{
-                "intent_type": "navigation",
-                "domain_preference": "naver.com",
-                "complexity": "simple",
-                "confidence": 0.90,
-                "reasoning": "최신 국내 정치, 사회 이슈를 보려는 의도로 보임.",
-                "keywords": ["시사", "정치", "뉴스", "최근 이슈"]
-            }}
-
-            이제 다음 쿼리를 분석해주세요:
-            query: "{state['user_query']}"
-            response:"""
+            # 메모리 캐시 미스일 때만 SQLite 조회를 스레드에서 실행 (이벤트 루프에서 블로킹 I/O 없음)
+            cached = intent_cache.peek(state["user_query"], INTENT_PROMPT_VERSION)
+            if cached is None:
+                cached = await tracing_service.run_in_executor(
+                    intent_cache.lookup, state["user_query"], INTENT_PROMPT_VERSION, name="intent_cache.lookup"
+                )
+            if cached is not None:
+                metrics_service.increment("intent_analysis_total", source="cache")
+                if cached["failed"]:
+                    return {"intent_analysis": {
+                        "intent_type": "information_seeking",
+                        "domain_preference": None,
+                        "complexity": "simple",
+                        "confidence": 0.5,
+                        "reasoning": "최근 LLM 응답 파싱 실패(캐시)로 인한 폴백",
+                        "keywords": [state["user_query"]]
+                    }}
+                return {"intent_analysis": cached["result"]}
+
+            if not await admission_service.acquire("llm", _time_left(state)):
+                # LLM 대기열 포화: 재탐색 없이 벡터 검색 결과만 사용
+                admission["degraded"] = "llm"
+                return {"intent_analysis": local_result or {
+                    "intent_type": "information_seeking",
+                    "domain_preference": None,
+                    "complexity": "simple",
+                    "confidence": 0.5,
+                    "reasoning": "LLM 대기열 포화로 인한 폴백",
+                    "keywords": [state["user_query"]]
+                }}
 
+            llm_start = time.time()
+            llm_call["started"] = True
             try:
-                response = await asyncio.wait_for(
-                    llm.ainvoke(prompt),
-                    timeout=12.0
+                time_left = _time_left(state)
+                try:
+                    result = await call_intent_llm(
+                        state["user_query"],
+                        timeout=INTENT_LLM_TIMEOUT if time_left is None else min(INTENT_LLM_TIMEOUT, time_left)
+                    )
+                except ValueError:
+                    # 파싱 실패도 캐시하여 같은 쿼리로 LLM을 연속 재호출하지 않음
+                    tracing_service.run_in_executor(
+                        lambda: intent_cache.store(state["user_query"], INTENT_PROMPT_VERSION, None, failed=True),
+                        name="intent_cache.store"
+                    )
+                    raise
+                _record_stage(stage_timings, "intent_llm", (time.time() - llm_start) * 1000, outcome="ok")
+                metrics_service.increment("intent_analysis_total", source="llm")
+                llm_call["succeeded"] = True
+                tracing_service.run_in_executor(
+                    intent_cache.store, state["user_query"], INTENT_PROMPT_VERSION, result
                 )
-                result = parse_llm_json(response.content)
+
+                # 로컬 분류기 학습 데이터로 기록 (활성화된 경우만, 응답 경로를 막지 않도록 스레드에서)
+                if intent_classifier.INTENT_LOG_ENABLED:
+                    llm_latency_ms = int((time.time() - llm_start) * 1000)
+                    tracing_service.run_in_executor(
+                        intent_classifier.log_llm_intent, state["user_query"], result, llm_latency_ms
+                    )
             except asyncio.TimeoutError:
-                print("⚠️ LLM 타임아웃, 폴백 사용")
+                _record_stage(stage_timings, "intent_llm", (time.time() - llm_start) * 1000, outcome="timeout")
+                logger.warning("LLM 타임아웃, 폴백 사용")
                 result = {
                     "intent_type": "information_seeking",
                     "domain_preference": None,
@@ -329,7 +464,8 @@ async def analyze_similarity_and_intent_parallel(state: PathSelectionState) -> P
                     "keywords": [state["user_query"]]
                 }
             except Exception as e:
-                print(f"⚠️ LLM 실패: {str(e)[:50]}...")
+                _record_stage(stage_timings, "intent_llm", (time.time() - llm_start) * 1000, outcome="error")
+                logger.warning("LLM 실패, 폴백 사용", error=str(e))
                 result = {
                     "intent_type": "information_seeking",
                     "domain_preference": None,
@@ -338,30 +474,66 @@ async def analyze_similarity_and_intent_parallel(state: PathSelectionState) -> P
                     "reasoning": f"LLM 실패로 인한 폴백: {str(e)}",
                     "keywords": [state["user_query"]]
                 }
-        
-        # embedding 생성 (non-blocking)
-        loop = asyncio.get_event_loop()
-        query_embedding = await loop.run_in_executor(
-            None,
-            lambda: generate_embedding(state["user_query"])
-        )
+            finally:
+                admission_service.release("llm")
         
         return {
-            "intent_analysis": result,
-            "query_embedding": query_embedding
+            "intent_analysis": result
         }
     
-    # 병렬 실행
-    similarity_result, intent_result = await asyncio.gather(
-        similarity_task(),
-        intent_task()
-    )
+    # 병렬 실행 (경쟁): 유사도가 임계값을 넘으면 LLM 호출을 기다리지 않음
+    similarity_future = asyncio.ensure_future(similarity_task())
+    intent_future = asyncio.ensure_future(intent_task())
+    cut_short_stages = list(state.get("cut_short_stages") or [])
+
+    try:
+        similarity_result = await asyncio.wait_for(similarity_future, timeout=_time_left(state))
+    except asyncio.TimeoutError:
+        # 마감 초과: 유사도 결과 없이 진행 (재탐색 단계도 남은 시간이 없으므로 빈 결과)
+        logger.warning("마감 시간 초과: 벡터 유사도 분석 중단")
+        cut_short_stages.append("similarity_search")
+        similarity_result = {
+            "max_similarity": 0.0,
+            "cached_search_results": None,
+            "similarity_threshold": SIMILARITY_THRESHOLD
+        }
+    except BaseException:
+        intent_future.cancel()
+        raise
+
+    if similarity_result["max_similarity"] >= similarity_result["similarity_threshold"]:
+        # 높은 유사도: intent 결과는 버려지므로 진행 중인 LLM 호출 취소
+        if intent_future.done():
+            if llm_call["started"]:
+                metrics_service.increment("intent_llm_calls_total", outcome="discarded")
+        else:
+            intent_future.cancel()
+            if llm_call["started"]:
+                metrics_service.increment("intent_llm_calls_total", outcome="cancelled")
+            logger.debug("높은 유사도로 의도 분석 LLM 호출 취소", max_similarity=round(similarity_result['max_similarity'], 3))
+        intent_result = {}
+    else:
+        try:
+            intent_result = await asyncio.wait_for(intent_future, timeout=_time_left(state))
+            if llm_call["succeeded"]:
+                metrics_service.increment("intent_llm_calls_total", outcome="used")
+        except asyncio.TimeoutError:
+            logger.warning("마감 시간 초과: 의도 분석 중단")
+            cut_short_stages.append("intent_analysis")
+            intent_result = {}
     
-    # 결과 병합
+    # 결과 병합 (임베딩은 similarity_task에서 이미 완료됨, 마감 초과 시 빈 값)
+    embedding_ready = embedding_future.done() and not embedding_future.cancelled() and embedding_future.exception() is None
     output_state = {
         **state,
         **similarity_result,
-        **intent_result
+        **intent_result,
+        "query_embedding": embedding_future.result() if embedding_ready else [],
+        "analysis_completed": True,
+        "cut_short_stages": cut_short_stages,
+        "stage_timings": stage_timings,
+        "embedding_cache": embedding_cache,
+        "degraded": admission["degraded"]
     }
     
     return output_state
@@ -374,33 +546,44 @@ def should_use_rediscovery_agent(state: PathSelectionState) -> str:
     Returns:
     - "high_similarity": 기존 경로 순위화 사용
     - "low_similarity": 다른 Agent로 재탐색 사용
+    - "degraded": 낮은 유사도지만 과부하로 재탐색 없이 벡터 검색 결과 사용
     """
     max_similarity = state["max_similarity"]
     threshold = state["similarity_threshold"]
     
     if max_similarity >= threshold:
         return "high_similarity"
+    elif state.get("degraded"):
+        return "degraded"
     else:
         return "low_similarity"
 
 
+@tracing_service.traced("langgraph.rank_existing_paths")
 async def rank_existing_paths(state: PathSelectionState) -> PathSelectionState:
     """
     높은 유사도가 확인된 경우 기존 경로들을 순위화
     
     높은 유사도일 때는 의도 분석 없이 기존 경로만 반환
+    과부하(degraded)로 재탐색을 생략한 낮은 유사도 요청도 벡터 검색 결과를 그대로 반환
     
     최적화: analyze_vector_similarity에서 캐싱된 검색 결과 재사용
     """
     
     # 캐시된 검색 결과 사용 (중복 Neo4j 쿼리 방지)
     existing_results = state.get("cached_search_results")
+
+    degraded = should_use_rediscovery_agent(state) == "degraded"
+    strategy = "degraded_vector_only" if degraded else "rank_existing_paths"
+    if degraded:
+        metrics_service.increment("search_degraded_total", stage=state["degraded"])
+        logger.warning("과부하로 재탐색 생략 (벡터 검색 결과만 사용)", stage=state["degraded"])
     
     if not existing_results:
         return {
             **state,
             "selected_paths": [],
-            "processing_strategy": "rank_existing_paths",
+            "processing_strategy": strategy,
             "reasoning": "캐시된 검색 결과가 없어서 빈 결과 반환"
         }
     
@@ -410,39 +593,89 @@ async def rank_existing_paths(state: PathSelectionState) -> PathSelectionState:
     output_state = {
         **state,
         "selected_paths": selected_paths,
-        "processing_strategy": "rank_existing_paths",
-        "reasoning": f"높은 유사도({state['max_similarity']:.3f})로 캐시된 경로 사용"
+        "processing_strategy": strategy,
+        "reasoning": (
+            f"과부하({state['degraded']} 대기열 포화)로 재탐색 없이 벡터 검색 결과 사용"
+            if degraded else
+            f"높은 유사도({state['max_similarity']:.3f})로 캐시된 경로 사용"
+        )
     }
     
     return output_state
 
 
+@tracing_service.traced("langgraph.rediscover_with_agent")
 async def rediscover_with_different_agent(state: PathSelectionState) -> PathSelectionState:
     """
-    낮은 유사도 상황에서 다른 Agent 전략으로 경로 재탐색 (최적화)
+    낮은 유사도 상황에서 여러 Agent로 경로 재탐색 (병렬 + 수집 윈도우)
     
-    다른 Agent 전략:
-    1. 키워드 기반 검색 Agent (단일 Agent로 최적화)
+    REDISCOVERY_AGENTS에 등록된 Agent를 동시에 실행하고, 도착하는 순서대로 결과를 병합합니다.
+    수집 윈도우(REDISCOVERY_COLLECTION_WINDOW_MS, 마감 시각으로 제한)가 끝나면
+    가장 느린 Agent를 기다리지 않고 그때까지 모인 결과로 진행합니다.
     """
     
-    rediscovered_paths = []
-    
-    # Agent 1: 키워드 기반 검색 Agent (단일 Agent로 최적화)
-    keyword_agent_paths = await keyword_based_search_agent(state)
-    rediscovered_paths.extend(keyword_agent_paths)
-    
-    # 중복 제거 (간단한 방식)
-    unique_paths = []
-    seen_intents = set()
-    for path in rediscovered_paths:
-        intent_key = f"{path.get('domain', '')}_{path.get('taskIntent', '')}"
-        if intent_key not in seen_intents:
-            seen_intents.add(intent_key)
-            unique_paths.append(path)
+    cut_short_stages = list(state.get("cut_short_stages") or [])
+    agent_stats = {}
+    best_by_key = {}  # (domain, taskIntent) → 최고 점수 경로
+
+    def merge(paths: List[dict]):
+        for path in paths:
+            key = (path.get("domain", ""), path.get("taskIntent", ""))
+            if key not in best_by_key or path.get("relevance_score", 0.0) > best_by_key[key].get("relevance_score", 0.0):
+                best_by_key[key] = path
+
+    time_left = _time_left(state)
+    if time_left == 0.0 or not state.get("intent_analysis"):
+        cut_short_stages.append("rediscovery_agents")
+    else:
+        window = REDISCOVERY_COLLECTION_WINDOW_MS / 1000
+        limited_by_deadline = time_left is not None and time_left < window
+        collection_deadline = time.monotonic() + (time_left if limited_by_deadline else window)
+
+        start = time.monotonic()
+        tasks = {
+            asyncio.ensure_future(agent(state)): name
+            for name, agent in REDISCOVERY_AGENTS.items()
+        }
+        pending = set(tasks)
+
+        # 도착하는 대로 병합
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0.0, collection_deadline - time.monotonic()),
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for task in done:
+                name = tasks[task]
+                latency_ms = int((time.monotonic() - start) * 1000)
+                try:
+                    paths = task.result()
+                    merge(paths)
+                    agent_stats[name] = {"status": "completed", "latency_ms": latency_ms, "paths": len(paths)}
+                except Exception as e:
+                    logger.warning("Agent 실패", agent=name, error=str(e))
+                    agent_stats[name] = {"status": "failed", "latency_ms": latency_ms, "paths": 0}
+
+        # 윈도우 안에 끝나지 않은 Agent는 취소
+        for task in pending:
+            task.cancel()
+            name = tasks[task]
+            agent_stats[name] = {"status": "timed_out", "latency_ms": int((time.monotonic() - start) * 1000), "paths": 0}
+            if limited_by_deadline:
+                cut_short_stages.append(f"{name}_agent")
+        if pending:
+            logger.info("수집 윈도우 종료: 남은 Agent 결과 없이 진행", agents=[tasks[t] for t in pending])
+
+    # 재탐색 결과가 없고 중단된 단계가 있으면 이미 순위화된 벡터 검색 결과라도 반환 (best-effort)
+    if not best_by_key and cut_short_stages and state.get("cached_search_results"):
+        merge(state["cached_search_results"]["matched_paths"])
     
     # 점수 재계산 (간단한 방식)
     scored_paths = []
-    for i, path in enumerate(unique_paths):
+    for path in best_by_key.values():
         # 기본 점수에 약간의 보너스만 추가
         base_score = path.get("relevance_score", 0.0)
         path["rediscovery_score"] = base_score + 0.1  # 간단한 보너스
@@ -450,19 +683,34 @@ async def rediscover_with_different_agent(state: PathSelectionState) -> PathSele
     
     # 점수로 정렬
     scored_paths.sort(key=lambda x: x["rediscovery_score"], reverse=True)
+    selected = scored_paths[:state.get("limit", 3)]
+
+    # Agent별 기여도 (최종 선택된 경로 수) 및 지연시간 기록
+    stage_timings = dict(state.get("stage_timings") or {})
+    for name, stats in agent_stats.items():
+        stats["contributed"] = sum(1 for p in selected if p.get("agent_source") == name)
+        _record_stage(stage_timings, f"{name}_agent", stats["latency_ms"], status=stats["status"])
+        metrics_service.increment("rediscovery_agent_runs_total", agent=name, status=stats["status"])
+        metrics_service.increment("rediscovery_agent_paths_total", stats["paths"], agent=name)
+        metrics_service.increment("rediscovery_agent_contributed_total", stats["contributed"], agent=name)
+        metrics_service.increment("rediscovery_agent_latency_ms_total", stats["latency_ms"], agent=name)
     
     # 클라이언트가 모르는 필드 제거 후 반환
     forbidden = {"agent_source", "rediscovery_score", "composite_score"}
     cleaned_paths = [
         {k: v for k, v in p.items() if k not in forbidden}
-        for p in scored_paths
+        for p in selected
     ]
 
+    used_agents = [name for name, stats in agent_stats.items() if stats["contributed"]]
     output_state = {
         **state,
-        "selected_paths": cleaned_paths[:state.get("limit", 3)],
+        "selected_paths": cleaned_paths,
         "processing_strategy": "rediscover_with_different_agent",
-        "reasoning": f"낮은 유사도({state['max_similarity']:.3f})로 키워드 기반 Agent 사용"
+        "reasoning": f"낮은 유사도({state['max_similarity']:.3f})로 다중 Agent 사용 (기여: {', '.join(used_agents) or '없음'})",
+        "cut_short_stages": cut_short_stages,
+        "agent_stats": agent_stats,
+        "stage_timings": stage_timings
     }
     
     return output_state
@@ -472,51 +720,47 @@ async def rediscover_with_different_agent(state: PathSelectionState) -> PathSele
 # 다중 Agent 구현
 # ============================================================================
 
+@tracing_service.traced("agent.keyword_based")
 async def keyword_based_search_agent(state: PathSelectionState) -> List[dict]:
-    """키워드 기반 검색 Agent (최적화 - 병렬 검색)"""
-    import asyncio
+    """
+    키워드 기반 검색 Agent (최적화 - 배치 임베딩 + 다중 벡터 단일 쿼리)
     
+    추출된 키워드 전체(최대 4개)를 한 번의 임베딩 배치로 변환하고,
+    한 번의 UNWIND 벡터 검색과 한 번의 경로 재구성으로 처리
+    """
     # 키워드 추출 및 확장
     keywords = extract_and_expand_keywords(state["user_query"], state["intent_analysis"])
     
-    # 병렬 검색을 위한 비동기 함수
-    async def search_keyword(keyword: str) -> List[dict]:
-        try:
-            # Neo4j 검색을 별도 스레드에서 실행 (blocking -> non-blocking)
-            loop = asyncio.get_event_loop()
-            results = await loop.run_in_executor(
-                None,
-                lambda: neo4j_service.search_paths_by_query(
-                    keyword,
-                    limit=1,  # 각 키워드당 1개만 가져오기
-                    domain_hint=None  # 도메인 제한 없이 검색
-                )
-            )
-            
-            if results and results["matched_paths"]:
-                paths = []
-                for path in results["matched_paths"]:
-                    path["agent_source"] = "keyword_based"
-                    paths.append(path)
-                return paths
-            return []
-        except Exception as e:
-            return []
-    
-    # 최대 2개 키워드를 병렬로 검색
-    search_tasks = [search_keyword(keyword) for keyword in keywords[:2]]
-    results_lists = await asyncio.gather(*search_tasks)
+    try:
+        # Neo4j/OpenAI 호출을 별도 스레드에서 실행 (blocking -> non-blocking)
+        embeddings = await admission_service.run_in_executor(
+            "embedding", generate_embeddings, keywords, timeout=_time_left(state), name="generate_embeddings"
+        )
+        results = await tracing_service.run_in_executor(
+            lambda: neo4j_service.search_paths_by_embeddings(
+                keywords,
+                embeddings,
+                limit_per_query=1,  # 각 키워드당 1개만 가져오기
+                domain_hint=None  # 도메인 제한 없이 검색
+            ),
+            name="search_paths_by_embeddings"
+        )
+    except Exception as e:
+        logger.warning("키워드 Agent 검색 실패", error=str(e))
+        return []
     
-    # 결과 병합
     paths = []
-    for result_list in results_lists:
-        paths.extend(result_list)
+    if results and results["matched_paths"]:
+        for path in results["matched_paths"]:
+            path["agent_source"] = "keyword_based"
+            paths.append(path)
     
     return paths
 
 
+@tracing_service.traced("agent.cross_domain")
 async def cross_domain_search_agent(state: PathSelectionState) -> List[dict]:
-    """도메인 크로스 검색 Agent (최적화)"""
+    """도메인 크로스 검색 Agent (최적화 - non-blocking)"""
     intent_analysis = state["intent_analysis"]
     paths = []
     
@@ -524,10 +768,20 @@ async def cross_domain_search_agent(state: PathSelectionState) -> List[dict]:
     similar_intent_query = generate_cross_domain_query(intent_analysis)
     
     try:
-        results = neo4j_service.search_paths_by_query(
-            similar_intent_query,
-            limit=2,  # 3개에서 2개로 줄임
-            domain_hint=None  # 모든 도메인에서 검색
+        # 임베딩은 어드미션 제한을 거쳐 먼저 캐시에 채워 둠 (search_paths_by_query에서 캐시 히트)
+        if not is_embedding_cached(similar_intent_query):
+            await admission_service.run_in_executor(
+                "embedding", generate_embedding, similar_intent_query, timeout=_time_left(state), name="embedding"
+            )
+
+        # Neo4j/OpenAI 호출을 별도 스레드에서 실행 (blocking -> non-blocking)
+        results = await tracing_service.run_in_executor(
+            lambda: neo4j_service.search_paths_by_query(
+                similar_intent_query,
+                limit=2,  # 3개에서 2개로 줄임
+                domain_hint=None  # 모든 도메인에서 검색
+            ),
+            name="search_paths_by_query"
         )
         
         if results and results["matched_paths"]:
@@ -535,10 +789,21 @@ async def cross_domain_search_agent(state: PathSelectionState) -> List[dict]:
                 path["agent_source"] = "cross_domain"
                 paths.append(path)
     except Exception as e:
-        pass
+        logger.warning("크로스 도메인 Agent 검색 실패", error=str(e))
     
     return paths
 
+
+# 재탐색 Agent 레지스트리 (이름 → 비동기 Agent 함수). 새 Agent는 여기에 등록하면 병렬로 실행됨
+REDISCOVERY_AGENTS = {
+    "keyword_based": keyword_based_search_agent,
+    "cross_domain": cross_domain_search_agent
+}
+
+# 재탐색 결과 수집 윈도우 (가장 느린 Agent를 기다리지 않음)
+REDISCOVERY_COLLECTION_WINDOW_MS = int(os.getenv("REDISCOVERY_COLLECTION_WINDOW_MS", "1500"))
+
+
 # ============================================================================
 # 유틸리티 함수들
 # ============================================================================
@@ -640,7 +905,8 @@ def build_path_selection_graph():
         should_use_rediscovery_agent,
         {
             "high_similarity": "rank_existing_paths",
-            "low_similarity": "rediscover_with_agent"
+            "low_similarity": "rediscover_with_agent",
+            "degraded": "rank_existing_paths"
         }
     )
 
@@ -674,13 +940,14 @@ def print_langgraph_structure():
     print("3. rediscover_with_agent - 다른 Agent로 재탐색 (유사도 < 0.43)")
     
     print("\n분기 조건:")
-    print("- 유사도 >= 0.43: rank_existing_paths (intent 결과 미사용)")
+    print("- 유사도 >= 0.43: rank_existing_paths (intent LLM 호출 즉시 취소)")
     print("- 유사도 < 0.43: rediscover_with_agent (두 결과 모두 사용)")
     
     print("\n워크플로우 그래프 (병렬 실행):")
     print("parallel_analysis [similarity ∥ intent] → {")
     print("    high_similarity: rank_existing_paths → END")
     print("    low_similarity: rediscover_with_agent → END")
+    print("    degraded: rank_existing_paths → END  (LLM/임베딩 대기열 포화 시)")
     print("}")
     
     print("\n최적화 효과:")
@@ -697,6 +964,10 @@ def print_langgraph_structure():
 
 def get_workflow_info():
     """워크플로우 정보를 딕셔너리로 반환 (병렬 실행 최적화)"""
+    intent_calls = {
+        outcome: metrics_service.get_counter("intent_llm_calls_total", outcome=outcome)
+        for outcome in ("used", "cancelled", "discarded")
+    }
     return {
         "entry_point": "parallel_analysis",
         "end_points": ["END"],
@@ -707,59 +978,352 @@ def get_workflow_info():
             "rank_existing_paths": "기존 경로 순위화 (유사도 >= 0.43)",
             "rediscover_with_agent": "다른 Agent로 재탐색 (유사도 < 0.43)"
         },
-        "threshold": 0.43,
+        "threshold": SIMILARITY_THRESHOLD,
         "branches": {
             "high_similarity": "rank_existing_paths",
-            "low_similarity": "rediscover_with_agent"
+            "low_similarity": "rediscover_with_agent",
+            "degraded": "rank_existing_paths"
         },
         "optimization": "speculative_parallel_execution",
-        "expected_speedup": "100-900ms for low similarity paths"
+        "expected_speedup": "100-900ms for low similarity paths",
+        "metrics": {
+            "intent_llm_calls": intent_calls
+        }
+    }
+
+
+# ============================================================================
+# 직접 파이프라인 (LangGraph 런타임 우회)
+# ============================================================================
+
+# 직접 파이프라인 사용 여부 (0이면 항상 workflow.ainvoke 사용)
+FAST_PATH_ENABLED = os.getenv("SEARCH_FAST_PATH", "1") != "0"
+
+
+def build_initial_state(
+    query: str,
+    limit: int,
+    domain_hint: Optional[str],
+    deadline: Optional[float] = None,
+    query_embedding: Optional[List[float]] = None,
+    hydrate: bool = True
+) -> PathSelectionState:
+    """
+    워크플로우 초기 상태 생성 (deadline: time.monotonic 기준 마감 시각)
+
+    query_embedding이 주어지면 (클라이언트가 계산한 임베딩) 임베딩 단계를 생략합니다.
+    hydrate=False면 벡터 검색 경로를 재구성하지 않고 헤더만 선택합니다 (hydrate_paths로 나중에 재구성).
+    """
+    return {
+        "user_query": query,
+        "domain_hint": domain_hint,
+        "limit": limit,
+        "query_embedding": query_embedding or [],  # 없으면 분석 노드에서 생성
+        "intent_analysis": {},  # 빈 딕셔너리로 초기화
+        "similarity_threshold": 0.0,
+        "max_similarity": 0.0,
+        "selected_paths": [],
+        "processing_strategy": "",
+        "reasoning": "",
+        "cached_search_results": None,  # 캐시 초기화
+        "analysis_completed": False,
+        "agent_stats": {},
+        "stage_timings": {},
+        "embedding_cache": "client" if query_embedding else None,
+        "deadline": deadline,
+        "cut_short_stages": [],
+        "degraded": None,
+        "hydrate": hydrate
     }
 
 
+@tracing_service.traced("search_fast_path")
+async def search_fast_path(state: PathSelectionState) -> PathSelectionState:
+    """
+    높은 유사도 경로를 LangGraph 런타임 없이 직접 실행
+
+    노드 함수를 그대로 호출하므로 의미는 워크플로우와 동일:
+    parallel_analysis → (high_similarity / degraded) rank_existing_paths
+    낮은 유사도일 때만 분석이 끝난 상태로 워크플로우를 호출하여 재탐색 (분석 노드는 건너뜀)
+    """
+    analyzed_state = await analyze_similarity_and_intent_parallel(state)
+
+    if should_use_rediscovery_agent(analyzed_state) != "low_similarity":
+        return await rank_existing_paths(analyzed_state)
+
+    return await get_or_build_workflow().ainvoke(analyzed_state)
+
+
 # ============================================================================
 # 메인 서비스 함수
 # ============================================================================
 
+# 회로가 열렸을 때 대신 응답할 최근 검색 결과 수
+RECENT_RESULTS_MAX = int(os.getenv("RECENT_RESULTS_MAX", "512"))
+
+# (정규화 쿼리, limit, domain_hint) → (저장 시각, 검색 응답), 오래된 순으로 제거
+_recent_results = OrderedDict()
+
+
+def _remember_result(key: tuple, response: dict):
+    """경로가 있는 검색 응답 보관 (응답 직렬화 단계의 수정이 반영되지 않도록 performance 복사)"""
+    # 재구성 전 헤더가 섞인 응답(스트리밍)은 그대로 돌려줄 수 없으므로 보관하지 않음
+    if not response["matched_paths"] or any("steps" not in path for path in response["matched_paths"]):
+        return
+    _recent_results[key] = (time.time(), {**response, "performance": dict(response["performance"])})
+    _recent_results.move_to_end(key)
+    while len(_recent_results) > RECENT_RESULTS_MAX:
+        _recent_results.popitem(last=False)
+
+
+def _circuit_open_response(query: str, key: tuple, dependency: str, start_time: float, budget_ms: int) -> dict:
+    """회로가 열린 경우 즉시 응답 (같은 검색의 최근 결과가 있으면 재사용, 없으면 빈 결과)"""
+    cached = _recent_results.get(key)
+    metrics_service.increment("search_circuit_open_total", dependency=dependency, cached=str(cached is not None).lower())
+    performance = {
+        "search_time": int((time.time() - start_time) * 1000),
+        "deadline_ms": budget_ms,
+        "cut_short": [],
+        "stages": {}
+    }
+
+    if cached:
+        stored_at, response = cached
+        logger.warning("회로 열림: 최근 검색 결과로 응답", dependency=dependency, query=query)
+        return {
+            **response,
+            "query": query,
+            "performance": {
+                **response["performance"],
+                **performance,
+                "strategy": "circuit_open_cached",
+                "reasoning": f"{dependency} 회로 열림: 최근 검색 결과 사용",
+                "cached_age_ms": int((time.time() - stored_at) * 1000)
+            }
+        }
+
+    logger.warning("회로 열림: 빈 결과로 응답", dependency=dependency, query=query)
+    return {
+        "query": query,
+        "total_matched": 0,
+        "matched_paths": [],
+        "performance": {
+            **performance,
+            "strategy": "circuit_open",
+            "reasoning": f"{dependency} 회로 열림: 검색 생략",
+            "max_similarity": 0.0
+        }
+    }
+
+
+# 동일 검색 병합 사용 여부 (0이면 요청마다 독립 실행)
+COALESCING_ENABLED = os.getenv("SEARCH_COALESCING", "1") != "0"
+
+# (정규화 쿼리, limit, domain_hint, hydrate, 임베딩 해시) → {'future': 첫 요청의 결과 future,
+#   'waiters': 대기 중인 중복 요청 수, 'deadline': 첫 요청의 마감 시각(monotonic)}
+_inflight_searches = {}
+
+metrics_service.set_buckets("search_coalesced_waiters", metrics_service.COUNT_BUCKETS)
+
+
+def _embedding_key(query_embedding: Optional[List[float]]) -> Optional[str]:
+    """클라이언트 임베딩의 병합 키 (다른 벡터로 계산된 결과를 공유하지 않도록)"""
+    if not query_embedding:
+        return None
+    return hashlib.md5(array.array("f", query_embedding).tobytes()).hexdigest()
+
+
+@tracing_service.traced("search_with_langgraph")
 async def search_with_langgraph(
     query: str, 
     limit: int = 5,
-    domain_hint: Optional[str] = None
+    domain_hint: Optional[str] = None,
+    deadline_ms: Optional[int] = None,
+    query_embedding: Optional[List[float]] = None,
+    hydrate: bool = True
 ) -> dict:
     """
-    LangGraph 워크플로우를 사용한 지능적 경로 검색
+    LangGraph 워크플로우를 사용한 지능적 경로 검색 (동일 요청 병합)
+    
+    같은 (정규화 쿼리, limit, domain_hint, hydrate, 클라이언트 임베딩) 검색이 이미 진행 중이면 새로 실행하지 않고
+    첫 요청의 결과를 기다려 공유합니다 (performance.coalesced = True).
+    대기는 각 요청의 deadline_ms 안에서만 하며, 첫 요청이 취소되거나 첫 요청의 짧은 마감 때문에
+    중단된 결과(cut_short)이고 자신의 마감이 더 늦으면 남은 예산으로 직접 실행합니다.
     
     Args:
         query: 사용자 자연어 쿼리
         limit: 최대 반환 경로 수
         domain_hint: 특정 도메인으로 제한 (선택사항)
+        deadline_ms: 요청 지연시간 예산 (ms, 기본 SEARCH_DEADLINE_MS)
+        query_embedding: 클라이언트가 계산한 쿼리 임베딩 (있으면 임베딩 생성 생략)
+        hydrate: False면 steps가 없는 경로 헤더가 섞일 수 있음 (스트리밍 응답용, hydrate_paths로 재구성)
+    
+    Returns:
+        dict: _search_once와 같은 형식의 검색 결과
+    """
+    if not COALESCING_ENABLED:
+        return await _search_once(query, limit, domain_hint, deadline_ms, query_embedding, hydrate)
+
+    # 응답 형태가 다르므로 hydrate 여부가 다른 요청, 다른 클라이언트 임베딩을 보낸 요청은 병합하지 않음
+    key = (neo4j_service.normalize_intent_text(query), limit, domain_hint, hydrate, _embedding_key(query_embedding))
+    inflight = _inflight_searches.get(key)
+    budget_ms = deadline_ms or DEFAULT_SEARCH_DEADLINE_MS
+
+    if inflight is not None:
+        inflight["waiters"] += 1
+        metrics_service.increment("search_coalesced_total")
+        start_time = time.time()
+        deadline = time.monotonic() + budget_ms / 1000
+        try:
+            result = await asyncio.wait_for(asyncio.shield(inflight["future"]), timeout=budget_ms / 1000)
+        except asyncio.TimeoutError:
+            logger.warning("병합된 검색 대기 중 마감 시간 초과", query=query)
+            return {
+                "query": query,
+                "total_matched": 0,
+                "matched_paths": [],
+                "performance": {
+                    "search_time": int((time.time() - start_time) * 1000),
+                    "reasoning": "동일 검색 대기 중 마감 시간 초과",
+                    "strategy": "coalesced",
+                    "max_similarity": 0.0,
+                    "deadline_ms": budget_ms,
+                    "cut_short": ["coalesced_search"],
+                    "stages": {},
+                    "coalesced": True
+                }
+            }
+        except asyncio.CancelledError:
+            if inflight["future"].cancelled():
+                # 첫 요청만 취소된 경우 다시 시도 (먼저 깨어난 대기자가 새 첫 요청이 됨)
+                return await search_with_langgraph(query, limit, domain_hint, deadline_ms, query_embedding, hydrate)
+            raise
+
+        # 첫 요청의 짧은 마감 때문에 중단된 결과는 더 긴 예산의 대기자에게 완전한 결과로 넘기지 않음
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if result["performance"].get("cut_short") and deadline > inflight["deadline"] and remaining_ms > 0:
+            metrics_service.increment("search_coalesced_retries_total")
+            return await search_with_langgraph(query, limit, domain_hint, remaining_ms, query_embedding, hydrate)
+
+        # 응답 직렬화/스트리밍 단계에서 결과가 수정되므로 요청별로 복사 (경로 dict 포함)
+        performance = {
+            **result["performance"],
+            "stages": dict(result["performance"].get("stages") or {}),
+            "search_time": int((time.time() - start_time) * 1000),
+            "coalesced": True
+        }
+        return {**result, "query": query, "matched_paths": copy.deepcopy(result["matched_paths"]), "performance": performance}
+
+    inflight = {
+        "future": asyncio.get_running_loop().create_future(),
+        "waiters": 0,
+        "deadline": time.monotonic() + budget_ms / 1000
+    }
+    _inflight_searches[key] = inflight
+    try:
+        result = await _search_once(query, limit, domain_hint, deadline_ms, query_embedding, hydrate)
+        result["performance"]["coalesced"] = False
+        # 첫 요청은 반환한 결과를 계속 수정하므로 대기자에게는 스냅샷을 공유
+        inflight["future"].set_result(copy.deepcopy(result) if inflight["waiters"] else result)
+        return result
+    except asyncio.CancelledError:
+        inflight["future"].cancel()
+        raise
+    except Exception as e:
+        inflight["future"].set_exception(e)
+        if not inflight["waiters"]:
+            inflight["future"].exception()  # 대기자가 없으면 조회 처리 (미조회 예외 경고 방지)
+        raise
+    finally:
+        _inflight_searches.pop(key, None)
+        if inflight["waiters"]:
+            metrics_service.observe("search_coalesced_waiters", inflight["waiters"])
+            logger.info("동일 검색 병합", query=query, waiters=inflight["waiters"])
+
+
+async def _search_once(
+    query: str, 
+    limit: int = 5,
+    domain_hint: Optional[str] = None,
+    deadline_ms: Optional[int] = None,
+    query_embedding: Optional[List[float]] = None,
+    hydrate: bool = True
+) -> dict:
+    """
+    LangGraph 워크플로우를 사용한 지능적 경로 검색 (단일 실행)
+    
+    Args:
+        query: 사용자 자연어 쿼리
+        limit: 최대 반환 경로 수
+        domain_hint: 특정 도메인으로 제한 (선택사항)
+        deadline_ms: 요청 지연시간 예산 (ms, 기본 SEARCH_DEADLINE_MS).
+            마감이 지나면 각 단계를 중단하고 그때까지 순위화된 경로를 반환
+        query_embedding: 클라이언트가 계산한 쿼리 임베딩 (있으면 OpenAI 임베딩 호출 생략)
+        hydrate: False면 벡터 검색 경로의 재구성 생략 (matched_paths에 steps 없는 헤더 포함)
     
     Returns:
         dict: 기존 응답 형식과 호환되는 검색 결과
+            (performance.cut_short: 마감 초과로 중단된 단계 목록,
+             performance.stages: 단계별 지연시간 ms)
     """
     start_time = time.time()
+    budget_ms = deadline_ms or DEFAULT_SEARCH_DEADLINE_MS
+    deadline = time.monotonic() + budget_ms / 1000
+    # OpenAI 호출의 속도 제한 대기/재시도도 같은 마감 시각 안에서만 수행
+    deadline_token = rate_limit_service.set_deadline(deadline)
+    result_key = (neo4j_service.normalize_intent_text(query), limit, domain_hint)
     
     try:
-        # 캐시된 워크플로우 사용 (빌드 시간 절약)
-        workflow = get_or_build_workflow()
-        
-        initial_state = {
-            "user_query": query,
-            "domain_hint": domain_hint,
-            "limit": limit,
-            "query_embedding": [],  # 빈 리스트로 초기화
-            "intent_analysis": {},  # 빈 딕셔너리로 초기화
-            "similarity_threshold": 0.0,
-            "max_similarity": 0.0,
-            "selected_paths": [],
-            "processing_strategy": "",
-            "reasoning": "",
-            "cached_search_results": None  # 캐시 초기화
-        }
+        # Neo4j 회로가 열려 있으면 경로 재구성도 불가하므로 바로 응답
+        if neo4j_service.neo4j_breaker.is_open():
+            return _circuit_open_response(query, result_key, "neo4j", start_time, budget_ms)
+
+        # taskIntent 정확 일치: 임베딩/LLM/벡터 검색 없이 즉시 반환
+        if neo4j_service.lookup_exact_intent(query, domain_hint):
+            exact_result = await asyncio.wait_for(
+                tracing_service.run_in_executor(
+                    lambda: neo4j_service.search_paths_by_exact_intent(query, limit, domain_hint),
+                    name="search_paths_by_exact_intent"
+                ),
+                timeout=max(0.0, deadline - time.monotonic())
+            )
+            if exact_result:
+                processing_time = int((time.time() - start_time) * 1000)
+                stage_timings = {}
+                _record_search_stages(stage_timings, exact_result)
+                metrics_service.observe("search_duration_ms", processing_time, strategy="exact_intent_match")
+                exact_result["performance"].update({
+                    "search_time": processing_time,
+                    "reasoning": "taskIntent 정확 일치로 워크플로우 생략",
+                    "strategy": "exact_intent_match",
+                    "max_similarity": 1.0,
+                    "deadline_ms": budget_ms,
+                    "cut_short": [],
+                    "stages": stage_timings,
+                    "embedding_cache": None
+                })
+                logger.info("정확 일치 검색 완료", total_matched=exact_result['total_matched'], search_time=processing_time)
+                _remember_result(result_key, exact_result)
+                return exact_result
+
+        # 임베딩 회로가 열려 있으면 벡터 검색 불가 (정확 일치 외에는 최근 결과로 응답)
+        if not query_embedding and circuit_breaker.is_open("openai_embedding"):
+            return _circuit_open_response(query, result_key, "openai_embedding", start_time, budget_ms)
+
+        initial_state = build_initial_state(query, limit, domain_hint, deadline, query_embedding, hydrate)
+        if admission_service.is_saturated("llm"):
+            # LLM 대기열이 이미 가득 찬 경우 처음부터 LLM/재탐색 생략
+            initial_state["degraded"] = "llm"
         
-        result = await workflow.ainvoke(initial_state)
+        if FAST_PATH_ENABLED:
+            # 직접 파이프라인 (재탐색이 필요할 때만 워크플로우 사용)
+            result = await search_fast_path(initial_state)
+        else:
+            # 캐시된 워크플로우 사용 (빌드 시간 절약)
+            result = await get_or_build_workflow().ainvoke(initial_state)
         
         processing_time = int((time.time() - start_time) * 1000)
+        metrics_service.observe("search_duration_ms", processing_time, strategy=result["processing_strategy"])
         
         # 기존 응답 형식으로 변환
         response = {
@@ -770,23 +1334,264 @@ async def search_with_langgraph(
                 "search_time": processing_time,
                 "reasoning": result["reasoning"],
                 "strategy": result["processing_strategy"],
-                "max_similarity": result["max_similarity"]
+                "max_similarity": result["max_similarity"],
+                "engine": "direct" if FAST_PATH_ENABLED and result["processing_strategy"] != "rediscover_with_different_agent" else "langgraph",
+                "deadline_ms": budget_ms,
+                "cut_short": result.get("cut_short_stages", []),
+                "agents": result.get("agent_stats", {}),
+                "stages": result.get("stage_timings", {}),
+                "embedding_cache": result.get("embedding_cache")
             }
         }
         
-        print(f"✓ LangGraph 검색 완료: {len(result['selected_paths'])}개 경로 ({processing_time}ms)")
+        logger.info("LangGraph 검색 완료", total_matched=len(result['selected_paths']), search_time=processing_time, strategy=result["processing_strategy"])
+        _remember_result(result_key, response)
         return response
         
     except Exception as e:
-        print(f"✗ LangGraph 실패: {str(e)[:100]}...")
+        # 실패 원인이 회로 열림이면 같은 의존성을 쓰는 폴백 검색을 다시 시도하지 않음
+        # (다른 예외는 무관한 회로가 열려 있어도 폴백 검색으로 처리)
+        if isinstance(e, circuit_breaker.CircuitOpenError):
+            return _circuit_open_response(query, result_key, e.dependency, start_time, budget_ms)
+
+        logger.exception("LangGraph 실패", error=str(e))
         
-        # 기존 검색 방식으로 폴백
-        fallback_result = neo4j_service.search_paths_by_query(query, limit, domain_hint)
+        # 남은 시간 안에서만 기존 검색 방식으로 폴백 (이벤트 루프를 막지 않도록 스레드에서)
+        time_left = deadline - time.monotonic()
+        fallback_result = None
+        if time_left > 0:
+            try:
+                fallback_result = await asyncio.wait_for(
+                    tracing_service.run_in_executor(
+                        lambda: neo4j_service.search_paths_by_query(query, limit, domain_hint, query_embedding),
+                        name="search_paths_by_query"
+                    ),
+                    timeout=time_left
+                )
+            except asyncio.TimeoutError:
+                logger.warning("마감 시간 초과: 폴백 검색 중단")
+            except circuit_breaker.CircuitOpenError as circuit_error:
+                # 폴백 검색이 쓰는 의존성의 회로가 열림: 즉시 회로 열림 응답
+                return _circuit_open_response(query, result_key, circuit_error.dependency, start_time, budget_ms)
+
         if fallback_result:
+            stage_timings = {}
+            _record_search_stages(stage_timings, fallback_result)
+            metrics_service.observe("search_duration_ms", fallback_result["performance"]["search_time"], strategy="fallback_traditional_search")
+            fallback_result["performance"]["stages"] = stage_timings
             fallback_result["performance"]["reasoning"] = f"LangGraph 실패로 폴백"
             fallback_result["performance"]["strategy"] = "fallback_traditional_search"
-        
-        return fallback_result
+            fallback_result["performance"]["deadline_ms"] = budget_ms
+            fallback_result["performance"]["cut_short"] = []
+            return fallback_result
+
+        return {
+            "query": query,
+            "total_matched": 0,
+            "matched_paths": [],
+            "performance": {
+                "search_time": int((time.time() - start_time) * 1000),
+                "reasoning": f"LangGraph 실패 후 마감 시간 내 폴백 불가: {str(e)[:100]}",
+                "strategy": "fallback_traditional_search",
+                "max_similarity": 0.0,
+                "deadline_ms": budget_ms,
+                "cut_short": ["fallback_search"],
+                "stages": {}
+            }
+        }
+    finally:
+        rate_limit_service.reset_deadline(deadline_token)
+
+
+# ============================================================================
+# 배치 검색 (search_batch 메시지)
+# ============================================================================
+
+# 배치에서 유사도가 낮아 개별 검색(재탐색)으로 넘긴 항목의 동시 실행 수
+SEARCH_BATCH_MAX_CONCURRENCY = int(os.getenv("SEARCH_BATCH_MAX_CONCURRENCY", "4"))
+
+metrics_service.set_buckets("search_batch_size", metrics_service.COUNT_BUCKETS)
+
+
+@tracing_service.traced("search_batch")
+async def search_batch(
+    requests: List[dict],
+    on_result: Optional[Callable[[int, dict], Awaitable[None]]] = None
+) -> List[dict]:
+    """
+    여러 검색을 한 번의 임베딩 호출 + 한 번의 벡터 검색 + 한 번의 경로 재구성으로 처리
+
+    유사도가 임계값 이상인 항목(정확 일치 포함)은 배치 결과를 그대로 사용하고
+    (rank_existing_paths와 같은 판단), 나머지는 계산된 임베딩을 넘겨 search_with_langgraph로
+    개별 처리합니다 (의도 분석/재탐색 Agent).
+
+    Args:
+        requests: [{'query', 'limit', 'domain_hint', 'deadline_ms', 'query_embedding'}] (SearchPathRequest 필드)
+        on_result: 항목 결과가 준비되는 대로 호출할 콜백 (index, result) - 스트리밍용
+
+    Returns:
+        List[dict]: 입력 순서대로 search_with_langgraph와 같은 형식의 결과 (performance.batched로 구분)
+    """
+    start_time = time.time()
+    budgets_ms = [request.get("deadline_ms") or DEFAULT_SEARCH_DEADLINE_MS for request in requests]
+    # 공유 단계(임베딩/벡터 검색/경로 재구성)는 가장 짧은 예산 안에서 끝내야 모든 항목이 각자의 마감을 지킴
+    # (개별 검색으로 넘긴 항목은 자신의 남은 예산으로 다시 실행)
+    deadline = time.monotonic() + min(budgets_ms) / 1000
+    deadline_token = rate_limit_service.set_deadline(deadline)
+    results: List[Optional[dict]] = [None] * len(requests)
+    batch_stages = {}
+    metrics_service.observe("search_batch_size", len(requests))
+
+    async def deliver(index: int, result: dict):
+        results[index] = result
+        if on_result is not None:
+            await on_result(index, result)
+
+    try:
+        texts = [request["query"] for request in requests]
+        embeddings = [request.get("query_embedding") for request in requests]
+        batch_results = [None] * len(requests)
+
+        if not neo4j_service.neo4j_breaker.is_open():
+            # 1. 클라이언트 임베딩/정확 일치가 없는 쿼리만 한 번에 임베딩
+            to_embed = [
+                i for i, request in enumerate(requests)
+                if not embeddings[i] and not neo4j_service.lookup_exact_intent(texts[i], request.get("domain_hint"))
+            ]
+            if to_embed:
+                embedding_start = time.perf_counter()
+                try:
+                    generated = await admission_service.run_in_executor(
+                        "embedding", generate_embeddings, [texts[i] for i in to_embed],
+                        timeout=max(0.0, deadline - time.monotonic()), name="embedding"
+                    )
+                    for i, embedding in zip(to_embed, generated):
+                        embeddings[i] = embedding
+                except admission_service.AdmissionRejected:
+                    logger.warning("배치 임베딩 어드미션 거절 (항목별 검색으로 처리)", size=len(to_embed))
+                except circuit_breaker.CircuitOpenError:
+                    # 임베딩 없는 항목은 개별 검색에서 회로 열림 응답 (정확 일치/클라이언트 임베딩 항목은 배치로 처리)
+                    logger.warning("배치 임베딩 회로 열림 (항목별 검색으로 처리)", size=len(to_embed))
+                _record_stage(batch_stages, "embedding", (time.perf_counter() - embedding_start) * 1000, cache="batch")
+
+            # 2. 벡터 검색 + 경로 재구성 (배치 전체 단일 쿼리)
+            try:
+                batch_results = await asyncio.wait_for(
+                    tracing_service.run_in_executor(
+                        lambda: neo4j_service.search_paths_batch(
+                            texts,
+                            embeddings,
+                            [request.get("limit", 3) for request in requests],
+                            [request.get("domain_hint") for request in requests]
+                        ),
+                        name="search_paths_batch"
+                    ),
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+                # 벡터 쿼리/경로 재구성 시간은 배치 전체에 한 번씩 기록 (모든 항목이 같은 값)
+                _record_search_stages(batch_stages, next((result for result in batch_results if result), None))
+            except Exception as e:
+                logger.warning("배치 벡터 검색 실패 (항목별 검색으로 처리)", error=str(e))
+                batch_results = [None] * len(requests)
+
+        # 3. 충분히 유사한 항목은 바로 응답, 나머지는 개별 검색
+        individual = []
+        for i, batch_result in enumerate(batch_results):
+            performance = (batch_result or {}).get("performance") or {}
+            if batch_result and (performance.get("exact_match") or performance.get("max_similarity", 0.0) >= SIMILARITY_THRESHOLD):
+                strategy = "exact_intent_match" if performance.get("exact_match") else "rank_existing_paths"
+                processing_time = int((time.time() - start_time) * 1000)
+                metrics_service.observe("search_duration_ms", processing_time, strategy=strategy)
+                response = {
+                    "query": texts[i],
+                    "total_matched": batch_result["total_matched"],
+                    "matched_paths": batch_result["matched_paths"],
+                    "performance": {
+                        "search_time": processing_time,
+                        "reasoning": f"배치 벡터 검색 결과 사용 (유사도 {performance['max_similarity']:.3f})",
+                        "strategy": strategy,
+                        "max_similarity": performance["max_similarity"],
+                        "engine": "batch",
+                        "deadline_ms": budgets_ms[i],
+                        "cut_short": [],
+                        "stages": dict(batch_stages),
+                        "embedding_cache": "client" if requests[i].get("query_embedding") else "batch",
+                        "batched": True
+                    }
+                }
+                _remember_result((neo4j_service.normalize_intent_text(texts[i]), requests[i].get("limit", 3), requests[i].get("domain_hint")), response)
+                metrics_service.increment("search_batch_items_total", route="batched")
+                await deliver(i, response)
+            else:
+                individual.append(i)
+
+        # 유사도가 낮은 항목: 이미 계산한 임베딩으로 개별 검색 (각자의 남은 예산 안에서)
+        semaphore = asyncio.Semaphore(SEARCH_BATCH_MAX_CONCURRENCY)
+
+        async def search_individually(i: int):
+            request = requests[i]
+            async with semaphore:
+                remaining_ms = max(1, budgets_ms[i] - int((time.time() - start_time) * 1000))
+                result = await search_with_langgraph(
+                    texts[i],
+                    request.get("limit", 3),
+                    request.get("domain_hint"),
+                    remaining_ms,
+                    embeddings[i]
+                )
+            result["performance"]["batched"] = False
+            metrics_service.increment("search_batch_items_total", route="individual")
+            await deliver(i, result)
+
+        if individual:
+            await asyncio.gather(*(search_individually(i) for i in individual))
+
+        logger.info("배치 검색 완료", size=len(requests), individual=len(individual),
+                    search_time=int((time.time() - start_time) * 1000))
+        return results
+    finally:
+        rate_limit_service.reset_deadline(deadline_token)
+
+
+async def hydrate_paths(
+    paths: List[dict],
+    on_steps: Callable[[int, List[dict]], Awaitable[None]]
+) -> float:
+    """
+    경로 헤더의 steps를 재구성하며 준비되는 대로 on_steps(index, steps) 호출 (스트리밍 응답용)
+
+    첫 번째 경로는 단독 쿼리로, 나머지는 한 번의 쿼리로 동시에 재구성하여 최상위 경로가 가장 먼저 도착합니다.
+    이미 steps가 있는 경로(정확 일치, 재탐색 Agent 결과)는 바로 전달합니다.
+    재구성되지 않은 경로는 빈 steps로 전달합니다.
+
+    Returns:
+        float: 전체 재구성 시간 (ms, performance.stages.path_reconstruction)
+    """
+    start = time.perf_counter()
+    pending = []
+    for index, path in enumerate(paths):
+        if "steps" in path:
+            await on_steps(index, path["steps"])
+        else:
+            pending.append(index)
+    if not pending:
+        return 0.0
+
+    async def reconstruct(indices: List[int]):
+        start = time.perf_counter()
+        steps_by_id = await tracing_service.run_in_executor(
+            lambda: neo4j_service.reconstruct_paths([paths[i]["stepId"] for i in indices]),
+            name="reconstruct_paths"
+        )
+        metrics_service.observe("search_stage_duration_ms", (time.perf_counter() - start) * 1000, stage="path_reconstruction")
+        return indices, steps_by_id
+
+    groups = [pending[:1], pending[1:]] if len(pending) > 1 else [pending]
+    for next_done in asyncio.as_completed([reconstruct(group) for group in groups]):
+        indices, steps_by_id = await next_done
+        for i in indices:
+            await on_steps(i, steps_by_id.get(paths[i]["stepId"], []))
+    return round((time.perf_counter() - start) * 1000, 1)
 
 
 def format_langgraph_response(langgraph_result: dict) -> dict:
@@ -0,0 +1,187 @@
+"""
+로깅 서비스 - 큐 기반 비동기 구조화 로거
+
+요청 경로에서는 레벨 확인과 필드 축약만 하고, 포맷팅/stdout 쓰기는 QueueListener 스레드에서 처리합니다.
+
+- LOG_LEVEL: 최소 레벨 (기본 INFO)
+- LOG_FORMAT: "json" (한 줄 JSON) | "text" (기본, 사람이 읽기 쉬운 형식)
+- LOG_SAMPLE_RATE: WebSocket 메시지 단위 샘플링 비율 (기본 1.0). 샘플링되지 않은 메시지는
+  WARNING 미만 로그를 남기지 않음 (경고/오류는 항상 기록)
+- LOG_MAX_FIELD_LENGTH: 필드 값 최대 길이 (기본 200자, 큰 dict/list는 reprlib로 축약)
+
+사용법:
+    logger = logging_service.get_logger(__name__)
+    logger.info("경로 검색 완료", query=query, total_matched=3)
+"""
+
+import os
+import sys
+import json
+import queue
+import random
+import atexit
+import logging
+import reprlib
+import contextvars
+import logging.handlers
+from datetime import datetime
+from typing import Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+LOG_MAX_FIELD_LENGTH = int(os.getenv("LOG_MAX_FIELD_LENGTH", "200"))
+
+# 현재 메시지의 샘플링 여부 (메시지 밖의 로그는 항상 기록)
+_sampled = contextvars.ContextVar("log_sampled", default=True)
+
+_repr = reprlib.Repr()
+_repr.maxlevel = 2
+_repr.maxdict = 6
+_repr.maxlist = 6
+_repr.maxstring = LOG_MAX_FIELD_LENGTH
+_repr.maxother = LOG_MAX_FIELD_LENGTH
+
+_listener = None
+
+
+def _truncate(value):
+    """필드 값 축약 (호출 스레드에서 실행되므로 큰 객체도 일정 비용으로 제한)"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        if len(value) > LOG_MAX_FIELD_LENGTH:
+            return value[:LOG_MAX_FIELD_LENGTH] + f"...(+{len(value) - LOG_MAX_FIELD_LENGTH})"
+        return value
+    return _repr.repr(value)
+
+
+class _SamplingFilter(logging.Filter):
+    """샘플링되지 않은 메시지의 WARNING 미만 로그 제외"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or _sampled.get()
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """메시지 포맷팅을 리스너 스레드로 미루는 QueueHandler (trace_id만 호출 시점에 기록)"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if not hasattr(record, "trace_id"):
+            from app.services.tracing_service import current_trace_id
+            record.trace_id = current_trace_id()
+        if record.exc_info:
+            # 예외 객체는 스레드 간 전달 전에 문자열로 변환
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        if getattr(record, "trace_id", None):
+            entry["trace_id"] = record.trace_id
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"{datetime.fromtimestamp(record.created).strftime('%H:%M:%S.%f')[:-3]} {record.levelname:<7} {record.getMessage()}"
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        if getattr(record, "trace_id", None):
+            line += f" trace_id={record.trace_id}"
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class StructuredLogger:
+    """이벤트 메시지 + 키워드 필드 형태의 로거 (레벨이 꺼져 있으면 필드 축약도 생략)"""
+
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+
+    def is_enabled(self, level: int) -> bool:
+        return self._logger.isEnabledFor(level) and (level >= logging.WARNING or _sampled.get())
+
+    def _log(self, level: int, event: str, exc_info=None, **fields):
+        if not self.is_enabled(level):
+            return
+        self._logger.log(
+            level, event,
+            exc_info=exc_info,
+            extra={"fields": {k: _truncate(v) for k, v in fields.items()}}
+        )
+
+    def debug(self, event: str, **fields):
+        self._log(logging.DEBUG, event, **fields)
+
+    def info(self, event: str, **fields):
+        self._log(logging.INFO, event, **fields)
+
+    def warning(self, event: str, **fields):
+        self._log(logging.WARNING, event, **fields)
+
+    def error(self, event: str, exc_info: bool = False, **fields):
+        self._log(logging.ERROR, event, exc_info=exc_info, **fields)
+
+    def exception(self, event: str, **fields):
+        """except 블록 안에서 스택 트레이스와 함께 ERROR 기록"""
+        self._log(logging.ERROR, event, exc_info=True, **fields)
+
+
+def configure(level: Optional[str] = None, fmt: Optional[str] = None):
+    """'app' 로거에 큐 핸들러 연결 후 리스너 스레드 시작 (여러 번 호출해도 한 번만 설정)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(_JsonFormatter() if (fmt or LOG_FORMAT) == "json" else _TextFormatter())
+
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(_SamplingFilter())
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(level or LOG_LEVEL)
+    app_logger.addHandler(queue_handler)
+    app_logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown)
+
+
+def shutdown():
+    """리스너 스레드 종료 (남은 로그를 모두 출력)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """모듈 로거 (이름은 __name__, 'app.' 하위여야 큐 핸들러가 적용됨)"""
+    configure()
+    return StructuredLogger(logging.getLogger(name))
+
+
+def begin_message_sampling() -> contextvars.Token:
+    """WebSocket 메시지 처리 시작 시 샘플링 여부 결정 (반환된 토큰은 end_message_sampling에 전달)"""
+    return _sampled.set(LOG_SAMPLE_RATE >= 1.0 or random.random() < LOG_SAMPLE_RATE)
+
+
+def end_message_sampling(token: contextvars.Token):
+    _sampled.reset(token)
@@ -0,0 +1,188 @@
+"""
+메트릭 서비스 - 프로세스 내 카운터/히스토그램/게이지 집계
+
+워크플로우/서비스 전반에서 발생하는 이벤트 수와 지연시간 분포를 라벨별로 누적하고,
+GET /metrics 에서 Prometheus 텍스트 형식(render_prometheus)으로 노출합니다.
+"""
+
+import bisect
+import threading
+from typing import Callable, Dict, Tuple
+
+from app.services import logging_service
+
+logger = logging_service.get_logger(__name__)
+
+# 지연시간 히스토그램 기본 버킷 상한 (ms)
+DEFAULT_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# 개수(배치 크기, 대기자 수 등) 히스토그램 버킷 상한 (set_buckets로 지정)
+COUNT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 100)
+
+# 메트릭 이름 → 지연시간이 아닌 히스토그램의 버킷 상한 (set_buckets로 등록, 없으면 DEFAULT_BUCKETS_MS)
+_buckets: Dict[str, tuple] = {}
+
+# (메트릭 이름, 정렬된 라벨 튜플) → 누적 값
+_counters: Dict[Tuple[str, tuple], float] = {}
+# (메트릭 이름, 정렬된 라벨 튜플) → {'buckets': 버킷별 개수(마지막은 +Inf), 'sum', 'count'}
+_histograms: Dict[Tuple[str, tuple], dict] = {}
+# (메트릭 이름, 정렬된 라벨 튜플) → 현재 값
+_gauges: Dict[Tuple[str, tuple], float] = {}
+# 메트릭 이름 → 수집 시점에 값을 계산하는 함수 (큐 길이 등)
+_gauge_callbacks: Dict[str, Callable[[], float]] = {}
+_lock = threading.Lock()
+
+
+def _key(name: str, labels: dict) -> Tuple[str, tuple]:
+    return name, tuple(sorted(labels.items()))
+
+
+def increment(name: str, value: float = 1, **labels):
+    """카운터 증가 (스레드 안전)"""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def get_counter(name: str, **labels) -> float:
+    """특정 라벨 조합의 카운터 값 조회"""
+    return _counters.get(_key(name, labels), 0)
+
+
+def set_buckets(name: str, buckets: tuple):
+    """히스토그램 버킷 상한 지정 (크기 등 지연시간이 아닌 값, 첫 observe 전에 호출)"""
+    with _lock:
+        _buckets[name] = tuple(sorted(buckets))
+
+
+def _bucket_bounds(name: str) -> tuple:
+    return _buckets.get(name, DEFAULT_BUCKETS_MS)
+
+
+def observe(name: str, value: float, **labels):
+    """히스토그램에 관측값 기록 (스레드 안전, 버킷 상한은 set_buckets 또는 DEFAULT_BUCKETS_MS)"""
+    key = _key(name, labels)
+    bounds = _bucket_bounds(name)
+    bucket = bisect.bisect_left(bounds, value)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {"buckets": [0] * (len(bounds) + 1), "sum": 0.0, "count": 0}
+        histogram["buckets"][bucket] += 1
+        histogram["sum"] += value
+        histogram["count"] += 1
+
+
+def get_histogram(name: str, **labels) -> dict:
+    """특정 라벨 조합의 히스토그램 조회 ({'buckets', 'sum', 'count'}, 없으면 빈 히스토그램)"""
+    with _lock:
+        histogram = _histograms.get(_key(name, labels))
+        if histogram is None:
+            return {"buckets": [0] * (len(_bucket_bounds(name)) + 1), "sum": 0.0, "count": 0}
+        return {"buckets": list(histogram["buckets"]), "sum": histogram["sum"], "count": histogram["count"]}
+
+
+def set_gauge(name: str, value: float, **labels):
+    """게이지 값 설정"""
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def add_gauge(name: str, delta: float, **labels):
+    """게이지 값 증감 (활성 연결 수 등)"""
+    key = _key(name, labels)
+    with _lock:
+        _gauges[key] = _gauges.get(key, 0) + delta
+
+
+def register_gauge_callback(name: str, callback: Callable[[], float]):
+    """수집 시점에 callback()으로 값을 읽는 게이지 등록 (같은 이름은 교체)"""
+    with _lock:
+        _gauge_callbacks[name] = callback
+
+
+def _collect_gauges() -> list:
+    with _lock:
+        items = list(_gauges.items())
+        callbacks = list(_gauge_callbacks.items())
+
+    for name, callback in callbacks:
+        try:
+            items.append(((name, ()), float(callback())))
+        except Exception as e:
+            logger.warning("게이지 수집 실패", gauge=name, error=str(e))
+    return items
+
+
+def snapshot() -> dict:
+    """전체 카운터/히스토그램을 {이름: [{labels, value | histogram}, ...]} 형태로 반환"""
+    with _lock:
+        items = list(_counters.items())
+        histogram_items = [(key, dict(h, buckets=list(h["buckets"]))) for key, h in _histograms.items()]
+
+    result = {}
+    for (name, labels), value in items:
+        result.setdefault(name, []).append({"labels": dict(labels), "value": value})
+    for (name, labels), histogram in histogram_items:
+        result.setdefault(name, []).append({"labels": dict(labels), "histogram": histogram})
+    for (name, labels), value in _collect_gauges():
+        result.setdefault(name, []).append({"labels": dict(labels), "value": value})
+    return result
+
+
+# ============================================================================
+# Prometheus 텍스트 형식
+# ============================================================================
+
+def _escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels, extra: tuple = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def render_prometheus() -> str:
+    """전체 메트릭을 Prometheus 텍스트 노출 형식(0.0.4)으로 변환"""
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, dict(h, buckets=list(h["buckets"]))) for key, h in _histograms.items())
+    gauges = sorted(_collect_gauges())
+
+    lines = []
+
+    last_name = None
+    for (name, labels), value in counters:
+        if name != last_name:
+            lines.append(f"# TYPE {name} counter")
+            last_name = name
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    last_name = None
+    for (name, labels), value in gauges:
+        if name != last_name:
+            lines.append(f"# TYPE {name} gauge")
+            last_name = name
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    last_name = None
+    for (name, labels), histogram in histograms:
+        if name != last_name:
+            lines.append(f"# TYPE {name} histogram")
+            last_name = name
+        cumulative = 0
+        for bound, count in zip(_bucket_bounds(name), histogram["buckets"]):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(labels, (('le', _format_value(bound)),))} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(labels, (('le', '+Inf'),))} {histogram['count']}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram['sum'])}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram['count']}")
+
+    return "\n".join(lines) + "\n"
@@ -9,30 +9,78 @@ Neo4j 서비스 - 리팩토링된 버전
 """
 
 import os
+import re
+import sys
 import json
 import hashlib
+import threading
 import time
+import unicodedata
 
+import numpy as np
 from datetime import datetime
 from urllib.parse import urlparse
 from typing import List, Optional
 from dotenv import load_dotenv, find_dotenv
 from langchain_neo4j import Neo4jGraph
+from neo4j import exceptions as neo4j_exceptions
+from app.services import metrics_service, tracing_service, logging_service, circuit_breaker, rate_limit_service
 from app.services.embedding_service import generate_embedding
 from app.models.step import StepData, PathSubmission
 
 load_dotenv(find_dotenv())
 
+logger = logging_service.get_logger(__name__)
+
+
+def _is_neo4j_failure(error: BaseException) -> bool:
+    """연결/가용성 오류만 회로 차단 대상 (Cypher 오류 등 요청 단위 오류 제외)"""
+    return isinstance(error, (neo4j_exceptions.DriverError, neo4j_exceptions.TransientError, OSError))
+
+
+neo4j_breaker = circuit_breaker.get_breaker("neo4j", _is_neo4j_failure)
+
+
+def _instrument_graph(neo4j_graph):
+    """
+    graph.query 호출마다 지연시간/오류를 호출한 함수 이름별로 기록 (+ neo4j.query span)
+
+    neo4j_query_duration_ms{function} 히스토그램, neo4j_query_errors_total{function} 카운터
+    회로가 열려 있으면 쿼리하지 않고 CircuitOpenError (헬스 프로브는 원래 query로 RETURN 1)
+    """
+    original_query = neo4j_graph.query
+
+    def timed_query(*args, **kwargs):
+        function = sys._getframe(1).f_code.co_name
+        neo4j_breaker.check()
+        start = time.perf_counter()
+        try:
+            with tracing_service.span("neo4j.query", function=function):
+                result = original_query(*args, **kwargs)
+        except Exception as e:
+            metrics_service.increment("neo4j_query_errors_total", function=function)
+            neo4j_breaker.record_failure(e)
+            raise
+        finally:
+            metrics_service.observe("neo4j_query_duration_ms", (time.perf_counter() - start) * 1000, function=function)
+        neo4j_breaker.record_success()
+        return result
+
+    neo4j_graph.query = timed_query
+    neo4j_breaker.set_probe(lambda: original_query("RETURN 1"))
+    return neo4j_graph
+
+
 # Neo4j 그래프 객체 초기화
 try:
-    graph = Neo4jGraph(
+    graph = _instrument_graph(Neo4jGraph(
         url=os.getenv("NEO4J_URI"),
         username=os.getenv("NEO4J_USERNAME"),
         password=os.getenv("NEO4J_PASSWORD"),
-    )
-    print("Neo4j Service: Database connection successful.")
+    ))
+    logger.info("Neo4j Service: Database connection successful.")
 except Exception as e:
-    print(f"Neo4j Service: Database connection failed. Error: {e}")
+    logger.error("Neo4j Service: Database connection failed.", error=str(e))
     graph = None
 
 
@@ -53,10 +101,102 @@ def create_step_id(session_id: str, url: str, selectors: List[str], action: str)
     return hashlib.md5(key.encode()).hexdigest()
 
 
+def normalize_intent_text(text: str) -> str:
+    """taskIntent/쿼리 정확 일치 비교용 정규화 (NFKC, 소문자, 구두점 제거, 공백 축약)"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+# ============================================================================
+# taskIntent 정확 일치 인덱스 (메모리 기반)
+# ============================================================================
+
+# 정규화된 taskIntent → [{'domain', 'taskIntent', 'stepId', 'weight'}, ...]
+_intent_index = {}
+_intent_index_lock = threading.Lock()
+
+
+def _register_intent(domain: str, task_intent: str, step_id: str, weight: Optional[int] = None):
+    """인덱스에 (domain, 첫 stepId) 항목 추가/갱신 (lock 보유 상태에서 호출)"""
+    key = normalize_intent_text(task_intent)
+    if not key:
+        return
+
+    entries = _intent_index.setdefault(key, [])
+    for entry in entries:
+        if entry['domain'] == domain and entry['stepId'] == step_id:
+            # 적재 시에는 DB 값으로 덮어쓰고, 저장 시에는 ON MATCH와 같이 +1
+            entry['weight'] = weight if weight is not None else (entry['weight'] or 0) + 1
+            return
+
+    entries.append({
+        'domain': domain,
+        'taskIntent': task_intent,
+        'stepId': step_id,
+        'weight': weight or 1
+    })
+
+
+def load_intent_index():
+    """
+    서버 시작 시 모든 HAS_STEP의 taskIntent를 메모리 인덱스로 적재
+
+    Returns:
+        int: 적재된 고유 taskIntent 수
+    """
+    global _intent_index
+
+    if not graph:
+        raise ConnectionError("Neo4j database is not connected.")
+
+    rows = graph.query("""
+        MATCH (r:ROOT)-[rel:HAS_STEP]->(s:STEP)
+        WHERE rel.taskIntent IS NOT NULL
+        RETURN r.domain AS domain,
+               rel.taskIntent AS taskIntent,
+               rel.weight AS weight,
+               s.stepId AS stepId
+    """)
+
+    with _intent_index_lock:
+        _intent_index = {}
+        for row in rows:
+            _register_intent(row['domain'], row['taskIntent'], row['stepId'], row['weight'])
+        loaded = len(_intent_index)
+
+    logger.info("taskIntent 정확 일치 인덱스 적재", loaded=loaded)
+    return loaded
+
+
+def update_intent_index(domain: str, task_intent: str, step_id: str, weight: Optional[int] = None):
+    """경로 저장 후 인덱스에 반영"""
+    with _intent_index_lock:
+        _register_intent(domain, task_intent, step_id, weight)
+
+
+def lookup_exact_intent(query_text: str, domain_hint: Optional[str] = None) -> List[dict]:
+    """
+    정규화된 쿼리와 정확히 일치하는 taskIntent 항목 조회 (가중치 내림차순)
+
+    Returns:
+        List[dict]: [{'domain', 'taskIntent', 'stepId', 'weight'}, ...] (없으면 빈 리스트)
+    """
+    entries = _intent_index.get(normalize_intent_text(query_text))
+    if not entries:
+        return []
+
+    if domain_hint:
+        entries = [e for e in entries if e['domain'] == domain_hint]
+
+    return sorted(entries, key=lambda e: e['weight'] or 0, reverse=True)
+
+
 # ============================================================================
 # 핵심 함수 - 경로 저장 및 검색
 # ============================================================================
 
+@tracing_service.traced()
 def save_path_to_neo4j(path_submission: PathSubmission):
     """
     새로운 구조로 경로 저장
@@ -101,7 +241,7 @@ def save_path_to_neo4j(path_submission: PathSubmission):
             'embedding': root_embedding
         })
 
-        print(f"✓ ROOT 노드 생성/업데이트: {domain}")
+        logger.debug("ROOT 노드 생성/업데이트", domain=domain)
 
         # 2. 각 STEP 노드 생성 및 관계 연결
         previous_step_id = None
@@ -164,7 +304,7 @@ def save_path_to_neo4j(path_submission: PathSubmission):
                 'successRate': step_data.successRate
             })
 
-            print(f"  Step {order}: {step_data.action} - {step_data.description}")
+            logger.debug("STEP 저장", order=order, action=step_data.action, description=step_data.description)
 
             # 3. 첫 번째 STEP: ROOT-[HAS_STEP]->STEP 관계 생성
             if order == 0:
@@ -191,7 +331,9 @@ def save_path_to_neo4j(path_submission: PathSubmission):
                     'intentEmbedding': intent_embedding
                 })
 
-                print(f"  ✓ HAS_STEP 관계 생성: {domain} -> {step_data.description}")
+                update_intent_index(domain, task_intent, step_id)
+
+                logger.debug("HAS_STEP 관계 생성", domain=domain, description=step_data.description)
 
             # 4. STEP-[NEXT_STEP]->STEP 관계 생성
             if previous_step_id:
@@ -215,7 +357,7 @@ def save_path_to_neo4j(path_submission: PathSubmission):
 
             previous_step_id = step_id
 
-        print(f"\n✅ 경로 저장 완료: {task_intent} ({len(path_submission.steps)} 단계)")
+        logger.info("경로 저장 완료", taskIntent=task_intent, steps=len(path_submission.steps))
 
         return {
             'status': 'success',
@@ -225,29 +367,267 @@ def save_path_to_neo4j(path_submission: PathSubmission):
         }
 
     except Exception as e:
-        print(f"❌ 경로 저장 실패: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("경로 저장 실패", error=str(e))
         return {'status': 'error', 'message': str(e)}
 
 
-def search_paths_by_query(
+def increment_has_step_weights(increments: List[dict]) -> List[dict]:
+    """
+    HAS_STEP 가중치를 UNWIND 한 번으로 일괄 증가 (weight_aggregator 플러시용)
+
+    Args:
+        increments: [{'domain', 'taskIntent', 'count'}, ...]
+
+    Returns:
+        List[dict]: 갱신된 관계의 [{'domain', 'taskIntent', 'stepId', 'weight'(증가 후 값)}, ...]
+    """
+    if not graph:
+        raise ConnectionError("Neo4j database is not connected.")
+
+    return graph.query("""
+        UNWIND $increments AS inc
+        MATCH (r:ROOT {domain: inc.domain})-[rel:HAS_STEP {taskIntent: inc.taskIntent}]->(s:STEP)
+        SET rel.weight = coalesce(rel.weight, 0) + inc.count,
+            rel.lastUpdated = datetime({timezone: 'Asia/Seoul'})
+        RETURN r.domain AS domain, rel.taskIntent AS taskIntent, s.stepId AS stepId, rel.weight AS weight
+    """, {'increments': increments})
+
+
+def _format_step(order: int, step_node: dict) -> dict:
+    """STEP 노드를 클라이언트 응답 형식으로 변환"""
+    return {
+        'order': order,
+        'url': step_node['url'],
+        'action': step_node['action'],
+        'selectors': step_node.get('selectors', []),
+        'description': step_node.get('description', ''),
+        'isInput': step_node.get('isInput', False),
+        'inputType': step_node.get('inputType'),
+        'inputPlaceholder': step_node.get('inputPlaceholder'),
+        'shouldWait': step_node.get('shouldWait', False),
+        'waitMessage': step_node.get('waitMessage'),
+        'textLabels': step_node.get('textLabels', [])
+    }
+
+
+@tracing_service.traced()
+def reconstruct_paths(first_step_ids: List[str]) -> dict:
+    """
+    여러 첫 STEP에서 NEXT_STEP 관계를 따라가며 경로를 한 번의 쿼리로 재구성
+
+    Returns:
+        dict: {첫 stepId: 포맷된 단계 목록} (경로가 없는 stepId는 포함되지 않음)
+    """
+    unique_ids = list(dict.fromkeys(first_step_ids))
+    if not unique_ids:
+        return {}
+
+    path_query = """
+    UNWIND $startStepIds AS startStepId
+    MATCH path = (start:STEP {stepId: startStepId})-[:NEXT_STEP*0..20]->(end:STEP)
+    WHERE NOT (end)-[:NEXT_STEP]->()
+    WITH startStepId, collect(path)[0] AS path
+    RETURN startStepId,
+           [node in nodes(path) | node] as steps
+    """
+
+    rows = graph.query(path_query, {'startStepIds': unique_ids})
+
+    return {
+        row['startStepId']: [_format_step(i, step_node) for i, step_node in enumerate(row['steps'])]
+        for row in rows
+    }
+
+
+def reconstruct_path(first_step_id: str) -> Optional[List[dict]]:
+    """
+    첫 STEP부터 NEXT_STEP 관계를 따라가며 경로 재구성
+
+    Returns:
+        List[dict] | None: 포맷된 단계 목록 (경로가 없으면 None)
+    """
+    return reconstruct_paths([first_step_id]).get(first_step_id)
+
+
+def _cosine_similarity(vec1, vec2) -> float:
+    vec1, vec2 = np.array(vec1), np.array(vec2)
+    if vec1.shape != vec2.shape:
+        return 0.0
+    dot = np.dot(vec1, vec2)
+    norm1, norm2 = np.linalg.norm(vec1), np.linalg.norm(vec2)
+    if norm1 == 0 or norm2 == 0:
+        return 0.0
+    return float(dot / (norm1 * norm2))
+
+
+def _score_intent_rows(query_embedding: List[float], rows: List[dict], limit: int) -> List[dict]:
+    """벡터 검색 결과 행에 코사인 유사도를 계산하고 임계값(0.3) 이상을 유사도 순으로 반환"""
+    intent_results = []
+    for item in rows:
+        intent_embedding = item['intentEmbedding']
+        if intent_embedding:
+            similarity = _cosine_similarity(query_embedding, intent_embedding)
+            if similarity > 0.3:  # 임계값
+                intent_results.append({
+                    'domain': item['domain'],
+                    'taskIntent': item['taskIntent'],
+                    'weight': item['weight'],
+                    'stepId': item['stepId'],
+                    'similarity': similarity
+                })
+
+    # 유사도 순 정렬
+    return sorted(intent_results, key=lambda x: x['similarity'], reverse=True)[:limit]
+
+
+def _build_matched_paths(intent_results: List[dict], steps_by_id: dict) -> List[dict]:
+    """유사도 결과와 재구성된 단계를 응답 형식의 경로 목록으로 결합"""
+    matched_paths = []
+    for result in intent_results:
+        formatted_steps = steps_by_id.get(result['stepId'])
+
+        if formatted_steps is not None:
+            matched_paths.append({
+                'domain': result['domain'],
+                'taskIntent': result['taskIntent'],
+                'relevance_score': round(result['similarity'], 3),
+                'weight': result['weight'],
+                'steps': formatted_steps
+            })
+    return matched_paths
+
+
+def _build_path_headers(intent_results: List[dict]) -> List[dict]:
+    """경로 재구성 전의 순위 결과 (steps 없음, 나중에 stepId로 reconstruct_paths)"""
+    return [
+        {
+            'domain': result['domain'],
+            'taskIntent': result['taskIntent'],
+            'relevance_score': round(result['similarity'], 3),
+            'weight': result['weight'],
+            'stepId': result['stepId']
+        }
+        for result in intent_results
+    ]
+
+
+@tracing_service.traced()
+def search_paths_by_exact_intent(
     query_text: str,
     limit: int = 3,
     domain_hint: Optional[str] = None
+) -> Optional[dict]:
+    """
+    정규화된 쿼리가 저장된 taskIntent와 정확히 일치하면 임베딩 없이 바로 경로 반환
+
+    Returns:
+        dict | None: search_paths_by_query와 같은 형식 (relevance_score=1.0), 불일치 시 None
+    """
+    exact_matches = lookup_exact_intent(query_text, domain_hint)
+    if not exact_matches:
+        return None
+
+    start_time = time.time()
+
+    reconstruct_start = time.perf_counter()
+    exact_results = [{**entry, 'similarity': 1.0} for entry in exact_matches[:limit]]
+    steps_by_id = reconstruct_paths([entry['stepId'] for entry in exact_results])
+    matched_paths = _build_matched_paths(exact_results, steps_by_id)
+    reconstruct_ms = round((time.perf_counter() - reconstruct_start) * 1000, 1)
+
+    if not matched_paths:
+        return None
+
+    search_time_ms = int((time.time() - start_time) * 1000)
+
+    logger.debug("정확 일치 검색", query=query_text, matched=len(matched_paths), search_time=search_time_ms)
+
+    return {
+        'query': query_text,
+        'total_matched': len(matched_paths),
+        'matched_paths': matched_paths,
+        'performance': {
+            'search_time': search_time_ms,
+            'reconstruct_time': reconstruct_ms,
+            'exact_match': True
+        }
+    }
+
+
+@tracing_service.traced()
+def search_paths_by_query(
+    query_text: str,
+    limit: int = 3,
+    domain_hint: Optional[str] = None,
+    query_embedding: Optional[List[float]] = None
 ):
     """
     자연어 쿼리로 경로 검색
 
+    검색 전략:
+    0. taskIntent 정확 일치 인덱스 확인
+    1. 쿼리 임베딩 생성
+    2. search_paths_by_embedding으로 벡터 검색 및 경로 재구성
+
+    Args:
+        query_text: 사용자 자연어 쿼리 (예: "날씨 보여줘")
+        limit: 최대 반환 경로 수
+        domain_hint: 특정 도메인으로 제한 (선택사항)
+        query_embedding: 클라이언트가 계산한 쿼리 임베딩 (있으면 1단계 생략)
+
+    Returns:
+        dict: {'query', 'total_matched', 'matched_paths', 'performance'}
+    """
+    if not graph:
+        raise ConnectionError("Neo4j database is not connected.")
+
+    start_time = time.time()
+
+    try:
+        # 0. taskIntent 정확 일치 시 임베딩/벡터 검색 생략
+        exact_result = search_paths_by_exact_intent(query_text, limit, domain_hint)
+        if exact_result:
+            return exact_result
+
+        # 1. 쿼리 임베딩 생성
+        if not query_embedding:
+            query_embedding = generate_embedding(query_text)
+    except circuit_breaker.CircuitOpenError:
+        # 회로 열림은 "결과 없음"과 구분되어야 하므로 호출부로 전달
+        raise
+    except Exception as e:
+        logger.exception("경로 검색 실패", query=query_text, error=str(e))
+        return None
+
+    result = search_paths_by_embedding(query_text, query_embedding, limit, domain_hint)
+    if result:
+        # 임베딩 생성 시간까지 포함한 전체 검색 시간
+        result['performance']['search_time'] = int((time.time() - start_time) * 1000)
+    return result
+
+
+@tracing_service.traced()
+def search_paths_by_embedding(
+    query_text: str,
+    query_embedding: Optional[List[float]],
+    limit: int = 3,
+    domain_hint: Optional[str] = None,
+    hydrate: bool = True
+):
+    """
+    이미 계산된 쿼리 임베딩으로 경로 검색 (임베딩 재계산 없음)
+
     검색 전략:
     1. taskIntent 임베딩 검색 (HAS_STEP 관계)
     2. Python에서 코사인 유사도 계산
     3. 경로 재구성 및 반환
 
     Args:
-        query_text: 사용자 자연어 쿼리 (예: "날씨 보여줘")
+        query_text: 사용자 자연어 쿼리 (응답 표시용)
+        query_embedding: 쿼리 임베딩 벡터
         limit: 최대 반환 경로 수
         domain_hint: 특정 도메인으로 제한 (선택사항)
+        hydrate: False면 경로 재구성을 생략하고 경로 헤더(stepId 포함, steps 없음)만 반환 (스트리밍 응답용)
 
     Returns:
         dict: {'query', 'total_matched', 'matched_paths', 'performance'}
@@ -258,154 +638,430 @@ def search_paths_by_query(
     start_time = time.time()
 
     try:
-        # 1. 쿼리 임베딩 생성
-        query_embedding = generate_embedding(query_text)
-
-        # 2. taskIntent 임베딩 검색
-        if domain_hint:
-            intent_search_query = """
-            CALL db.index.vector.queryRelationships(
-            "intent_embeddings",
-            $topK,
-            $queryEmbedding
-            )
-            YIELD relationship AS rel
-            WITH rel
-            MATCH (r:ROOT {domain: $domain})-[rel]->(firstStep:STEP)
-            WHERE rel.intentEmbedding IS NOT NULL
-            RETURN r.domain AS domain,
-                r.baseURL AS baseURL,
-                rel.taskIntent AS taskIntent,
-                rel.intentEmbedding AS intentEmbedding,
-                rel.weight AS weight,
-                firstStep.stepId AS stepId
-            LIMIT $limit;
-            """
-            all_intents = graph.query(intent_search_query, {
-                'domain': domain_hint,
-                'queryEmbedding': query_embedding,
-                'topK': limit * 5,
-                'limit': limit
-                })
+        if not query_embedding:
+            raise ValueError("쿼리 임베딩이 없습니다.")
+
+        # 2. taskIntent 임베딩 검색 + 3. Python에서 코사인 유사도 계산
+        #    (동시에 들어온 검색은 마이크로 배치로 묶어 한 번의 쿼리로 실행)
+        vector_start = time.perf_counter()
+        intent_results = _vector_batcher.search(query_embedding, limit, domain_hint)
+        vector_query_ms = round((time.perf_counter() - vector_start) * 1000, 1)
+
+        performance = {'vector_query_time': vector_query_ms}
+        if hydrate:
+            # 4. 경로 재구성 (단일 쿼리)
+            reconstruct_start = time.perf_counter()
+            steps_by_id = reconstruct_paths([result['stepId'] for result in intent_results])
+            matched_paths = _build_matched_paths(intent_results, steps_by_id)
+            performance['reconstruct_time'] = round((time.perf_counter() - reconstruct_start) * 1000, 1)
         else:
-            intent_search_query = """
-            CALL db.index.vector.queryRelationships(
-            "intent_embeddings",
-            $topK,
-            $queryEmbedding
-            )
-            YIELD relationship AS rel
-            WITH rel
-            MATCH (r:ROOT)-[rel]->(firstStep:STEP)
-            WHERE rel.intentEmbedding IS NOT NULL
-            RETURN r.domain AS domain,
-                r.baseURL AS baseURL,
-                rel.taskIntent AS taskIntent,
-                rel.intentEmbedding AS intentEmbedding,
-                rel.weight AS weight,
-                firstStep.stepId AS stepId
-            LIMIT $limit;
-            """
-            all_intents = graph.query(intent_search_query, {
-                'queryEmbedding': query_embedding,
-                'topK': limit * 5,
-                'limit': limit
-                })
+            matched_paths = _build_path_headers(intent_results)
 
-        # 3. Python에서 코사인 유사도 계산
-        import numpy as np
-
-        def cosine_similarity(vec1, vec2):
-            vec1, vec2 = np.array(vec1), np.array(vec2)
-            if vec1.shape != vec2.shape:
-                return 0.0
-            dot = np.dot(vec1, vec2)
-            norm1, norm2 = np.linalg.norm(vec1), np.linalg.norm(vec2)
-            if norm1 == 0 or norm2 == 0:
-                return 0.0
-            return dot / (norm1 * norm2)
-
-        intent_results = []
-        for item in all_intents:
-            intent_embedding = item['intentEmbedding']
-            if intent_embedding:
-                similarity = cosine_similarity(query_embedding, intent_embedding)
-                if similarity > 0.3:  # 임계값
-                    intent_results.append({
-                        'domain': item['domain'],
-                        'taskIntent': item['taskIntent'],
-                        'weight': item['weight'],
-                        'stepId': item['stepId'],
-                        'similarity': similarity
-                    })
-
-        # 유사도 순 정렬
-        intent_results = sorted(intent_results, key=lambda x: x['similarity'], reverse=True)[:limit]
-
-        # 4. 경로 재구성
-        matched_paths = []
-        for result in intent_results:
-            first_step_id = result['stepId']
-
-            # 경로 추적 (NEXT_STEP 관계 따라가기)
-            path_query = """
-            MATCH path = (start:STEP {stepId: $startStepId})-[:NEXT_STEP*0..20]->(end:STEP)
-            WHERE NOT (end)-[:NEXT_STEP]->()
-            WITH path, relationships(path) as rels
-            RETURN [node in nodes(path) | node] as steps,
-                   [rel in rels | rel.sequenceOrder] as orders
-            LIMIT 1
-            """
+        search_time_ms = int((time.time() - start_time) * 1000)
 
-            path_data = graph.query(path_query, {'startStepId': first_step_id})
-
-            if path_data:
-                steps_list = path_data[0]['steps']
-
-                formatted_steps = []
-                for i, step_node in enumerate(steps_list):
-                    formatted_steps.append({
-                        'order': i,
-                        'url': step_node['url'],
-                        'action': step_node['action'],
-                        'selectors': step_node.get('selectors', []),
-                        'description': step_node.get('description', ''),
-                        'isInput': step_node.get('isInput', False),
-                        'inputType': step_node.get('inputType'),
-                        'inputPlaceholder': step_node.get('inputPlaceholder'),
-                        'shouldWait': step_node.get('shouldWait', False),
-                        'waitMessage': step_node.get('waitMessage'),
-                        'textLabels': step_node.get('textLabels', [])
-                    })
-
-                matched_paths.append({
-                    'domain': result['domain'],
-                    'taskIntent': result['taskIntent'],
-                    'relevance_score': round(result['similarity'], 3),
-                    'weight': result['weight'],
-                    'steps': formatted_steps
-                })
+        logger.debug("벡터 검색 완료", query=query_text, matched=len(matched_paths), search_time=search_time_ms)
+
+        return {
+            'query': query_text,
+            'total_matched': len(matched_paths),
+            'matched_paths': matched_paths,
+            'performance': {'search_time': search_time_ms, **performance}
+        }
+
+    except circuit_breaker.CircuitOpenError:
+        # 회로 열림을 None(낮은 유사도)으로 삼키면 호출부가 재탐색을 시작하므로 그대로 전달
+        raise
+    except Exception as e:
+        logger.exception("경로 검색 실패", query=query_text, error=str(e))
+        return None
+
+
+def _vector_search_many(
+    query_embeddings: List[List[float]],
+    limit: int = 1,
+    domain_hint: Optional[str] = None,
+    limits: Optional[List[int]] = None,
+    domain_hints: Optional[List[Optional[str]]] = None
+) -> List[List[dict]]:
+    """
+    여러 쿼리 임베딩을 UNWIND로 묶어 한 번의 Cypher 호출로 taskIntent 벡터 검색
+
+    limits/domain_hints를 주면 쿼리별로 다른 결과 수/도메인을 적용합니다
+    (Cypher LIMIT은 행별 값을 받을 수 없으므로 최댓값으로 조회 후 쿼리별로 자름).
+
+    Returns:
+        List[List[dict]]: 입력 순서대로 각 임베딩의 유사도 결과 (_score_intent_rows 형식)
+    """
+    multi_search_query = """
+    UNWIND range(0, size($queryEmbeddings) - 1) AS idx
+    CALL {
+        WITH idx
+        CALL db.index.vector.queryRelationships(
+        "intent_embeddings",
+        $topK,
+        $queryEmbeddings[idx]
+        )
+        YIELD relationship AS rel
+        WITH rel
+        MATCH (r:ROOT)-[rel]->(firstStep:STEP)
+        WHERE rel.intentEmbedding IS NOT NULL
+          AND ($domains[idx] IS NULL OR r.domain = $domains[idx])
+        RETURN r.domain AS domain,
+            rel.taskIntent AS taskIntent,
+            rel.intentEmbedding AS intentEmbedding,
+            rel.weight AS weight,
+            firstStep.stepId AS stepId
+        LIMIT $limit
+    }
+    RETURN idx, domain, taskIntent, intentEmbedding, weight, stepId
+    """
+
+    limits = limits or [limit] * len(query_embeddings)
+    max_limit = max(limits)
+    rows = graph.query(multi_search_query, {
+        'queryEmbeddings': query_embeddings,
+        'domains': domain_hints or [domain_hint] * len(query_embeddings),
+        'topK': max_limit * 5,
+        'limit': max_limit
+    })
+
+    rows_by_idx = [[] for _ in query_embeddings]
+    for row in rows:
+        rows_by_idx[row['idx']].append(row)
+
+    return [
+        _score_intent_rows(embedding, idx_rows, idx_limit)
+        for embedding, idx_rows, idx_limit in zip(query_embeddings, rows_by_idx, limits)
+    ]
+
+
+def _vector_search_one(
+    query_embedding: List[float],
+    limit: int = 3,
+    domain_hint: Optional[str] = None
+) -> List[dict]:
+    """쿼리 임베딩 하나로 taskIntent 벡터 검색 (_score_intent_rows 형식으로 반환)"""
+    if domain_hint:
+        intent_search_query = """
+        CALL db.index.vector.queryRelationships(
+        "intent_embeddings",
+        $topK,
+        $queryEmbedding
+        )
+        YIELD relationship AS rel
+        WITH rel
+        MATCH (r:ROOT {domain: $domain})-[rel]->(firstStep:STEP)
+        WHERE rel.intentEmbedding IS NOT NULL
+        RETURN r.domain AS domain,
+            r.baseURL AS baseURL,
+            rel.taskIntent AS taskIntent,
+            rel.intentEmbedding AS intentEmbedding,
+            rel.weight AS weight,
+            firstStep.stepId AS stepId
+        LIMIT $limit;
+        """
+        all_intents = graph.query(intent_search_query, {
+            'domain': domain_hint,
+            'queryEmbedding': query_embedding,
+            'topK': limit * 5,
+            'limit': limit
+            })
+    else:
+        intent_search_query = """
+        CALL db.index.vector.queryRelationships(
+        "intent_embeddings",
+        $topK,
+        $queryEmbedding
+        )
+        YIELD relationship AS rel
+        WITH rel
+        MATCH (r:ROOT)-[rel]->(firstStep:STEP)
+        WHERE rel.intentEmbedding IS NOT NULL
+        RETURN r.domain AS domain,
+            r.baseURL AS baseURL,
+            rel.taskIntent AS taskIntent,
+            rel.intentEmbedding AS intentEmbedding,
+            rel.weight AS weight,
+            firstStep.stepId AS stepId
+        LIMIT $limit;
+        """
+        all_intents = graph.query(intent_search_query, {
+            'queryEmbedding': query_embedding,
+            'topK': limit * 5,
+            'limit': limit
+            })
+
+    return _score_intent_rows(query_embedding, all_intents, limit)
+
+
+# ============================================================================
+# 벡터 검색 마이크로 배치
+# 동시에 들어온 벡터 검색을 짧은 윈도우 동안 모아 _vector_search_many(UNWIND) 한 번으로 실행
+# - NEO4J_VECTOR_BATCH_WINDOW_MS: 모으는 시간 (기본 2ms, 0이면 비활성)
+# - NEO4J_VECTOR_BATCH_MAX_SIZE: 배치 최대 크기 (기본 32, 가득 차면 윈도우를 기다리지 않음)
+# ============================================================================
+
+VECTOR_BATCH_WINDOW_MS = float(os.getenv("NEO4J_VECTOR_BATCH_WINDOW_MS", "2"))
+VECTOR_BATCH_MAX_SIZE = int(os.getenv("NEO4J_VECTOR_BATCH_MAX_SIZE", "32"))
+
+metrics_service.set_buckets("neo4j_vector_batch_size", metrics_service.COUNT_BUCKETS)
+
+
+class _VectorSearchBatcher:
+    """
+    리더/팔로워 방식 마이크로 배처 (스레드 풀의 동기 호출용)
+
+    배치를 연 첫 호출(리더)이 윈도우 동안 기다린 뒤 모인 검색을 한 번에 실행하고 결과를 나눠 줍니다.
+    실행 중인 벡터 쿼리가 없으면 기다리지 않고 바로 실행하므로, 동시 요청이 없을 때는 지연이 늘지 않습니다.
+
+    - 호출마다 자신의 trace에 neo4j.vector_batch_item span을 남기고, 리더의 neo4j.vector_batch span과 서로 링크합니다.
+    - 배치는 참여한 요청 중 가장 늦은 마감 시각으로 실행합니다 (마감이 없는 요청이 있으면 마감 없음).
+    - 팔로워는 자신의 마감까지만 기다리고 TimeoutError로 스레드를 반환합니다 (배치 결과는 버림).
+    """
+
+    def __init__(self, window_ms: float, max_size: int):
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self._batch = None
+        self._executing = 0
+        self._lock = threading.Lock()
+
+    def search(self, query_embedding: List[float], limit: int, domain_hint: Optional[str]) -> List[dict]:
+        if self.window <= 0:
+            return _vector_search_one(query_embedding, limit, domain_hint)
+
+        with tracing_service.span("neo4j.vector_batch_item", limit=limit) as item_span:
+            entry = {
+                'embedding': query_embedding,
+                'limit': limit,
+                'domain': domain_hint,
+                'deadline': rate_limit_service.current_deadline(),
+                'span': item_span,
+                'batch_span': None,
+                'done': threading.Event(),
+                'result': None,
+                'error': None
+            }
+            with self._lock:
+                leader = self._batch is None
+                if leader:
+                    self._batch = {'entries': [], 'full': threading.Event()}
+                    wait = self._executing > 0
+                batch = self._batch
+                batch['entries'].append(entry)
+                if len(batch['entries']) >= self.max_size:
+                    # 가득 찬 배치는 닫고 리더를 깨움 (다음 호출은 새 배치)
+                    self._batch = None
+                    batch['full'].set()
+
+            item_span.set_attribute("leader", leader)
+            if not leader:
+                if not entry['done'].wait(rate_limit_service.time_left()):
+                    raise TimeoutError("벡터 검색 배치 대기 중 마감 초과")
+            else:
+                if wait:
+                    batch['full'].wait(self.window)
+                with self._lock:
+                    if self._batch is batch:
+                        self._batch = None
+                    self._executing += 1
+                try:
+                    self._execute(batch['entries'])
+                finally:
+                    with self._lock:
+                        self._executing -= 1
+
+            if entry['batch_span'] is not None:
+                item_span.add_link(entry['batch_span'])
+                item_span.set_attribute("batch_size", entry['batch_span'].attributes["size"])
+            if entry['error'] is not None:
+                raise entry['error']
+            return entry['result']
+
+    def _execute(self, entries: List[dict]):
+        metrics_service.observe("neo4j_vector_batch_size", len(entries))
+        deadlines = [entry['deadline'] for entry in entries]
+        deadline = None if None in deadlines else max(deadlines)
+        deadline_token = rate_limit_service.set_deadline(deadline)
+        try:
+            with tracing_service.span("neo4j.vector_batch", size=len(entries)) as batch_span:
+                for entry in entries:
+                    batch_span.add_link(entry['span'])
+                    entry['batch_span'] = batch_span
+                if len(entries) == 1:
+                    entry = entries[0]
+                    results = [_vector_search_one(entry['embedding'], entry['limit'], entry['domain'])]
+                else:
+                    results = _vector_search_many(
+                        [entry['embedding'] for entry in entries],
+                        limits=[entry['limit'] for entry in entries],
+                        domain_hints=[entry['domain'] for entry in entries]
+                    )
+            for entry, result in zip(entries, results):
+                entry['result'] = result
+        except Exception as e:
+            for entry in entries:
+                entry['error'] = e
+        finally:
+            rate_limit_service.reset_deadline(deadline_token)
+            for entry in entries:
+                entry['done'].set()
+
+
+_vector_batcher = _VectorSearchBatcher(VECTOR_BATCH_WINDOW_MS, VECTOR_BATCH_MAX_SIZE)
+
+
+@tracing_service.traced()
+def search_paths_by_embeddings(
+    query_texts: List[str],
+    query_embeddings: List[Optional[List[float]]],
+    limit_per_query: int = 1,
+    domain_hint: Optional[str] = None
+):
+    """
+    여러 쿼리(예: LLM 키워드)를 한 번의 벡터 검색 + 한 번의 경로 재구성으로 처리
+
+    각 쿼리별 상위 limit_per_query개 결과의 합집합을 (domain, taskIntent) 기준으로
+    중복 제거하고(최고 유사도 유지) 유사도 순으로 반환합니다.
+
+    Args:
+        query_texts: 쿼리 텍스트 목록 (응답 표시용)
+        query_embeddings: query_texts와 같은 순서의 임베딩 목록 (None은 건너뜀)
+        limit_per_query: 쿼리당 최대 결과 수
+        domain_hint: 특정 도메인으로 제한 (선택사항)
+
+    Returns:
+        dict: {'query', 'total_matched', 'matched_paths', 'performance'}
+    """
+    if not graph:
+        raise ConnectionError("Neo4j database is not connected.")
+
+    start_time = time.time()
+
+    try:
+        valid_embeddings = [embedding for embedding in query_embeddings if embedding]
+        if not valid_embeddings:
+            raise ValueError("쿼리 임베딩이 없습니다.")
+
+        # 1. 다중 벡터 검색 (단일 쿼리)
+        vector_start = time.perf_counter()
+        results_per_query = _vector_search_many(valid_embeddings, limit_per_query, domain_hint)
+        vector_query_ms = round((time.perf_counter() - vector_start) * 1000, 1)
+
+        # 2. 합집합 (domain, taskIntent 기준 최고 유사도 유지)
+        best_by_key = {}
+        for intent_results in results_per_query:
+            for result in intent_results:
+                key = (result['domain'], result['taskIntent'])
+                if key not in best_by_key or result['similarity'] > best_by_key[key]['similarity']:
+                    best_by_key[key] = result
+        union_results = sorted(best_by_key.values(), key=lambda x: x['similarity'], reverse=True)
+
+        # 3. 경로 재구성 (단일 쿼리)
+        reconstruct_start = time.perf_counter()
+        steps_by_id = reconstruct_paths([result['stepId'] for result in union_results])
+        matched_paths = _build_matched_paths(union_results, steps_by_id)
+        reconstruct_ms = round((time.perf_counter() - reconstruct_start) * 1000, 1)
 
         search_time_ms = int((time.time() - start_time) * 1000)
 
-        print(f"\n🔍 검색 완료: '{query_text}' → {len(matched_paths)}개 경로 발견 ({search_time_ms}ms)")
+        logger.debug("다중 벡터 검색 완료", queries=len(valid_embeddings), matched=len(matched_paths), search_time=search_time_ms)
 
         return {
-            'query': query_text,
+            'query': " | ".join(query_texts),
             'total_matched': len(matched_paths),
             'matched_paths': matched_paths,
             'performance': {
-                'search_time': search_time_ms
+                'search_time': search_time_ms,
+                'vector_query_time': vector_query_ms,
+                'reconstruct_time': reconstruct_ms
             }
         }
 
+    except circuit_breaker.CircuitOpenError:
+        raise
     except Exception as e:
-        print(f"❌ 경로 검색 실패: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("다중 벡터 검색 실패", error=str(e))
         return None
 
 
+@tracing_service.traced()
+def search_paths_batch(
+    query_texts: List[str],
+    query_embeddings: List[Optional[List[float]]],
+    limits: List[int],
+    domain_hints: List[Optional[str]]
+) -> List[Optional[dict]]:
+    """
+    서로 독립적인 여러 검색을 한 번의 벡터 검색 + 한 번의 경로 재구성으로 처리 (search_batch용)
+
+    taskIntent 정확 일치 항목은 벡터 검색 없이 유사도 1.0으로 처리합니다.
+
+    Returns:
+        List[dict | None]: 입력 순서대로 search_paths_by_embedding과 같은 형식의 결과
+            (performance에 max_similarity, exact_match 추가). 정확 일치도 임베딩도 없는 항목은 None
+    """
+    if not graph:
+        raise ConnectionError("Neo4j database is not connected.")
+
+    start_time = time.time()
+
+    # 1. 정확 일치 / 벡터 검색 대상 분리
+    intent_results: List[Optional[List[dict]]] = [None] * len(query_texts)
+    exact = [False] * len(query_texts)
+    vector_indices = []
+    for i, (text, embedding) in enumerate(zip(query_texts, query_embeddings)):
+        exact_matches = lookup_exact_intent(text, domain_hints[i])
+        if exact_matches:
+            intent_results[i] = [{**entry, 'similarity': 1.0} for entry in exact_matches[:limits[i]]]
+            exact[i] = True
+        elif embedding:
+            vector_indices.append(i)
+
+    # 2. 다중 벡터 검색 (단일 쿼리)
+    vector_start = time.perf_counter()
+    if vector_indices:
+        vector_results = _vector_search_many(
+            [query_embeddings[i] for i in vector_indices],
+            limits=[limits[i] for i in vector_indices],
+            domain_hints=[domain_hints[i] for i in vector_indices]
+        )
+        for i, results in zip(vector_indices, vector_results):
+            intent_results[i] = results
+    vector_query_ms = round((time.perf_counter() - vector_start) * 1000, 1)
+
+    # 3. 경로 재구성 (전체 항목 단일 쿼리)
+    reconstruct_start = time.perf_counter()
+    steps_by_id = reconstruct_paths([
+        result['stepId'] for results in intent_results if results for result in results
+    ])
+    reconstruct_ms = round((time.perf_counter() - reconstruct_start) * 1000, 1)
+
+    search_time_ms = int((time.time() - start_time) * 1000)
+    batch_results = []
+    for i, results in enumerate(intent_results):
+        if results is None:
+            batch_results.append(None)
+            continue
+        matched_paths = _build_matched_paths(results, steps_by_id)
+        batch_results.append({
+            'query': query_texts[i],
+            'total_matched': len(matched_paths),
+            'matched_paths': matched_paths,
+            'performance': {
+                'search_time': search_time_ms,
+                'vector_query_time': vector_query_ms,
+                'reconstruct_time': reconstruct_ms,
+                'max_similarity': matched_paths[0]['relevance_score'] if matched_paths else 0.0,
+                'exact_match': exact[i]
+            }
+        })
+
+    logger.debug("배치 검색 완료", queries=len(query_texts), vector_queries=len(vector_indices),
+                 exact=sum(exact), search_time=search_time_ms)
+    return batch_results
+
+
 # ============================================================================
 # 인덱스 및 제약 조건 관리
 # ============================================================================
@@ -417,7 +1073,7 @@ def create_vector_indexes():
     if not graph:
         raise ConnectionError("Neo4j database is not connected.")
 
-    print("인덱스 생성 중...")
+    logger.info("인덱스 생성 중...")
 
     try:
         # 고유성 제약
@@ -425,26 +1081,26 @@ def create_vector_indexes():
             CREATE CONSTRAINT root_domain_unique IF NOT EXISTS
             FOR (r:ROOT) REQUIRE r.domain IS UNIQUE
         """)
-        print("  ✓ ROOT.domain 고유 제약 생성")
+        logger.info("ROOT.domain 고유 제약 생성")
 
         graph.query("""
             CREATE CONSTRAINT step_id_unique IF NOT EXISTS
             FOR (s:STEP) REQUIRE s.stepId IS UNIQUE
         """)
-        print("  ✓ STEP.stepId 고유 제약 생성")
+        logger.info("STEP.stepId 고유 제약 생성")
 
         # 일반 인덱스
         graph.query("""
             CREATE INDEX step_domain_idx IF NOT EXISTS
             FOR (s:STEP) ON (s.domain)
         """)
-        print("  ✓ STEP.domain 인덱스 생성")
+        logger.info("STEP.domain 인덱스 생성")
 
         graph.query("""
             CREATE INDEX step_action_idx IF NOT EXISTS
             FOR (s:STEP) ON (s.action)
         """)
-        print("  ✓ STEP.action 인덱스 생성")
+        logger.info("STEP.action 인덱스 생성")
 
         # 벡터 인덱스는 Neo4j 5.x에서 지원
         try:
@@ -456,9 +1112,9 @@ def create_vector_indexes():
                   `vector.similarity_function`: 'cosine'
                 }}
             """)
-            print("  ✓ ROOT.embedding 벡터 인덱스 생성")
+            logger.info("ROOT.embedding 벡터 인덱스 생성")
         except Exception as e:
-            print(f"  ⚠ ROOT 벡터 인덱스 생성 실패 (Neo4j 5.x 이상 필요): {e}")
+            logger.warning("ROOT 벡터 인덱스 생성 실패 (Neo4j 5.x 이상 필요)", error=str(e))
 
         try:
             graph.query("""
@@ -469,9 +1125,9 @@ def create_vector_indexes():
                   `vector.similarity_function`: 'cosine'
                 }}
             """)
-            print("  ✓ STEP.embedding 벡터 인덱스 생성")
+            logger.info("STEP.embedding 벡터 인덱스 생성")
         except Exception as e:
-            print(f"  ⚠ STEP 벡터 인덱스 생성 실패: {e}")
+            logger.warning("STEP 벡터 인덱스 생성 실패", error=str(e))
 
         # 전문 검색 인덱스
         try:
@@ -479,17 +1135,15 @@ def create_vector_indexes():
                 CREATE FULLTEXT INDEX step_text_search IF NOT EXISTS
                 FOR (s:STEP) ON EACH [s.description, s.textLabels]
             """)
-            print("  ✓ STEP 전문 검색 인덱스 생성")
+            logger.info("STEP 전문 검색 인덱스 생성")
         except Exception as e:
-            print(f"  ⚠ 전문 검색 인덱스 생성 실패: {e}")
+            logger.warning("전문 검색 인덱스 생성 실패", error=str(e))
 
-        print("\n✅ 인덱스 생성 완료!")
+        logger.info("인덱스 생성 완료")
         return True
 
     except Exception as e:
-        print(f"❌ 인덱스 생성 실패: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("인덱스 생성 실패", error=str(e))
         return False
 
 
@@ -537,7 +1191,7 @@ def check_graph_structure():
             }
 
     except Exception as e:
-        print(f"그래프 구조 확인 실패: {e}")
+        logger.error("그래프 구조 확인 실패", error=str(e))
         return {'error': str(e)}
 
 
@@ -575,7 +1229,7 @@ def visualize_paths(domain: str):
         return paths
 
     except Exception as e:
-        print(f"경로 시각화 실패: {e}")
+        logger.error("경로 시각화 실패", error=str(e))
         return []
 
 
@@ -622,7 +1276,7 @@ def find_popular_paths(domain: Optional[str] = None, limit: int = 10):
         return popular_paths
 
     except Exception as e:
-        print(f"인기 경로 조회 실패: {e}")
+        logger.error("인기 경로 조회 실패", error=str(e))
         return []
 
 
@@ -650,5 +1304,5 @@ def cleanup_old_paths(days: int = 30):
             return {'deleted_relations': 0}
 
     except Exception as e:
-        print(f"경로 정리 실패: {e}")
+        logger.error("경로 정리 실패", error=str(e))
         return {'error': str(e)}
@@ -0,0 +1,266 @@
+"""
+OpenAI 호출 속도 제한 서비스 - 모델별 RPM/TPM 토큰 버킷 + 재시도 스케줄러
+
+임베딩(스레드 풀의 동기 호출)과 LLM(비동기 호출)이 같은 버킷을 공유하여
+한도에 가까워지면 요청 전에 기다리고, 429를 받으면 같은 모델의 모든 호출이 함께 물러납니다.
+
+- 우선순위 레인: interactive(검색 요청)는 버킷을 모두 사용할 수 있고, bulk(재임베딩 스크립트 등)는
+  OPENAI_BULK_RESERVE 비율만큼을 interactive용으로 남겨 둠. 스크립트는 set_priority("bulk") 호출
+- 재시도: 지수 백오프 + full jitter (Retry-After 헤더 우선), 요청 마감 시각(set_deadline)을 넘기면 재시도하지 않음
+- OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT: 모델별 분당 요청/토큰 한도 (기본 500 / 200000)
+- OPENAI_MAX_RETRIES: 최대 재시도 횟수 (기본 3), OPENAI_RETRY_BASE_MS / OPENAI_RETRY_MAX_MS: 백오프 기준/상한
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+import contextvars
+from typing import Optional
+
+import openai
+
+from app.services import metrics_service, logging_service
+
+logger = logging_service.get_logger(__name__)
+
+RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", "200000"))
+BULK_RESERVE = float(os.getenv("OPENAI_BULK_RESERVE", "0.2"))
+MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "3"))
+RETRY_BASE_MS = int(os.getenv("OPENAI_RETRY_BASE_MS", "200"))
+RETRY_MAX_MS = int(os.getenv("OPENAI_RETRY_MAX_MS", "4000"))
+
+PRIORITIES = ("interactive", "bulk")
+
+# 재시도할 OpenAI 오류 (그 외 오류는 즉시 전파)
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError
+)
+
+# 현재 요청의 우선순위/마감 시각 (스레드 풀에는 tracing_service.run_in_executor의 컨텍스트 복사로 전파)
+_priority = contextvars.ContextVar("openai_priority", default=os.getenv("OPENAI_DEFAULT_PRIORITY", "interactive"))
+_deadline = contextvars.ContextVar("openai_deadline", default=None)
+
+
+class RateLimitExceeded(Exception):
+    """마감 시각 안에 버킷이 채워지지 않아 호출을 포기함"""
+
+
+class TokenBucketLimiter:
+    """모델 하나의 요청/토큰 버킷 (스레드 안전, 동기/비동기 대기 모두 지원)"""
+
+    def __init__(self, model: str, rpm: int, tpm: int):
+        self.model = model
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def _try_take(self, tokens: int, priority: str) -> float:
+        """버킷에서 차감하고 0 반환, 부족하면 채워질 때까지 기다릴 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            self._refill(now)
+
+            reserve = BULK_RESERVE if priority == "bulk" else 0.0
+            # 한 번에 버킷 용량보다 큰 요청은 용량만큼만 기다림 (영원히 대기하지 않도록)
+            tokens = min(tokens, self.tpm * (1 - reserve))
+            missing_requests = 1 + self.rpm * reserve - self._requests
+            missing_tokens = tokens + self.tpm * reserve - self._tokens
+            if missing_requests <= 0 and missing_tokens <= 0:
+                self._requests -= 1
+                self._tokens -= tokens
+                return 0.0
+            return max(missing_requests * 60 / self.rpm, missing_tokens * 60 / self.tpm, 0.001)
+
+    def try_acquire(self, tokens: int, priority: str) -> bool:
+        """기다리지 않고 차감 시도 (부가 요청용, 여유가 없으면 False)"""
+        return not self._try_take(tokens, priority)
+
+    def _check_wait(self, wait: float, priority: str):
+        remaining = time_left()
+        if remaining is not None and wait > remaining:
+            metrics_service.increment("openai_rate_limited_total", model=self.model, priority=priority)
+            raise RateLimitExceeded(f"{self.model}: 마감 전 속도 제한 해제 불가 (대기 {wait:.2f}s)")
+
+    def acquire(self, tokens: int, priority: str):
+        """동기 대기 (스레드 풀에서 호출)"""
+        start = time.monotonic()
+        while True:
+            wait = self._try_take(tokens, priority)
+            if not wait:
+                break
+            self._check_wait(wait, priority)
+            time.sleep(wait)
+        self._observe_wait(start, priority)
+
+    async def acquire_async(self, tokens: int, priority: str):
+        """비동기 대기 (이벤트 루프에서 호출)"""
+        start = time.monotonic()
+        while True:
+            wait = self._try_take(tokens, priority)
+            if not wait:
+                break
+            self._check_wait(wait, priority)
+            await asyncio.sleep(wait)
+        self._observe_wait(start, priority)
+
+    def _observe_wait(self, start: float, priority: str):
+        waited_ms = (time.monotonic() - start) * 1000
+        if waited_ms >= 1:
+            metrics_service.observe("openai_rate_limit_wait_ms", waited_ms, model=self.model, priority=priority)
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        """응답의 실제 토큰 사용량으로 추정치 보정"""
+        with self._lock:
+            self._tokens = min(self.tpm, self._tokens + estimated_tokens - actual_tokens)
+
+    def block(self, seconds: float):
+        """429 수신 시 같은 모델의 모든 호출을 일정 시간 멈춤"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(model: str) -> TokenBucketLimiter:
+    limiter = _limiters.get(model)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.setdefault(model, TokenBucketLimiter(model, RPM_LIMIT, TPM_LIMIT))
+    return limiter
+
+
+# ============================================================================
+# 우선순위 / 마감 시각
+# ============================================================================
+
+def set_priority(priority: str) -> contextvars.Token:
+    """현재 컨텍스트의 우선순위 설정 ("interactive" | "bulk", 배치 스크립트는 시작 시 "bulk")"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"지원하지 않는 우선순위: {priority}")
+    return _priority.set(priority)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+def set_deadline(deadline: Optional[float]) -> contextvars.Token:
+    """현재 요청의 마감 시각 설정 (time.monotonic 기준, 반환된 토큰은 reset_deadline에 전달)"""
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token: contextvars.Token):
+    _deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    """현재 요청의 마감 시각 (time.monotonic 기준, 없으면 None)"""
+    return _deadline.get()
+
+
+def time_left() -> Optional[float]:
+    """마감까지 남은 시간(초). 마감이 없으면 None"""
+    deadline = _deadline.get()
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def estimate_tokens(text: str) -> int:
+    """요청 토큰 추정 (UTF-8 3바이트당 1토큰, 한글은 글자당 약 1토큰으로 보수적)"""
+    return max(1, len(text.encode("utf-8")) // 3)
+
+
+# ============================================================================
+# 재시도 스케줄러
+# ============================================================================
+
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """재시도 대기 시간(초). 재시도하지 않을 오류면 None"""
+    if attempt >= MAX_RETRIES or not isinstance(error, _RETRYABLE_ERRORS):
+        return None
+
+    # full jitter: 같은 시점에 실패한 호출들이 동시에 재시도하지 않도록
+    delay = random.uniform(0, min(RETRY_MAX_MS, RETRY_BASE_MS * 2 ** attempt)) / 1000
+
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass
+    return delay
+
+
+def _before_retry(limiter: TokenBucketLimiter, error: Exception, attempt: int) -> float:
+    """재시도 여부 판단 후 대기 시간 반환 (재시도하지 않으면 원래 예외 전파)"""
+    delay = _retry_delay(error, attempt)
+    remaining = time_left()
+    if delay is None or (remaining is not None and delay >= remaining):
+        raise error
+
+    if isinstance(error, openai.RateLimitError):
+        limiter.block(delay)
+    reason = type(error).__name__
+    metrics_service.increment("openai_retries_total", model=limiter.model, reason=reason)
+    logger.warning("OpenAI 호출 재시도", model=limiter.model, attempt=attempt + 1, delay_ms=int(delay * 1000), reason=reason)
+    return delay
+
+
+def call_with_retry(func, model: str, tokens: int, priority: Optional[str] = None):
+    """
+    속도 제한을 지키며 func() 호출 (동기, 스레드 풀용)
+
+    Raises:
+        RateLimitExceeded: 마감 시각 안에 버킷이 채워지지 않음
+        Exception: 재시도 불가 오류 또는 재시도 소진 시 마지막 오류
+    """
+    limiter = get_limiter(model)
+    priority = priority or _priority.get()
+    attempt = 0
+    while True:
+        limiter.acquire(tokens, priority)
+        try:
+            return func()
+        except Exception as e:
+            time.sleep(_before_retry(limiter, e, attempt))
+            attempt += 1
+
+
+async def acall_with_retry(func, model: str, tokens: int, priority: Optional[str] = None):
+    """call_with_retry의 비동기 버전 (func()는 awaitable 반환)"""
+    limiter = get_limiter(model)
+    priority = priority or _priority.get()
+    attempt = 0
+    while True:
+        await limiter.acquire_async(tokens, priority)
+        try:
+            return await func()
+        except Exception as e:
+            await asyncio.sleep(_before_retry(limiter, e, attempt))
+            attempt += 1
+
+
+def record_usage(model: str, estimated_tokens: int, actual_tokens: Optional[int]):
+    """실제 토큰 사용량으로 버킷 보정 (usage가 없으면 추정치 유지)"""
+    if actual_tokens is not None:
+        get_limiter(model).settle(estimated_tokens, actual_tokens)
@@ -0,0 +1,323 @@
+"""
+트레이싱 서비스 - 요청 단위 span 기록 및 내보내기
+
+하나의 WebSocket 메시지가 거치는 구간(엔드포인트 → LangGraph 노드 → 스레드 풀 → Neo4j/OpenAI 호출)을
+같은 trace_id로 묶어 느린 요청의 임계 경로를 재구성할 수 있게 합니다.
+
+- 현재 span은 contextvars로 전파 (asyncio 태스크는 자동, 스레드 풀은 run_in_executor 사용)
+- 끝난 span은 큐에 넣고 백그라운드 스레드가 배치로 내보냄 (요청 경로를 막지 않음)
+- TRACE_EXPORTER: "file" (JSONL, TRACE_EXPORT_PATH) | "otlp" (OTLP/HTTP JSON, OTLP_ENDPOINT) | 미설정 시 내보내지 않음
+"""
+
+import os
+import json
+import time
+import queue
+import asyncio
+import inspect
+import secrets
+import functools
+import threading
+import contextvars
+import urllib.request
+from contextlib import contextmanager
+from typing import Optional
+
+from app.services import metrics_service, logging_service
+
+logger = logging_service.get_logger(__name__)
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "").lower()
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", os.path.join(_PROJECT_ROOT, "data", "traces.jsonl"))
+OTLP_ENDPOINT = os.getenv("OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "vowser-mcp-server")
+
+metrics_service.set_gauge("executor_queue_depth", 0)
+
+_EXPORT_BATCH_SIZE = 256
+_EXPORT_INTERVAL_SECONDS = 1.0
+_QUEUE_MAX_SIZE = 10000
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+_export_queue = queue.Queue(maxsize=_QUEUE_MAX_SIZE)
+_export_thread = None
+_export_lock = threading.Lock()
+
+
+class Span:
+    """단일 구간 기록 (trace_id/span_id는 OTLP와 같은 16/8바이트 hex)"""
+
+    __slots__ = ("trace_id", "span_id", "parent_span_id", "name", "attributes",
+                 "start_ns", "end_ns", "status", "error", "links")
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str], attributes: dict):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = "ok"
+        self.error = None
+        self.links = []
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def add_link(self, other: "Span"):
+        """다른 trace의 span과 연결 (마이크로 배치처럼 여러 요청이 한 작업을 공유할 때, OTLP links)"""
+        self.links.append((other.trace_id, other.span_id))
+
+    def to_dict(self) -> dict:
+        exported = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1_000_000, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes
+        }
+        if self.links:
+            exported["links"] = [{"trace_id": trace_id, "span_id": span_id} for trace_id, span_id in self.links]
+        return exported
+
+
+# ============================================================================
+# span API
+# ============================================================================
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    current = _current_span.get()
+    return current.trace_id if current else None
+
+
+def start_span(name: str, new_trace: bool = False, **attributes):
+    """
+    span 시작 후 현재 span으로 설정. 현재 span이 없거나 new_trace=True면 새 trace를 시작
+
+    Returns:
+        (Span, token): end_span에 그대로 전달
+    """
+    parent = None if new_trace else _current_span.get()
+    trace_id = parent.trace_id if parent else secrets.token_hex(16)
+    started = Span(name, trace_id, parent.span_id if parent else None, attributes)
+    return started, _current_span.set(started)
+
+
+def end_span(started: Span, token, error: Optional[BaseException] = None):
+    """span 종료 (이전 span 복원 후 내보내기 큐에 추가)"""
+    if isinstance(error, asyncio.CancelledError):
+        started.status = "cancelled"
+    elif error is not None:
+        started.status = "error"
+        started.error = f"{type(error).__name__}: {str(error)[:200]}"
+    _current_span.reset(token)
+    started.end_ns = time.time_ns()
+    _export(started)
+
+
+@contextmanager
+def span(name: str, new_trace: bool = False, **attributes):
+    """
+    span 구간 (with 블록)
+
+    예외가 나면 status=error(취소는 cancelled)로 기록하고 예외는 그대로 전파합니다.
+    """
+    current, token = start_span(name, new_trace, **attributes)
+    try:
+        yield current
+    except BaseException as e:
+        end_span(current, token, e)
+        raise
+    end_span(current, token)
+
+
+def traced(name: Optional[str] = None):
+    """함수 전체를 span으로 감싸는 데코레이터 (동기/비동기 함수 모두 지원)"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def run_in_executor(func, *args, name: Optional[str] = None):
+    """
+    현재 trace 컨텍스트를 유지한 채 기본 스레드 풀에서 실행 (await 가능한 future 반환)
+
+    스레드 풀 대기 시간은 span의 queue_wait_ms 속성으로, 대기 중인 작업 수는
+    executor_queue_depth 게이지로 기록됩니다 (실행 시작 또는 대기 중 취소 시 감소).
+    """
+    context = contextvars.copy_context()
+    submitted = time.perf_counter()
+    span_name = f"executor:{name or getattr(func, '__name__', 'task')}"
+    dequeued = threading.Lock()
+
+    def leave_queue(*_):
+        # 실행 시작(워커 스레드)과 취소(이벤트 루프) 중 먼저 도달한 쪽만 감소
+        if dequeued.acquire(blocking=False):
+            metrics_service.add_gauge("executor_queue_depth", -1)
+
+    def run():
+        leave_queue()
+        with span(span_name, queue_wait_ms=round((time.perf_counter() - submitted) * 1000, 3)):
+            return func(*args)
+
+    metrics_service.add_gauge("executor_queue_depth", 1)
+    future = asyncio.get_running_loop().run_in_executor(None, context.run, run)
+    future.add_done_callback(leave_queue)
+    return future
+
+
+# ============================================================================
+# 내보내기 (백그라운드 스레드)
+# ============================================================================
+
+def _export(finished: Span):
+    if not TRACE_EXPORTER:
+        return
+    _ensure_export_thread()
+    try:
+        _export_queue.put_nowait(finished)
+    except queue.Full:
+        metrics_service.increment("trace_spans_dropped_total")
+
+
+def _ensure_export_thread():
+    global _export_thread
+    if _export_thread is not None:
+        return
+    with _export_lock:
+        if _export_thread is None:
+            _export_thread = threading.Thread(target=_export_loop, name="trace-exporter", daemon=True)
+            _export_thread.start()
+
+
+def _export_loop():
+    while True:
+        batch = []
+        flushed = None  # flush()가 넣은 완료 이벤트
+        item = _export_queue.get()
+        deadline = time.monotonic() + _EXPORT_INTERVAL_SECONDS
+        while True:
+            if isinstance(item, threading.Event):
+                flushed = item
+                break
+            batch.append(item)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= _EXPORT_BATCH_SIZE or remaining <= 0:
+                break
+            try:
+                item = _export_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+        if batch:
+            _export_batch(batch)
+        if flushed:
+            flushed.set()
+
+
+def _export_batch(batch):
+    try:
+        if TRACE_EXPORTER == "file":
+            _write_file(batch)
+        elif TRACE_EXPORTER == "otlp":
+            _post_otlp(batch)
+        metrics_service.increment("trace_spans_exported_total", len(batch), exporter=TRACE_EXPORTER)
+    except Exception as e:
+        metrics_service.increment("trace_export_errors_total", exporter=TRACE_EXPORTER)
+        logger.warning("트레이스 내보내기 실패", exporter=TRACE_EXPORTER, error=str(e))
+
+
+def _write_file(batch):
+    os.makedirs(os.path.dirname(TRACE_EXPORT_PATH), exist_ok=True)
+    with open(TRACE_EXPORT_PATH, "a", encoding="utf-8") as f:
+        for finished in batch:
+            f.write(json.dumps(finished.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _to_otlp_span(finished: Span) -> dict:
+    otlp_span = {
+        "traceId": finished.trace_id,
+        "spanId": finished.span_id,
+        "name": finished.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(finished.start_ns),
+        "endTimeUnixNano": str(finished.end_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in finished.attributes.items()],
+        "status": {"code": 2, "message": finished.error} if finished.status == "error" else {"code": 1}
+    }
+    if finished.parent_span_id:
+        otlp_span["parentSpanId"] = finished.parent_span_id
+    if finished.links:
+        otlp_span["links"] = [{"traceId": trace_id, "spanId": span_id} for trace_id, span_id in finished.links]
+    if finished.status == "cancelled":
+        otlp_span["attributes"].append({"key": "cancelled", "value": {"boolValue": True}})
+    return otlp_span
+
+
+def _post_otlp(batch):
+    body = {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{
+                "scope": {"name": "app.services.tracing_service"},
+                "spans": [_to_otlp_span(finished) for finished in batch]
+            }]
+        }]
+    }
+    request = urllib.request.Request(
+        OTLP_ENDPOINT,
+        data=json.dumps(body, default=str).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        response.read()
+
+
+def flush(timeout: float = 5.0):
+    """대기 중인 span을 모두 내보낼 때까지 대기 (서버 종료 시)"""
+    if not TRACE_EXPORTER or _export_thread is None:
+        return
+
+    done = threading.Event()
+    try:
+        _export_queue.put(done, timeout=timeout)
+    except queue.Full:
+        return
+    done.wait(timeout)
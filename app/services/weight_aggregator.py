@@ -0,0 +1,144 @@
+"""
+HAS_STEP 가중치 write-behind 집계기
+
+검색마다 관계 하나를 갱신하던 쿼리 대신, (domain, taskIntent)별 증가량을 메모리에 합산해 두었다가
+주기적으로(또는 키 수가 임계값을 넘으면) UNWIND 한 번으로 Neo4j에 반영합니다.
+
+- WEIGHT_FLUSH_INTERVAL_SECONDS: 플러시 주기 (기본 5초)
+- WEIGHT_FLUSH_MAX_KEYS: 이 수 이상의 키가 쌓이면 주기를 기다리지 않고 플러시 (기본 500)
+- WEIGHT_MAX_PENDING_KEYS: 메모리에 보관할 최대 키 수 (기본 10000, 초과분의 새 키는 버림)
+- 서버 종료 시 flush()로 남은 증가량을 반영
+- 반영 후 taskIntent 정확 일치 인덱스의 가중치도 DB 값으로 갱신 (정확 일치 정렬이 DB와 어긋나지 않도록)
+"""
+
+import os
+import time
+import threading
+from typing import Optional
+
+from app.services import neo4j_service, metrics_service, logging_service
+
+logger = logging_service.get_logger(__name__)
+
+FLUSH_INTERVAL_SECONDS = float(os.getenv("WEIGHT_FLUSH_INTERVAL_SECONDS", "5"))
+FLUSH_MAX_KEYS = int(os.getenv("WEIGHT_FLUSH_MAX_KEYS", "500"))
+MAX_PENDING_KEYS = int(os.getenv("WEIGHT_MAX_PENDING_KEYS", "10000"))
+
+# (domain, taskIntent) → 누적 증가량
+_pending = {}
+# 현재 _pending에서 가장 오래된 증가가 기록된 시각 (flush lag 계산용)
+_oldest_pending_at = None
+_lock = threading.Lock()
+# 플러시 쿼리가 동시에 두 번 실행되지 않도록 보장
+_flush_lock = threading.Lock()
+_flush_requested = threading.Event()
+_flush_thread = None
+
+metrics_service.register_gauge_callback("has_step_weight_pending_keys", lambda: len(_pending))
+
+
+def record(domain: Optional[str], task_intent: Optional[str], count: int = 1):
+    """가중치 증가 기록 (요청 경로에서는 메모리 합산만 수행)"""
+    global _oldest_pending_at
+
+    if not domain or not task_intent:
+        logger.warning("HAS_STEP 업데이트 건너뜀: domain 또는 taskIntent 누락")
+        return
+
+    key = (domain, task_intent)
+    with _lock:
+        if key not in _pending and len(_pending) >= MAX_PENDING_KEYS:
+            metrics_service.increment("has_step_weight_dropped_total")
+            _flush_requested.set()
+            return
+        _pending[key] = _pending.get(key, 0) + count
+        if _oldest_pending_at is None:
+            _oldest_pending_at = time.monotonic()
+        size = len(_pending)
+
+    _ensure_flush_thread()
+    if size >= FLUSH_MAX_KEYS:
+        _flush_requested.set()
+
+
+def record_search_hit(search_result: dict):
+    """검색 결과의 첫 번째 경로 가중치 +1"""
+    matched_paths = search_result.get("matched_paths") or []
+    if matched_paths:
+        top_path = matched_paths[0]
+        record(top_path.get("domain"), top_path.get("taskIntent"))
+
+
+def _ensure_flush_thread():
+    global _flush_thread
+    if _flush_thread is not None:
+        return
+    with _lock:
+        if _flush_thread is None:
+            _flush_thread = threading.Thread(target=_flush_loop, name="weight-flusher", daemon=True)
+            _flush_thread.start()
+
+
+def _flush_loop():
+    while True:
+        _flush_requested.wait(FLUSH_INTERVAL_SECONDS)
+        _flush_requested.clear()
+        flush()
+
+
+def flush() -> int:
+    """
+    누적된 증가량을 Neo4j에 반영 (플러시 스레드와 서버 종료 시 호출)
+
+    실패하면 증가량을 다시 누적하여 다음 플러시에서 재시도합니다.
+
+    Returns:
+        int: 반영한 (domain, taskIntent) 키 수
+    """
+    global _pending, _oldest_pending_at
+
+    with _flush_lock:
+        with _lock:
+            if not _pending:
+                return 0
+            batch, _pending = _pending, {}
+            oldest, _oldest_pending_at = _oldest_pending_at, None
+
+        if not neo4j_service.graph:
+            logger.warning("Neo4j graph 연결 없음: HAS_STEP 업데이트 건너뜀", keys=len(batch))
+            return 0
+
+        increments = [
+            {"domain": domain, "taskIntent": task_intent, "count": count}
+            for (domain, task_intent), count in batch.items()
+        ]
+        try:
+            updated_rows = neo4j_service.increment_has_step_weights(increments)
+        except Exception as e:
+            metrics_service.increment("has_step_weight_flush_errors_total")
+            logger.error("HAS_STEP weight 일괄 증가 실패", keys=len(batch), error=str(e))
+            _requeue(batch, oldest)
+            return 0
+
+        for row in updated_rows:
+            neo4j_service.update_intent_index(row["domain"], row["taskIntent"], row["stepId"], row["weight"])
+
+        metrics_service.increment("has_step_weight_flushes_total")
+        metrics_service.increment("has_step_weight_increments_total", sum(batch.values()))
+        metrics_service.observe("has_step_weight_flush_lag_ms", (time.monotonic() - oldest) * 1000)
+        logger.debug("HAS_STEP 가중치 일괄 증가", keys=len(batch), updated=len(updated_rows))
+        return len(batch)
+
+
+def _requeue(batch: dict, oldest: float):
+    """실패한 배치를 다시 누적 (상한을 넘는 새 키는 버림)"""
+    global _oldest_pending_at
+
+    with _lock:
+        for key, count in batch.items():
+            if key not in _pending and len(_pending) >= MAX_PENDING_KEYS:
+                metrics_service.increment("has_step_weight_dropped_total")
+                continue
+            _pending[key] = _pending.get(key, 0) + count
+        if _pending:
+            _oldest_pending_at = min(oldest, _oldest_pending_at or oldest)
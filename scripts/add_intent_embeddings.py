@@ -20,11 +20,15 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 try:
     from langchain_neo4j import Neo4jGraph
     from app.services.embedding_service import generate_embedding
+    from app.services import rate_limit_service
 except ImportError as e:
     print(f"필요한 라이브러리를 import하는 데 실패했습니다: {e}")
     print("가상 환경이 활성화되었는지, requirements.txt의 모든 패키지가 설치되었는지 확인하세요.")
     sys.exit(1)
 
+# 재임베딩 작업이므로 bulk 레인 사용 (서버 검색 요청이 먼저 처리됨)
+rate_limit_service.set_priority("bulk")
+
 # 환경변수 로드
 load_dotenv(find_dotenv())
 
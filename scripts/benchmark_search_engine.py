@@ -0,0 +1,169 @@
+"""
+검색 엔진 프레임워크 오버헤드 벤치마크 - 직접 파이프라인 vs LangGraph workflow.ainvoke
+
+임베딩/Neo4j/LLM 호출을 즉시 반환하는 고정 응답으로 대체하여
+순수하게 실행 엔진(LangGraph 런타임, 상태 복사, 태스크 스케줄링)의 비용만 측정합니다.
+서비스 모듈은 import 시 .env를 다시 읽으므로, 환경변수가 아니라 import 후 호출 지점을 직접 교체하고
+대체되지 않은 Neo4j 쿼리는 오류로 막습니다 (외부 호출 없음).
+
+측정 시나리오:
+- high_similarity: 벡터 검색 결과가 임계값 이상 (rank_existing_paths)
+- low_similarity:  임계값 미만 → 키워드 Agent 재탐색
+
+사용법:
+    python scripts/benchmark_search_engine.py [반복 횟수(기본 2000)]
+"""
+
+import io
+import os
+import sys
+import time
+import asyncio
+import statistics
+from contextlib import redirect_stdout
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 서비스 로그는 측정에서 제외
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+try:
+    from app.services import langgraph_service, neo4j_service, embedding_service, intent_cache, intent_classifier
+except ImportError as e:
+    print(f"필요한 라이브러리를 import하는 데 실패했습니다: {e}")
+    print("가상 환경이 활성화되었는지, requirements.txt의 모든 패키지가 설치되었는지 확인하세요.")
+    sys.exit(1)
+
+FAKE_EMBEDDING = [0.01] * 1536
+FAKE_STEPS = [{"order": i, "url": "https://example.com", "action": "click"} for i in range(5)]
+
+
+def _fake_result(query: str, relevance: float) -> dict:
+    return {
+        "query": query,
+        "total_matched": 3,
+        "matched_paths": [
+            {"domain": "example.com", "taskIntent": f"작업 {i}", "relevance_score": relevance - i * 0.01,
+             "weight": 1, "steps": list(FAKE_STEPS)}
+            for i in range(3)
+        ],
+        "performance": {"search_time": 0}
+    }
+
+
+FAKE_INTENT = {
+    "intent_type": "information_seeking",
+    "domain_preference": None,
+    "complexity": "simple",
+    "confidence": 0.9,
+    "reasoning": "벤치마크 고정 응답",
+    "keywords": ["벤치마크", "쿼리"]
+}
+
+
+class _FakeEmbeddingClient:
+    """OpenAI 클라이언트 대체 (embeddings.create만 지원)"""
+
+    def __init__(self):
+        self.embeddings = self
+
+    def create(self, model, input):
+        texts = input if isinstance(input, list) else [input]
+        data = [type("Embedding", (), {"index": i, "embedding": FAKE_EMBEDDING})() for i in range(len(texts))]
+        return type("EmbeddingResponse", (), {"data": data, "usage": None})()
+
+
+class _NoExternalGraph:
+    """대체되지 않은 Neo4j 쿼리 차단"""
+
+    def query(self, query, params=None):
+        raise RuntimeError("벤치마크 중 실제 Neo4j 쿼리 시도")
+
+
+async def _fake_intent_llm(query: str, timeout: float = langgraph_service.INTENT_LLM_TIMEOUT) -> dict:
+    return dict(FAKE_INTENT, keywords=list(FAKE_INTENT["keywords"]))
+
+
+def install_stubs(relevance: float):
+    """외부 의존 호출을 고정 응답으로 대체 (.env의 API 키/Neo4j 설정과 무관)"""
+    # OpenAI 임베딩 / LLM
+    embedding_service.get_openai_client = lambda: _FakeEmbeddingClient()
+    langgraph_service.get_openai_client = embedding_service.get_openai_client
+    langgraph_service.generate_embedding = lambda text: FAKE_EMBEDDING
+    langgraph_service.generate_embeddings = lambda texts: [FAKE_EMBEDDING for _ in texts]
+    neo4j_service.generate_embedding = langgraph_service.generate_embedding
+    langgraph_service.call_intent_llm = _fake_intent_llm
+    # 고정 LLM 경로를 항상 측정하도록 키 존재만 맞춤 (실제 호출은 위에서 대체됨)
+    os.environ["OPENAI_API_KEY"] = "benchmark-stub"
+
+    # 의도 캐시/로컬 분류기/학습 로그 (디스크 I/O 제외, 매 반복 LLM 경로)
+    intent_cache.peek = lambda query, version: None
+    intent_cache.lookup = lambda query, version: None
+    intent_cache.store = lambda *args, **kwargs: None
+    intent_classifier.classify_intent = lambda query, query_embedding, model=None: None
+    intent_classifier.log_llm_intent = lambda *args, **kwargs: None
+
+    # Neo4j
+    neo4j_service.graph = _NoExternalGraph()
+    neo4j_service.search_paths_by_embedding = (
+        lambda query_text, query_embedding, limit=3, domain_hint=None, hydrate=True: _fake_result(query_text, relevance)
+    )
+    neo4j_service.search_paths_by_embeddings = (
+        lambda query_texts, query_embeddings, limit_per_query=1, domain_hint=None: _fake_result("|".join(query_texts), relevance)
+    )
+    neo4j_service.search_paths_by_query = (
+        lambda query_text, limit=3, domain_hint=None, query_embedding=None: _fake_result(query_text, relevance)
+    )
+
+
+async def _measure(run, iterations: int) -> list:
+    # 노드 로그 출력은 측정에서 제외
+    with redirect_stdout(io.StringIO()):
+        # 워밍업
+        for _ in range(min(50, iterations)):
+            await run()
+
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await run()
+            samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def _summary(samples: list) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return f"mean {statistics.mean(samples):8.1f}µs  p50 {statistics.median(samples):8.1f}µs  p95 {p95:8.1f}µs"
+
+
+async def run_benchmark(iterations: int):
+    with redirect_stdout(io.StringIO()):
+        workflow = langgraph_service.get_or_build_workflow()
+
+    for scenario, relevance in (("high_similarity", 0.9), ("low_similarity", 0.2)):
+        install_stubs(relevance)
+
+        async def run_direct():
+            state = langgraph_service.build_initial_state("벤치마크 쿼리", 3, None)
+            return await langgraph_service.search_fast_path(state)
+
+        async def run_graph():
+            state = langgraph_service.build_initial_state("벤치마크 쿼리", 3, None)
+            return await workflow.ainvoke(state)
+
+        direct = await _measure(run_direct, iterations)
+        graph = await _measure(run_graph, iterations)
+
+        print(f"\n[{scenario}] {iterations}회")
+        print(f"  direct    {_summary(direct)}")
+        print(f"  langgraph {_summary(graph)}")
+        print(f"  절약 (mean): {statistics.mean(graph) - statistics.mean(direct):.1f}µs / 요청")
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    print("=== 검색 엔진 프레임워크 오버헤드 벤치마크 ===")
+    asyncio.run(run_benchmark(iterations))
@@ -30,6 +30,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from langchain_neo4j import Neo4jGraph
 from app.services.embedding_service import generate_embedding
+from app.services import rate_limit_service
+
+# 마이그레이션 임베딩은 bulk 우선순위로 실행
+rate_limit_service.set_priority("bulk")
 
 # 환경변수 로드
 load_dotenv(find_dotenv())
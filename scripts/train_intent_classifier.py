@@ -0,0 +1,203 @@
+"""
+로컬 의도 분류기 학습/내보내기/리포트 스크립트
+
+명령:
+- export: LLM 의도 분석 로그 + Neo4j HAS_STEP taskIntent를 학습 데이터(JSONL)로 내보내기
+- train:  학습 데이터로 분류기를 학습하고 INTENT_CLASSIFIER_PATH에 저장
+- report: 홀드아웃(5개 중 1개) 기준 정확도와 신뢰도 임계값별 커버리지, 로컬 vs LLM 지연시간 비교
+
+LLM 의도 분석 로그는 서버를 INTENT_LOG_ENABLED=1로 실행한 동안에만 기록됩니다 (정규화된 쿼리만 저장).
+
+사용법:
+    python scripts/train_intent_classifier.py export
+    python scripts/train_intent_classifier.py train
+    python scripts/train_intent_classifier.py report
+"""
+
+import os
+import sys
+import json
+import time
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import numpy as np
+    from app.services import intent_classifier, rate_limit_service
+    from app.services.embedding_service import generate_embeddings
+except ImportError as e:
+    print(f"필요한 라이브러리를 import하는 데 실패했습니다: {e}")
+    print("가상 환경이 활성화되었는지, requirements.txt의 모든 패키지가 설치되었는지 확인하세요.")
+    sys.exit(1)
+
+# 학습 데이터 임베딩은 bulk 레인 사용 (검색 요청용 OpenAI 한도 일부를 남겨 둠)
+rate_limit_service.set_priority("bulk")
+
+TRAINING_DATA_PATH = os.getenv(
+    "INTENT_TRAINING_DATA_PATH",
+    os.path.join(os.path.dirname(intent_classifier.CLASSIFIER_PATH), "intent_training.jsonl")
+)
+EMBEDDING_BATCH_SIZE = 100
+CONFIDENCE_LEVELS = [0.5, 0.6, 0.7, 0.8, 0.9]
+
+
+def _load_taskintent_samples():
+    """Neo4j에 저장된 HAS_STEP taskIntent를 학습 샘플로 변환 (저장된 intentEmbedding 재사용)"""
+    from app.services import neo4j_service
+
+    if not neo4j_service.graph:
+        print("⚠️ Neo4j 연결 없음: taskIntent 샘플 생략")
+        return []
+
+    rows = neo4j_service.graph.query("""
+        MATCH (r:ROOT)-[rel:HAS_STEP]->(:STEP)
+        WHERE rel.taskIntent IS NOT NULL AND rel.intentEmbedding IS NOT NULL
+        RETURN DISTINCT r.domain AS domain,
+               rel.taskIntent AS taskIntent,
+               rel.intentEmbedding AS intentEmbedding
+    """)
+
+    return [{
+        "query": row["taskIntent"],
+        "embedding": row["intentEmbedding"],
+        "intent_type": "task_completion",
+        "domain_preference": row["domain"],
+        "keywords": [],
+        "source": "taskIntent"
+    } for row in rows]
+
+
+def export_training_data():
+    """학습 데이터를 JSONL로 내보내기"""
+    print("=== 학습 데이터 내보내기 ===\n")
+
+    log_records = intent_classifier.read_llm_intent_log()
+    print(f"1️⃣ LLM 의도 분석 로그: {len(log_records)}개")
+
+    # 같은 쿼리는 최신 로그만 사용
+    latest_by_query = {}
+    for record in log_records:
+        if record.get("query") and record.get("intent_type"):
+            latest_by_query[record["query"]] = record
+    log_records = list(latest_by_query.values())
+
+    queries = [record["query"] for record in log_records]
+    embeddings = []
+    for i in range(0, len(queries), EMBEDDING_BATCH_SIZE):
+        embeddings.extend(generate_embeddings(queries[i:i + EMBEDDING_BATCH_SIZE]))
+
+    samples = []
+    for record, embedding in zip(log_records, embeddings):
+        if embedding:
+            samples.append({**record, "embedding": embedding, "source": "llm_log"})
+    print(f"   - 임베딩 완료: {len(samples)}개")
+
+    taskintent_samples = _load_taskintent_samples()
+    print(f"2️⃣ taskIntent 샘플: {len(taskintent_samples)}개")
+    samples.extend(taskintent_samples)
+
+    os.makedirs(os.path.dirname(TRAINING_DATA_PATH), exist_ok=True)
+    with open(TRAINING_DATA_PATH, "w", encoding="utf-8") as f:
+        for sample in samples:
+            f.write(json.dumps(sample, ensure_ascii=False) + "\n")
+
+    print(f"\n✓ {len(samples)}개 샘플 저장: {TRAINING_DATA_PATH}\n")
+    return samples
+
+
+def _read_training_data():
+    if not os.path.exists(TRAINING_DATA_PATH):
+        return export_training_data()
+
+    with open(TRAINING_DATA_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def train():
+    """분류기 학습 및 저장"""
+    samples = _read_training_data()
+    try:
+        model = intent_classifier.train_classifier(samples)
+    except ValueError as e:
+        # 클래스가 하나뿐인 모델은 모든 쿼리에 신뢰도 1.0을 내므로 저장하지 않음
+        print(f"❌ 학습 실패: {e}")
+        sys.exit(1)
+    intent_classifier.save_classifier(model)
+
+    print("=== 학습 완료 ===\n")
+    print(f"✓ 샘플 수: {model['sample_count']}")
+    print(f"✓ 의도 유형: {', '.join(model['intent_centroids'].keys())}")
+    print(f"✓ 도메인 클래스: {len(model['domain_centroids'])}개")
+    print(f"✓ 키워드 어휘: {len(model['keyword_vocabulary'])}개")
+    print(f"✓ 저장 위치: {intent_classifier.CLASSIFIER_PATH}\n")
+
+
+def _percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def report():
+    """홀드아웃 정확도 vs 지연시간 리포트"""
+    samples = [s for s in _read_training_data() if s.get("embedding") and s.get("intent_type")]
+    if len(samples) < 5:
+        print("리포트를 만들기에 샘플이 부족합니다 (최소 5개).")
+        return
+
+    train_set = [s for i, s in enumerate(samples) if i % 5 != 0]
+    holdout = [s for i, s in enumerate(samples) if i % 5 == 0]
+    try:
+        model = intent_classifier.prepare_model(intent_classifier.train_classifier(train_set))
+    except ValueError as e:
+        print(f"리포트를 만들 수 없습니다: {e}")
+        return
+
+    predictions = []
+    local_latencies = []
+    for sample in holdout:
+        start = time.perf_counter()
+        result = intent_classifier.classify_intent(sample["query"], sample["embedding"], model=model)
+        local_latencies.append((time.perf_counter() - start) * 1000)
+        predictions.append((sample, result))
+
+    def is_correct(sample, result):
+        return (result["intent_type"] == sample["intent_type"]
+                and result["domain_preference"] == sample.get("domain_preference"))
+
+    print("=== 로컬 의도 분류기 리포트 ===\n")
+    print(f"학습 {len(train_set)}개 / 홀드아웃 {len(holdout)}개\n")
+
+    intent_acc = sum(r["intent_type"] == s["intent_type"] for s, r in predictions) / len(predictions)
+    domain_acc = sum(r["domain_preference"] == s.get("domain_preference") for s, r in predictions) / len(predictions)
+    print(f"intent_type 정확도:        {intent_acc:.1%}")
+    print(f"domain_preference 정확도:  {domain_acc:.1%}\n")
+
+    print("신뢰도 임계값별 (로컬 처리 비율 / 처리분 정확도):")
+    for level in CONFIDENCE_LEVELS:
+        covered = [(s, r) for s, r in predictions if r["confidence"] >= level]
+        coverage = len(covered) / len(predictions)
+        accuracy = (sum(is_correct(s, r) for s, r in covered) / len(covered)) if covered else 0.0
+        marker = "  ← 현재 설정" if level == intent_classifier.LOCAL_CONFIDENCE_THRESHOLD else ""
+        print(f"  >= {level:.1f}: {coverage:6.1%} / {accuracy:6.1%}{marker}")
+
+    llm_latencies = [r["latency_ms"] for r in intent_classifier.read_llm_intent_log() if r.get("latency_ms")]
+    print("\n지연시간 (ms):")
+    print(f"  로컬 분류기  mean {np.mean(local_latencies):8.2f}  p95 {_percentile(local_latencies, 95):8.2f}")
+    if llm_latencies:
+        print(f"  LLM (로그)   mean {np.mean(llm_latencies):8.2f}  p95 {_percentile(llm_latencies, 95):8.2f}")
+    else:
+        print("  LLM (로그)   기록 없음")
+    print()
+
+
+if __name__ == "__main__":
+    commands = {"export": export_training_data, "train": train, "report": report}
+
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print("사용법:")
+        print("  python scripts/train_intent_classifier.py export  # 학습 데이터 내보내기")
+        print("  python scripts/train_intent_classifier.py train   # 분류기 학습 및 저장")
+        print("  python scripts/train_intent_classifier.py report  # 정확도 vs 지연시간 리포트")
+        sys.exit(1)
+
+    commands[sys.argv[1]]()
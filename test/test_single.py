@@ -50,7 +50,13 @@ async def run_all_tests():
             "limit": 5
         }),
         ("save_path", MINIMAL_TEST_CASE),
-        ("save_path", TEST_CASE_1)
+        ("save_path", TEST_CASE_1),
+        ("search_batch", {
+            "requests": [
+                {"query": "네이버 날씨 보여줘", "limit": 3},
+                {"query": "SRT 예매", "limit": 2}
+            ]
+        })
     ]
     
     results = []
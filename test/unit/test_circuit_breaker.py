@@ -0,0 +1,133 @@
+"""circuit_breaker 단위 테스트 - closed → open → half_open → closed/open 상태 전이"""
+
+import pytest
+
+from app.services import circuit_breaker
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+@pytest.fixture(autouse=True)
+def breaker_settings(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(circuit_breaker, "HALF_OPEN_AFTER_SECONDS", 60.0)
+
+
+def _open(breaker: CircuitBreaker):
+    for _ in range(circuit_breaker.FAILURE_THRESHOLD):
+        breaker.record_failure(ConnectionError("down"))
+    assert breaker.state == OPEN
+
+
+def _cooldown_elapsed(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "HALF_OPEN_AFTER_SECONDS", 0.0)
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test")
+
+    breaker.record_failure(ConnectionError("down"))
+    assert breaker.state == CLOSED
+    breaker.check()
+
+    breaker.record_failure(ConnectionError("down"))
+    assert breaker.state == OPEN
+    assert breaker.is_open()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("test")
+
+    breaker.record_failure(ConnectionError("down"))
+    breaker.record_success()
+    breaker.record_failure(ConnectionError("down"))
+
+    assert breaker.state == CLOSED
+
+
+def test_ignores_errors_that_are_not_dependency_failures():
+    breaker = CircuitBreaker("test", is_failure=lambda error: not isinstance(error, ValueError))
+
+    for _ in range(5):
+        breaker.record_failure(ValueError("bad request"))
+
+    assert breaker.state == CLOSED
+
+
+def test_lets_one_trial_through_after_cooldown(monkeypatch):
+    breaker = CircuitBreaker("test")
+    _open(breaker)
+    _cooldown_elapsed(monkeypatch)
+
+    assert not breaker.is_open()
+    breaker.check()
+    assert breaker.state == HALF_OPEN
+
+    # 시험 호출이 진행 중이면 다른 요청은 거절
+    monkeypatch.setattr(circuit_breaker, "HALF_OPEN_AFTER_SECONDS", 60.0)
+    assert breaker.is_open()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_trial_success_closes(monkeypatch):
+    breaker = CircuitBreaker("test")
+    _open(breaker)
+    _cooldown_elapsed(monkeypatch)
+    breaker.check()
+
+    breaker.record_success()
+
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_failures == 0
+    breaker.check()
+
+
+def test_trial_failure_reopens(monkeypatch):
+    breaker = CircuitBreaker("test")
+    _open(breaker)
+    _cooldown_elapsed(monkeypatch)
+    breaker.check()
+
+    monkeypatch.setattr(circuit_breaker, "HALF_OPEN_AFTER_SECONDS", 60.0)
+    breaker.record_failure(ConnectionError("still down"))
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_stuck_trial_is_retried_after_cooldown(monkeypatch):
+    breaker = CircuitBreaker("test")
+    _open(breaker)
+    _cooldown_elapsed(monkeypatch)
+    breaker.check()
+    assert breaker.state == HALF_OPEN
+
+    # 시험 호출이 결과 없이 끝남(취소 등): 쿨다운이 지나면 다음 요청이 다시 시험 호출
+    breaker.check()
+    assert breaker.state == HALF_OPEN
+
+
+def test_probe_success_closes_open_circuit():
+    breaker = CircuitBreaker("test")
+    _open(breaker)
+
+    breaker.set_probe(lambda: None)
+
+    assert breaker.probe()
+    assert breaker.state == CLOSED
+
+
+def test_probe_failure_keeps_circuit_open():
+    breaker = CircuitBreaker("test")
+    _open(breaker)
+
+    def failing_probe():
+        raise ConnectionError("down")
+
+    breaker.set_probe(failing_probe)
+
+    assert not breaker.probe()
+    assert breaker.state == OPEN
@@ -0,0 +1,105 @@
+"""encoding_service 단위 테스트 - json/orjson/msgpack 인코더, 필드 추가, 연결 협상"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from app.services import encoding_service
+
+RESPONSE = {
+    "type": "search_path_result",
+    "status": "success",
+    "data": {
+        # 사용자 입력에 이전 자리표시자나 필드 이름이 섞여 있어도 본문은 그대로
+        "query": 'serialization_ms "__serialization_ms__" }',
+        "matched_paths": [{"domain": "naver.com", "relevance_score": 0.92, "steps": []}],
+        "performance": {"stages": {"embedding": 0.4}}
+    },
+    "trace_id": "8a27c8d6ecb5a564d5241dc6f168ebb0"
+}
+
+
+def _decode(encoder, payload):
+    if encoder.binary:
+        msgpack = pytest.importorskip("msgpack")
+        return msgpack.unpackb(payload)
+    return json.loads(payload)
+
+
+@pytest.fixture(params=["json", "orjson", "msgpack"])
+def encoder(request):
+    pytest.importorskip(request.param)
+    return encoding_service.get_encoder(request.param)
+
+
+def test_round_trips_response(encoder):
+    assert _decode(encoder, encoder.encode(RESPONSE)) == RESPONSE
+
+
+def test_encodes_datetime_as_iso_string(encoder):
+    created = datetime(2025, 1, 2, 3, 4, 5)
+
+    decoded = _decode(encoder, encoder.encode({"created_at": created}))
+
+    assert decoded == {"created_at": "2025-01-02T03:04:05"}
+
+
+def test_append_field_adds_top_level_field_without_touching_body(encoder):
+    payload = encoder.append_field(encoder.encode(RESPONSE), "serialization_ms", 1.5)
+
+    assert _decode(encoder, payload) == {**RESPONSE, "serialization_ms": 1.5}
+
+
+def test_append_field_to_empty_object(encoder):
+    payload = encoder.append_field(encoder.encode({}), "serialization_ms", 0.3)
+
+    assert _decode(encoder, payload) == {"serialization_ms": 0.3}
+
+
+@pytest.mark.parametrize("size", [15, 0xFFFF])
+def test_msgpack_append_field_grows_map_header(size):
+    pytest.importorskip("msgpack")
+    encoder = encoding_service.get_encoder("msgpack")
+    obj = {str(i): i for i in range(size)}
+
+    payload = encoder.append_field(encoder.encode(obj), "serialization_ms", 2.0)
+
+    assert _decode(encoder, payload) == {**obj, "serialization_ms": 2.0}
+
+
+def test_append_field_rejects_non_object_payload(encoder):
+    with pytest.raises(ValueError):
+        encoder.append_field(encoder.encode([1, 2, 3]), "serialization_ms", 1.0)
+
+
+def test_payload_size_counts_utf8_bytes():
+    encoder = encoding_service.get_encoder("json")
+
+    assert encoder.size(encoder.encode({"q": "날씨"})) == len('{"q": "날씨"}'.encode("utf-8"))
+
+
+def test_unknown_encoding_falls_back_to_json():
+    assert encoding_service.get_encoder("yaml").name == "json"
+    assert encoding_service.get_encoder(None).name == "json"
+
+
+def test_negotiate_prefers_query_parameter():
+    encoder, subprotocol = encoding_service.negotiate("json", ["vowser.json"])
+
+    assert encoder.name == "json"
+    assert subprotocol is None
+
+
+def test_negotiate_accepts_first_available_subprotocol():
+    encoder, subprotocol = encoding_service.negotiate(None, ["other", "vowser.unknown", "vowser.json"])
+
+    assert encoder.name == "json"
+    assert subprotocol == "vowser.json"
+
+
+def test_negotiate_defaults_to_json():
+    encoder, subprotocol = encoding_service.negotiate(None, None)
+
+    assert encoder.name == encoding_service.DEFAULT_ENCODING
+    assert subprotocol is None
@@ -0,0 +1,66 @@
+"""SearchPathRequest.query_embedding (base64 float32 little-endian) 검증 단위 테스트"""
+
+import base64
+import struct
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.path import QUERY_EMBEDDING_DIMENSIONS, QUERY_EMBEDDING_MODEL, SearchBatchRequest, SearchPathRequest
+
+
+def _encode(values) -> str:
+    return base64.b64encode(struct.pack(f"<{len(values)}f", *values)).decode("ascii")
+
+
+def _vector():
+    return [(i % 7) / 8 - 0.375 for i in range(QUERY_EMBEDDING_DIMENSIONS)]
+
+
+def test_decodes_valid_embedding():
+    vector = _vector()
+
+    request = SearchPathRequest(query="네이버 날씨", query_embedding=_encode(vector), embedding_model=QUERY_EMBEDDING_MODEL)
+
+    # 1/8 단위 값은 float32로 정확히 표현되므로 그대로 복원
+    assert request.decoded_query_embedding() == vector
+
+
+def test_without_embedding_decodes_to_none():
+    request = SearchPathRequest(query="네이버 날씨")
+
+    assert request.decoded_query_embedding() is None
+
+
+@pytest.mark.parametrize("embedding_model", [None, "text-embedding-3-large"])
+def test_rejects_missing_or_other_model(embedding_model):
+    with pytest.raises(ValidationError, match="embedding_model"):
+        SearchPathRequest(query="네이버 날씨", query_embedding=_encode(_vector()), embedding_model=embedding_model)
+
+
+def test_rejects_invalid_base64():
+    with pytest.raises(ValidationError, match="base64"):
+        SearchPathRequest(query="네이버 날씨", query_embedding="not base64!!", embedding_model=QUERY_EMBEDDING_MODEL)
+
+
+@pytest.mark.parametrize("dimensions", [0, 3, QUERY_EMBEDDING_DIMENSIONS - 1, QUERY_EMBEDDING_DIMENSIONS + 1])
+def test_rejects_wrong_dimensions(dimensions):
+    with pytest.raises(ValidationError, match="차원"):
+        SearchPathRequest(query="네이버 날씨", query_embedding=_encode([0.5] * dimensions), embedding_model=QUERY_EMBEDDING_MODEL)
+
+
+@pytest.mark.parametrize("bad_value", [float("nan"), float("inf")])
+def test_rejects_non_finite_values(bad_value):
+    vector = _vector()
+    vector[10] = bad_value
+
+    with pytest.raises(ValidationError, match="NaN/Inf"):
+        SearchPathRequest(query="네이버 날씨", query_embedding=_encode(vector), embedding_model=QUERY_EMBEDDING_MODEL)
+
+
+def test_batch_request_validates_each_item():
+    with pytest.raises(ValidationError):
+        SearchBatchRequest(requests=[
+            {"query": "네이버 날씨"},
+            {"query": "유튜브 음악", "query_embedding": "AAAA", "embedding_model": QUERY_EMBEDDING_MODEL}
+        ])
@@ -0,0 +1,196 @@
+"""rate_limit_service 단위 테스트 - 토큰 버킷과 재시도 스케줄러"""
+
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+
+from app.services import rate_limit_service
+from app.services.rate_limit_service import RateLimitExceeded, TokenBucketLimiter
+
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+
+
+def _connection_error():
+    return openai.APIConnectionError(request=_REQUEST)
+
+
+def _rate_limit_error(retry_after: str):
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=_REQUEST)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    """재시도 대기를 짧게, 모델별 버킷은 테스트마다 새로"""
+    monkeypatch.setattr(rate_limit_service, "RETRY_BASE_MS", 1)
+    monkeypatch.setattr(rate_limit_service, "RETRY_MAX_MS", 5)
+    monkeypatch.setattr(rate_limit_service, "MAX_RETRIES", 3)
+    monkeypatch.setattr(rate_limit_service, "_limiters", {})
+
+
+@pytest.fixture
+def deadline():
+    """현재 컨텍스트에 마감 시각 설정 (테스트 끝나면 복원)"""
+    tokens = []
+
+    def set_deadline(seconds: float):
+        tokens.append(rate_limit_service.set_deadline(time.monotonic() + seconds))
+
+    yield set_deadline
+    for token in reversed(tokens):
+        rate_limit_service.reset_deadline(token)
+
+
+# ============================================================================
+# 토큰 버킷
+# ============================================================================
+
+def test_bucket_limits_requests_per_minute():
+    limiter = TokenBucketLimiter("test-model", rpm=2, tpm=1000)
+
+    assert limiter.try_acquire(1, "interactive")
+    assert limiter.try_acquire(1, "interactive")
+    assert not limiter.try_acquire(1, "interactive")
+
+
+def test_bucket_limits_tokens_per_minute():
+    limiter = TokenBucketLimiter("test-model", rpm=100, tpm=100)
+
+    assert limiter.try_acquire(60, "interactive")
+    assert not limiter.try_acquire(60, "interactive")
+    assert limiter.try_acquire(40, "interactive")
+
+
+def test_request_larger_than_bucket_waits_only_for_capacity():
+    limiter = TokenBucketLimiter("test-model", rpm=100, tpm=100)
+
+    # 용량보다 큰 요청은 용량만큼만 차감 (영원히 대기하지 않음)
+    assert limiter.try_acquire(500, "interactive")
+    assert not limiter.try_acquire(1, "interactive")
+
+
+def test_bulk_priority_leaves_reserve_for_interactive(monkeypatch):
+    monkeypatch.setattr(rate_limit_service, "BULK_RESERVE", 0.5)
+    limiter = TokenBucketLimiter("test-model", rpm=4, tpm=1000)
+
+    assert limiter.try_acquire(1, "bulk")
+    assert limiter.try_acquire(1, "bulk")
+    assert not limiter.try_acquire(1, "bulk")
+    assert limiter.try_acquire(1, "interactive")
+    assert limiter.try_acquire(1, "interactive")
+
+
+def test_settle_returns_overestimated_tokens():
+    limiter = TokenBucketLimiter("test-model", rpm=100, tpm=100)
+
+    assert limiter.try_acquire(80, "interactive")
+    limiter.settle(estimated_tokens=80, actual_tokens=10)
+    assert limiter.try_acquire(80, "interactive")
+
+
+def test_block_pauses_all_calls():
+    limiter = TokenBucketLimiter("test-model", rpm=100, tpm=1000)
+
+    limiter.block(60)
+    assert not limiter.try_acquire(1, "interactive")
+
+
+def test_acquire_gives_up_when_wait_exceeds_deadline(deadline):
+    limiter = TokenBucketLimiter("test-model", rpm=1, tpm=1000)
+    assert limiter.try_acquire(1, "interactive")
+
+    deadline(0.05)
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire(1, "interactive")
+
+
+def test_acquire_async_waits_for_refill():
+    # 분당 6000회 = 1ms마다 1회 충전
+    limiter = TokenBucketLimiter("test-model", rpm=6000, tpm=1_000_000)
+    while limiter.try_acquire(1, "interactive"):
+        pass
+
+    asyncio.run(asyncio.wait_for(limiter.acquire_async(1, "interactive"), timeout=1))
+
+
+# ============================================================================
+# 재시도 스케줄러
+# ============================================================================
+
+def test_call_with_retry_retries_transient_errors():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _connection_error()
+        return "ok"
+
+    assert rate_limit_service.call_with_retry(flaky, "test-model", 10) == "ok"
+    assert len(calls) == 3
+
+
+def test_call_with_retry_does_not_retry_other_errors():
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        rate_limit_service.call_with_retry(broken, "test-model", 10)
+    assert len(calls) == 1
+
+
+def test_call_with_retry_raises_last_error_after_max_retries():
+    calls = []
+
+    def always_failing():
+        calls.append(1)
+        raise _connection_error()
+
+    with pytest.raises(openai.APIConnectionError):
+        rate_limit_service.call_with_retry(always_failing, "test-model", 10)
+    assert len(calls) == rate_limit_service.MAX_RETRIES + 1
+
+
+def test_retry_after_beyond_deadline_is_not_retried(deadline):
+    calls = []
+
+    def rate_limited():
+        calls.append(1)
+        raise _rate_limit_error("5")
+
+    deadline(0.5)
+    with pytest.raises(openai.RateLimitError):
+        rate_limit_service.call_with_retry(rate_limited, "test-model", 10)
+    assert len(calls) == 1
+
+
+def test_rate_limit_error_blocks_model_for_retry_after():
+    calls = []
+
+    def rate_limited_once():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise _rate_limit_error("0.05")
+        return "ok"
+
+    assert rate_limit_service.call_with_retry(rate_limited_once, "test-model", 10) == "ok"
+    assert calls[1] - calls[0] >= 0.05
+
+
+def test_acall_with_retry_retries_transient_errors():
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 2:
+            raise _connection_error()
+        return "ok"
+
+    assert asyncio.run(rate_limit_service.acall_with_retry(flaky, "test-model", 10)) == "ok"
+    assert len(calls) == 2
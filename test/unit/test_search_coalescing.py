@@ -0,0 +1,188 @@
+"""search_with_langgraph 동일 검색 병합(single-flight) 단위 테스트 - _search_once를 가짜로 교체"""
+
+import asyncio
+
+import pytest
+
+from app.services import langgraph_service
+
+
+class FakeSearch:
+    """_search_once 대체 (호출 기록, release() 전까지 대기, cut_short는 첫 호출 결과에만 표시)"""
+
+    def __init__(self, cut_short=None):
+        self.calls = []
+        self.cut_short = cut_short or []
+        self.released = None
+
+    def release(self):
+        self.released.set()
+
+    async def __call__(self, query, limit, domain_hint, deadline_ms, query_embedding, hydrate):
+        if self.released is None:
+            self.released = asyncio.Event()
+        self.calls.append({"query": query, "deadline_ms": deadline_ms, "query_embedding": query_embedding})
+        await self.released.wait()
+        return {
+            "query": query,
+            "total_matched": 1,
+            "matched_paths": [{"domain": "naver.com", "taskIntent": "날씨 보기", "steps": []}],
+            "performance": {
+                "cut_short": self.cut_short if len(self.calls) == 1 else [],
+                "stages": {"embedding": 1.0}
+            }
+        }
+
+
+@pytest.fixture
+def fake_search(monkeypatch):
+    monkeypatch.setattr(langgraph_service, "COALESCING_ENABLED", True)
+    monkeypatch.setattr(langgraph_service, "_inflight_searches", {})
+    fake = FakeSearch()
+    monkeypatch.setattr(langgraph_service, "_search_once", fake)
+    return fake
+
+
+async def _started(*coroutines):
+    """태스크 시작 후 모두 첫 await 지점까지 진행"""
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    for _ in range(3):
+        await asyncio.sleep(0)
+    return tasks
+
+
+def test_identical_searches_run_once(fake_search):
+    async def scenario():
+        leader, waiter = await _started(
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3),
+            langgraph_service.search_with_langgraph("  네이버   날씨 ", limit=3)
+        )
+        fake_search.release()
+        return await leader, await waiter
+
+    leader_result, waiter_result = asyncio.run(scenario())
+
+    assert len(fake_search.calls) == 1
+    assert leader_result["performance"]["coalesced"] is False
+    assert waiter_result["performance"]["coalesced"] is True
+    assert waiter_result["matched_paths"] == leader_result["matched_paths"]
+    # 대기자는 경로를 복사해 받으므로 첫 요청의 수정이 전파되지 않음
+    leader_result["matched_paths"][0]["steps"].append({"order": 0})
+    assert waiter_result["matched_paths"][0]["steps"] == []
+    assert not langgraph_service._inflight_searches
+
+
+def test_different_parameters_or_embeddings_are_not_coalesced(fake_search):
+    async def scenario():
+        tasks = await _started(
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3),
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=5),
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3, query_embedding=[0.1, 0.2]),
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3, query_embedding=[0.3, 0.4]),
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3, query_embedding=[0.3, 0.4])
+        )
+        fake_search.release()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(scenario())
+
+    assert len(fake_search.calls) == 4
+    assert [result["performance"]["coalesced"] for result in results] == [False, False, False, False, True]
+
+
+def test_waiter_reruns_when_leader_is_cancelled(fake_search):
+    async def scenario():
+        leader, waiter = await _started(
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3),
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3)
+        )
+        leader.cancel()
+        await asyncio.sleep(0)
+        fake_search.release()
+        result = await waiter
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return result
+
+    result = asyncio.run(scenario())
+
+    # 첫 요청 취소 후 대기자가 새 첫 요청으로 직접 실행
+    assert len(fake_search.calls) == 2
+    assert result["performance"]["coalesced"] is False
+    assert result["total_matched"] == 1
+
+
+def test_cancelled_waiter_does_not_cancel_leader(fake_search):
+    async def scenario():
+        leader, waiter = await _started(
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3),
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3)
+        )
+        waiter.cancel()
+        await asyncio.sleep(0)
+        fake_search.release()
+        return await leader, waiter
+
+    leader_result, waiter = asyncio.run(scenario())
+
+    assert waiter.cancelled()
+    assert leader_result["total_matched"] == 1
+    assert len(fake_search.calls) == 1
+
+
+def test_waiter_deadline_returns_cut_short_result(fake_search):
+    async def scenario():
+        leader, waiter = await _started(
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3),
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3, deadline_ms=10)
+        )
+        waiter_result = await waiter
+        fake_search.release()
+        return await leader, waiter_result
+
+    leader_result, waiter_result = asyncio.run(scenario())
+
+    assert waiter_result["matched_paths"] == []
+    assert waiter_result["performance"]["cut_short"] == ["coalesced_search"]
+    assert waiter_result["performance"]["coalesced"] is True
+    assert leader_result["total_matched"] == 1
+
+
+def test_cut_short_leader_result_is_not_shared_with_longer_deadline(fake_search):
+    fake_search.cut_short = ["intent_analysis"]
+
+    async def scenario():
+        leader, waiter = await _started(
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3, deadline_ms=100),
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3, deadline_ms=5000)
+        )
+        fake_search.release()
+        return await leader, await waiter
+
+    leader_result, waiter_result = asyncio.run(scenario())
+
+    # 더 긴 예산의 대기자는 남은 예산으로 다시 실행해 완전한 결과를 받음
+    assert len(fake_search.calls) == 2
+    assert 0 < fake_search.calls[1]["deadline_ms"] <= 5000
+    assert leader_result["performance"]["cut_short"] == ["intent_analysis"]
+    assert waiter_result["performance"]["cut_short"] == []
+
+
+def test_leader_error_is_shared_with_waiters(fake_search, monkeypatch):
+    async def failing_search(*args):
+        await asyncio.sleep(0.01)
+        raise ConnectionError("neo4j down")
+
+    monkeypatch.setattr(langgraph_service, "_search_once", failing_search)
+
+    async def scenario():
+        tasks = await _started(
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3),
+            langgraph_service.search_with_langgraph("네이버 날씨", limit=3)
+        )
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert not langgraph_service._inflight_searches
@@ -0,0 +1,181 @@
+"""neo4j_service._VectorSearchBatcher 단위 테스트 - 동시 벡터 검색의 마이크로 배치 묶음"""
+
+import threading
+import time
+
+import pytest
+
+from app.services import neo4j_service, rate_limit_service, tracing_service
+from app.services.neo4j_service import _VectorSearchBatcher
+
+
+class FakeGraph:
+    """벡터 검색 Cypher만 흉내 (도메인 필터를 그대로 결과 도메인으로 반환)"""
+
+    def __init__(self):
+        self.queries = []
+        self.deadlines = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail = False
+
+    def query(self, query, params=None):
+        self.deadlines.append(rate_limit_service.current_deadline())
+        self.queries.append(params)
+        self.gate.wait(5)
+        if self.fail:
+            raise ConnectionError("neo4j down")
+        if 'queryEmbeddings' in params:
+            return [
+                self._row(domain, idx=idx)
+                for idx, domain in enumerate(params['domains'])
+            ]
+        return [self._row(params.get('domain'))]
+
+    @staticmethod
+    def _row(domain, **extra):
+        return {'domain': domain, 'baseURL': None, 'taskIntent': '날씨 보기', 'intentEmbedding': [1.0, 0.0],
+                'weight': 1, 'stepId': f"step-{domain}", **extra}
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    fake = FakeGraph()
+    monkeypatch.setattr(neo4j_service, "graph", fake)
+    return fake
+
+
+@pytest.fixture
+def exported_spans(monkeypatch):
+    spans = []
+    monkeypatch.setattr(tracing_service, "_export", spans.append)
+    return spans
+
+
+def _search_in_threads(batcher, domains, deadlines=None):
+    """도메인별로 스레드를 띄워 동시에 검색, {도메인: 결과 또는 예외} 반환"""
+    results = {}
+    deadlines = deadlines or [None] * len(domains)
+
+    def run(domain, deadline):
+        if deadline is not None:
+            rate_limit_service.set_deadline(time.monotonic() + deadline)
+        try:
+            results[domain] = batcher.search([1.0, 0.0], 3, domain)
+        except Exception as e:
+            results[domain] = e
+
+    threads = [threading.Thread(target=run, args=(domain, deadline)) for domain, deadline in zip(domains, deadlines)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    return threads, results
+
+
+def _occupy(batcher, graph):
+    """실행 중인 벡터 쿼리 하나를 붙잡아 둠 (다음 호출들이 배치로 모이도록)"""
+    graph.gate.clear()
+    threads, results = _search_in_threads(batcher, ["busy.com"])
+    return threads, results
+
+
+def test_disabled_window_queries_directly(graph):
+    batcher = _VectorSearchBatcher(window_ms=0, max_size=32)
+
+    results = batcher.search([1.0, 0.0], 3, "naver.com")
+
+    assert [result['domain'] for result in results] == ["naver.com"]
+    assert len(graph.queries) == 1
+    assert 'queryEmbedding' in graph.queries[0]
+
+
+def test_idle_search_runs_without_waiting(graph):
+    batcher = _VectorSearchBatcher(window_ms=1000, max_size=32)
+
+    start = time.perf_counter()
+    results = batcher.search([1.0, 0.0], 3, "naver.com")
+
+    assert time.perf_counter() - start < 0.5
+    assert [result['domain'] for result in results] == ["naver.com"]
+
+
+def test_concurrent_searches_share_one_query(graph):
+    batcher = _VectorSearchBatcher(window_ms=200, max_size=32)
+    busy_threads, _ = _occupy(batcher, graph)
+
+    threads, results = _search_in_threads(batcher, ["a.com", "b.com", "c.com"])
+    graph.gate.set()
+    for thread in busy_threads + threads:
+        thread.join(5)
+
+    batched = [params for params in graph.queries if 'queryEmbeddings' in params]
+    assert len(batched) == 1
+    assert batched[0]['domains'] == ["a.com", "b.com", "c.com"]
+    # 각 호출은 자기 검색 결과만 받음
+    assert {domain: [row['domain'] for row in rows] for domain, rows in results.items()} == {
+        "a.com": ["a.com"], "b.com": ["b.com"], "c.com": ["c.com"]
+    }
+
+
+def test_full_batch_is_closed_at_max_size(graph):
+    batcher = _VectorSearchBatcher(window_ms=200, max_size=2)
+    busy_threads, _ = _occupy(batcher, graph)
+
+    threads, results = _search_in_threads(batcher, ["a.com", "b.com", "c.com"])
+    graph.gate.set()
+    for thread in busy_threads + threads:
+        thread.join(5)
+
+    sizes = sorted(len(params.get('queryEmbeddings') or [None]) for params in graph.queries[1:])
+    assert sizes == [1, 2]
+    assert all(not isinstance(result, Exception) for result in results.values())
+
+
+def test_batch_error_is_raised_for_every_search(graph):
+    batcher = _VectorSearchBatcher(window_ms=200, max_size=32)
+    busy_threads, _ = _occupy(batcher, graph)
+    graph.fail = True
+
+    threads, results = _search_in_threads(batcher, ["a.com", "b.com"])
+    graph.gate.set()
+    for thread in busy_threads + threads:
+        thread.join(5)
+
+    assert all(isinstance(results[domain], ConnectionError) for domain in ["a.com", "b.com"])
+
+
+def test_batch_runs_under_latest_deadline_and_expired_follower_returns(graph):
+    batcher = _VectorSearchBatcher(window_ms=200, max_size=32)
+    busy_threads, _ = _occupy(batcher, graph)
+
+    threads, results = _search_in_threads(batcher, ["a.com", "b.com", "c.com"], deadlines=[5, 10, 0.05])
+    time.sleep(0.2)
+    graph.gate.set()
+    for thread in busy_threads + threads:
+        thread.join(5)
+
+    # 마감이 지난 팔로워는 배치 결과를 기다리지 않고 스레드를 반환
+    assert isinstance(results["c.com"], TimeoutError)
+    assert [row['domain'] for row in results["b.com"]] == ["b.com"]
+    batch_deadline = graph.deadlines[-1]
+    assert batch_deadline is not None and batch_deadline - time.monotonic() > 5
+
+
+def test_item_spans_are_linked_to_batch_span(graph, exported_spans):
+    batcher = _VectorSearchBatcher(window_ms=200, max_size=32)
+    busy_threads, _ = _occupy(batcher, graph)
+
+    threads, _ = _search_in_threads(batcher, ["a.com", "b.com"])
+    graph.gate.set()
+    for thread in busy_threads + threads:
+        thread.join(5)
+
+    batch_spans = [span for span in exported_spans if span.name == "neo4j.vector_batch" and span.attributes["size"] == 2]
+    assert len(batch_spans) == 1
+    batch_span = batch_spans[0]
+    item_spans = [span for span in exported_spans if (span.span_id in {link[1] for link in batch_span.links})]
+    assert len(item_spans) == 2
+    for item_span in item_spans:
+        assert item_span.name == "neo4j.vector_batch_item"
+        assert item_span.links == [(batch_span.trace_id, batch_span.span_id)]
+        assert item_span.attributes["batch_size"] == 2